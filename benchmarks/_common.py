@@ -0,0 +1,32 @@
+"""Shared helpers for the benchmark scripts."""
+import importlib.machinery
+import os
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+INTEGRATION_DIR = os.path.join(ROOT, "custom_components", "rehau_nea_smart_2")
+PACKAGE = "rehau_mqtt_client"
+
+
+class _ClientPackageFinder:
+    """Resolve ``rehau_mqtt_client`` from the integration directory only.
+
+    Putting the integration directory on ``sys.path`` would shadow standard
+    library modules such as ``select`` with the platform files.
+    """
+
+    @staticmethod
+    def find_spec(name, path=None, target=None):
+        if name != PACKAGE:
+            return None
+        return importlib.machinery.PathFinder.find_spec(name, [INTEGRATION_DIR])
+
+
+def use_client_package():
+    """Make ``rehau_mqtt_client`` importable as a top-level package.
+
+    The client package only depends on the standard library at import time, so
+    the benchmarks can run without a Home Assistant installation.
+    """
+    if not any(isinstance(finder, _ClientPackageFinder) for finder in sys.meta_path):
+        sys.meta_path.append(_ClientPackageFinder())
@@ -0,0 +1,84 @@
+"""Entity read cost with and without the columnar channel table.
+
+For installations with hundreds of channels, measures the batched refresh
+pass, one read of the current and target temperature of every zone (what the
+climate entities do on each state write) and the combination of both after a
+single channel update, both with the changed channel known to the store
+and with a full refresh pass.
+
+Usage:
+    python benchmarks/bench_channel_table.py [--repeat N]
+"""
+import argparse
+import itertools
+import timeit
+
+from _common import use_client_package
+from synthetic import make_user_document
+
+use_client_package()
+
+from rehau_mqtt_client.Controller import Controller  # noqa: E402
+from rehau_mqtt_client.MqttClient import MqttClient  # noqa: E402
+from rehau_mqtt_client.handlers import parse_installations  # noqa: E402
+
+SIZES = ((1, 4, 16, 2), (1, 8, 32, 2), (2, 8, 32, 4), (4, 8, 32, 4))
+
+
+def make_controller(user, use_channel_table):
+    """Build a controller whose store holds the parsed user document."""
+    controller = Controller(None, "user@example.com", "password")
+    controller.mqtt_client = MqttClient(None, "user@example.com", "password", use_channel_table=use_channel_table)
+    controller.mqtt_client.store.load(parse_installations(user["installs"], None))
+    return controller
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'sites x groups x zones x channels':>34} {'channels':>9} {'table':>6} {'refresh us':>11} {'read all us':>12} {'update+read us':>15} {'full+read us':>13}")
+    for sites, groups, zones, channels in SIZES:
+        user = make_user_document(sites, groups, zones, channels)
+        for use_channel_table in (False, True):
+            controller = make_controller(user, use_channel_table)
+            store = controller.mqtt_client.store
+            zone_keys = [
+                (number, installation["unique"]) for installation in store.installations for number in range(groups * zones)
+            ]
+            first_channel = store.installations[0]["groups"][0]["zones"][0]["channels"][0]
+
+            def read_all():
+                for number, unique in zone_keys:
+                    controller.get_zone_celsius(number, unique, "current_temperature")
+                    controller.get_zone_celsius(number, unique, "target_temperature")
+
+            setpoints = itertools.cycle((698, 707))
+
+            def update_and_read():
+                first_channel["target_temperature"] = next(setpoints)
+                store.touch([first_channel["id"]])
+                read_all()
+
+            def update_all_and_read():
+                first_channel["target_temperature"] = next(setpoints)
+                store.touch()
+                read_all()
+
+            def timed(function):
+                return min(timeit.repeat(function, number=args.repeat, repeat=3)) / args.repeat * 1e6
+
+            # A refresh pass over unchanged raw values.
+            refresh = timed(store.channel_table.refresh) if use_channel_table else 0.0
+            label = f"{sites} x {groups} x {zones} x {channels}"
+            total_channels = sites * groups * zones * channels
+            print(
+                f"{label:>34} {total_channels:9d} {'yes' if use_channel_table else 'no':>6} "
+                f"{refresh:11.1f} {timed(read_all):12.1f} {timed(update_and_read):15.1f} {timed(update_all_and_read):13.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
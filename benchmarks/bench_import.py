@@ -0,0 +1,108 @@
+"""Import-time benchmark and regression guard for the MQTT client package.
+
+Runs ``python -X importtime -c "import rehau_mqtt_client"`` in a fresh
+interpreter several times, reports the cumulative import time of the package
+and its most expensive modules, and fails when the package pulls in one of the
+heavy transports eagerly or exceeds the budget in ``import_budget.json``.
+
+Usage:
+    python benchmarks/bench_import.py [--runs N] [--top N] [--no-guard]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+from _common import PACKAGE
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+BUDGET_FILE = os.path.join(BENCHMARK_DIR, "import_budget.json")
+# Home Assistant has the standard library modules listed under
+# "preloaded_modules" in the budget loaded long before the integration, so they
+# are imported first and only the cost added by the package is measured.
+IMPORT_SNIPPET = (
+    "import sys; sys.path.insert(0, {!r}); "
+    "import _common; _common.use_client_package(); "
+    "import {}; "
+    f"import {PACKAGE}"
+)
+
+
+def run_importtime(preloaded):
+    """Import the package in a fresh interpreter and parse the importtime log.
+
+    Args:
+        preloaded (list[str]): Modules imported before the package.
+
+    Returns:
+        list[tuple[str, int, int]]: (module, self us, cumulative us) per module.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", IMPORT_SNIPPET.format(BENCHMARK_DIR, ", ".join(preloaded))],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if name.strip() in preloaded and not name.startswith("  "):
+            # Everything logged so far belongs to the preloaded baseline.
+            modules = []
+            continue
+        modules.append((name.strip(), int(self_us), int(cumulative_us)))
+    return modules
+
+
+def package_time(modules):
+    """Return the cumulative import time of the package in one run."""
+    return next(cumulative for name, _, cumulative in modules if name == PACKAGE)
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--no-guard", action="store_true", help="only report, never fail")
+    args = parser.parse_args()
+
+    with open(BUDGET_FILE) as file:
+        budget = json.load(file)
+
+    # The first run warms the bytecode cache and is discarded.
+    run_importtime(budget["preloaded_modules"])
+    runs = [run_importtime(budget["preloaded_modules"]) for _ in range(args.runs)]
+
+    runs.sort(key=package_time)
+    median_us = package_time(runs[len(runs) // 2])
+    fastest = runs[0]
+
+    print(f"{PACKAGE}: median {median_us / 1000:.1f} ms, best {package_time(fastest) / 1000:.1f} ms over {args.runs} runs")
+    print(f"modules imported: {len(fastest)}")
+    print(f"top {args.top} modules by self time (best run):")
+    for name, self_us, cumulative_us in sorted(fastest, key=lambda item: -item[1])[:args.top]:
+        print(f"  {self_us / 1000:8.2f} ms self {cumulative_us / 1000:8.2f} ms cumulative  {name}")
+
+    failures = []
+    imported = {name for name, _, _ in fastest}
+    for module in budget["forbidden_modules"]:
+        eager = sorted(name for name in imported if name == module or name.startswith(module + "."))
+        if eager:
+            failures.append(f"{module} is imported eagerly ({', '.join(eager[:3])})")
+    if median_us > budget["max_cumulative_us"]:
+        failures.append(
+            f"median import time {median_us} us exceeds budget {budget['max_cumulative_us']} us"
+        )
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures and not args.no_guard:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Memory retained by the client state, per zone and per channel.
+
+Builds the client state from synthetic documents and attributes the memory
+retained by each structure with tracemalloc:
+
+- user (raw): the selectively decoded user document, what was kept before
+- user (kept): what ``set_user`` retains after parsing (``compact_user``)
+- installations: the parsed installation dictionaries
+- store: the state store indexes and the channel table
+- snapshots: the slotted snapshots built by ``Controller.get_installations``
+- referentials: the decompressed referential table
+
+A second pass polls the same installation repeatedly through ``set_user``
+and reports the traced memory, which must stay flat.
+
+Usage:
+    python benchmarks/bench_memory.py [--polls N]
+"""
+import argparse
+import asyncio
+import gc
+import json
+import tracemalloc
+
+from _common import use_client_package
+from synthetic import make_referential_message, make_user_document
+
+use_client_package()
+
+from rehau_mqtt_client.Controller import Controller  # noqa: E402
+from rehau_mqtt_client.MqttClient import MqttClient  # noqa: E402
+from rehau_mqtt_client.handlers import USER_DOCUMENT_FIELDS, handle_message, parse_installations  # noqa: E402
+from rehau_mqtt_client.store import StateStore, compact_user  # noqa: E402
+from rehau_mqtt_client.utils import loads_selected  # noqa: E402
+
+SIZES = ((1, 2, 4, 1), (1, 4, 8, 2), (2, 8, 16, 2), (4, 8, 32, 4))
+STRUCTURES = ("user (raw)", "user (kept)", "installations", "store", "snapshots", "referentials")
+
+
+def retained(build):
+    """Return the result of ``build`` and the bytes it retains."""
+    gc.collect()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    return result, tracemalloc.get_traced_memory()[0] - before
+
+
+def measure(size):
+    """Return the bytes retained by every structure for one installation size."""
+    body = json.dumps({"data": {"user": make_user_document(*size)}}).encode()
+    referential_message = make_referential_message(400)
+    results = {}
+
+    user, results["user (raw)"] = retained(lambda: loads_selected(body, USER_DOCUMENT_FIELDS)["data"]["user"])
+    _, results["user (kept)"] = retained(lambda: compact_user(user))
+    installations, results["installations"] = retained(lambda: parse_installations(user["installs"], None))
+    store = StateStore()
+    _, results["store"] = retained(lambda: store.load(installations))
+
+    controller = Controller(None, "user@example.com", "password")
+    controller.mqtt_client = MqttClient(None, "user@example.com", "password")
+    controller.mqtt_client.store = store
+    _, results["snapshots"] = retained(controller.get_installations)
+
+    client = controller.mqtt_client
+    _, results["referentials"] = retained(lambda: asyncio.run(handle_message("client/x", referential_message, client)))
+    return results
+
+
+def poll(size, polls):
+    """Poll one installation ``polls`` times and return the traced memory after each poll."""
+    body = json.dumps({"data": {"user": make_user_document(*size)}}).encode()
+    client = MqttClient(None, "user@example.com", "password")
+    controller = Controller(None, "user@example.com", "password")
+    controller.mqtt_client = client
+    samples = []
+
+    async def run():
+        for _ in range(polls):
+            await client.set_user(loads_selected(body, USER_DOCUMENT_FIELDS)["data"]["user"])
+            controller.get_installations()
+            gc.collect()
+            samples.append(tracemalloc.get_traced_memory()[0])
+
+    asyncio.run(run())
+    return samples
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--polls", type=int, default=30)
+    args = parser.parse_args()
+
+    tracemalloc.start()
+    # Warm up so lazily imported modules and caches are not attributed to the first size.
+    measure(SIZES[0])
+    print(f"{'sites x groups x zones x channels':>34} {'structure':>14} {'KiB':>9} {'B/zone':>9} {'B/channel':>10}")
+    for size in SIZES:
+        sites, groups, zones, channels = size
+        zone_count = sites * groups * zones
+        channel_count = zone_count * channels
+        results = measure(size)
+        label = " x ".join(str(part) for part in size)
+        for structure in STRUCTURES:
+            size_bytes = results[structure]
+            print(f"{label:>34} {structure:>14} {size_bytes / 1024:9.1f} {size_bytes / zone_count:9.0f} {size_bytes / channel_count:10.0f}")
+            label = ""
+
+    print()
+    size = SIZES[-2]
+    samples = poll(size, args.polls)
+    growth = samples[-1] - samples[len(samples) // 3]
+    print(f"polling {' x '.join(str(part) for part in size)}: traced KiB after poll "
+          f"1: {samples[0] / 1024:.1f}, {len(samples)}: {samples[-1] / 1024:.1f}, "
+          f"growth over the last two thirds: {growth / 1024:+.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Construction cost and memory of the installation models.
+
+Compares the slotted snapshot models with the pydantic schema the integration
+used to build on every read, for installations of increasing size.
+
+Usage:
+    python benchmarks/bench_models.py [--repeat N]
+"""
+import argparse
+import gc
+import importlib.util
+import timeit
+import tracemalloc
+
+from _common import use_client_package
+from synthetic import make_user_document
+
+use_client_package()
+
+from rehau_mqtt_client.handlers import parse_installations  # noqa: E402
+from rehau_mqtt_client.models import Installation  # noqa: E402
+
+SIZES = ((1, 1, 4, 1), (1, 4, 8, 1), (1, 8, 16, 2), (4, 8, 16, 2))
+
+
+def retained_bytes(build):
+    """Return the bytes still allocated by the objects ``build`` returns."""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    builders = {"slotted": lambda parsed: [Installation.from_dict(installation) for installation in parsed]}
+    if importlib.util.find_spec("pydantic") is not None:
+        from rehau_mqtt_client.models.schema import InstallationSchema
+
+        builders["pydantic"] = lambda parsed: [InstallationSchema(**installation) for installation in parsed]
+    else:
+        print("pydantic is not installed, only the slotted models are measured")
+
+    print(f"{'sites x groups x zones x channels':>34} {'model':>9} {'build us':>10} {'bytes':>10} {'B/channel':>10}")
+    for sites, groups, zones, channels in SIZES:
+        user = make_user_document(sites, groups, zones, channels)
+        parsed = parse_installations(user["installs"], None)
+        total_channels = sites * groups * zones * channels
+        for name, build in builders.items():
+            seconds = min(timeit.repeat(lambda: build(parsed), number=args.repeat, repeat=3)) / args.repeat
+            size = retained_bytes(lambda: build(parsed))
+            label = f"{sites} x {groups} x {zones} x {channels}"
+            print(f"{label:>34} {name:>9} {seconds * 1e6:10.1f} {size:10d} {size / total_channels:10.0f}")
+
+
+if __name__ == "__main__":
+    main()
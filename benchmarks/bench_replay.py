@@ -0,0 +1,84 @@
+"""Replay a traffic capture through the client and report the throughput.
+
+Without a capture file, a synthetic one is written first: one user state
+response followed by channel updates spread over the zones. Captures taken
+with the ``rehau_nea_smart_2.capture`` service can be replayed as is.
+
+Usage:
+    python benchmarks/bench_replay.py [--capture FILE] [--speed 1|10|max] [--messages N]
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+from _common import use_client_package
+from synthetic import make_user_document
+
+use_client_package()
+
+from rehau_mqtt_client.MqttClient import MqttClient  # noqa: E402
+from rehau_mqtt_client.instrumentation import KIND_HTTP, KIND_MQTT, TrafficRecorder, read_capture, replay  # noqa: E402
+
+
+def write_synthetic_capture(path, messages, interval=0.01):
+    """Write a capture of one user document and ``messages`` channel updates."""
+    user = make_user_document(1, 4, 8, 2)
+    installation = user["installs"][0]
+    channels = [
+        channel["_id"]
+        for group in installation["groups"]
+        for zone in group["zones"]
+        for channel in zone["channels"]
+    ]
+    recorder = TrafficRecorder(path, ["user@example.com"])
+    recorder.record(KIND_HTTP, "getDataofInstall", user)
+    for index in range(messages):
+        payload = json.dumps({
+            "type": "channel_update",
+            "data": {
+                "channel": channels[index % len(channels)],
+                "unique": installation["unique"],
+                "data": {"mode_used": index % 3, "setpoint_used": 650 + index % 60},
+            },
+        })
+        recorder.record(KIND_MQTT, f"client/{installation['unique']}", payload.encode())
+    recorder.close()
+    # The recorder timestamps are the recording time; spread them to simulate live traffic.
+    records = list(read_capture(path))
+    for index, record in enumerate(records):
+        record["t"] = index * interval
+    return records
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--capture")
+    parser.add_argument("--speed", default="max", help="1, 10 or max")
+    parser.add_argument("--messages", type=int, default=5000)
+    args = parser.parse_args()
+    speed = None if args.speed == "max" else float(args.speed)
+
+    if args.capture:
+        records = list(read_capture(args.capture))
+    else:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "capture.jsonl.gz")
+            records = write_synthetic_capture(path, args.messages)
+            print(f"synthetic capture: {len(records)} records, {os.path.getsize(path) / 1024:.1f} KiB compressed")
+
+    client = MqttClient(None, "user@example.com", "password")
+    started = time.perf_counter()
+    count = asyncio.run(replay(records, client, speed))
+    elapsed = time.perf_counter() - started
+    print(f"replayed {count} records in {elapsed:.3f} s ({count / elapsed:,.0f} records/s) at speed {args.speed}")
+    for stage, summary in client.timings.summary().items():
+        if summary["count"]:
+            print(f"  {stage:>20}: {summary['count']:6d} x  p50 {summary['p50']:.3f} ms  p95 {summary['p95']:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""How the integration scales with the size of the installation.
+
+Sweeps synthetic installations from a single room to thousands of channels
+through every stage of the data path:
+
+- decode: field-selective decoding of the ``getDataofInstall`` response
+- parse: ``parse_installations`` plus the schema validation of ``update_installations``
+- load: loading the state store, its indexes and the channel table
+- lookup: ``Controller`` zone lookups and Celsius reads for every zone
+- render: the property reads of every climate entity on a state write
+- update: one ``channel_update`` through ``handle_message``, per message
+
+Zone numbers restart in every installation and are looked up without one,
+so lookup and render cover the distinct zone numbers only.
+
+Referential decoding is swept separately over the table size. The last
+line of each table is the scaling exponent between the smallest and the
+largest size: 1.0 means linear in the number of channels, 0 constant.
+
+Usage:
+    python benchmarks/bench_scaling.py [--repeat N] [--messages N]
+"""
+import argparse
+import asyncio
+import json
+import math
+import time
+
+from _common import use_client_package
+from synthetic import make_channel_updates, make_referential_message, make_user_document
+
+use_client_package()
+
+from rehau_mqtt_client.Controller import Controller  # noqa: E402
+from rehau_mqtt_client.MqttClient import MqttClient  # noqa: E402
+from rehau_mqtt_client.handlers import USER_DOCUMENT_FIELDS, handle_message, parse_installations  # noqa: E402
+from rehau_mqtt_client.models.schema import validate_installations  # noqa: E402
+from rehau_mqtt_client.utils import loads_selected  # noqa: E402
+
+SIZES = ((1, 1, 1, 1), (1, 2, 4, 1), (1, 4, 8, 2), (2, 8, 16, 2), (4, 8, 32, 2), (8, 8, 32, 4))
+REFERENTIAL_SIZES = (50, 200, 800, 3200)
+STAGES = ("decode", "parse", "load", "lookup", "render", "update")
+
+
+def best_of(repeat, function):
+    """Return the fastest of ``repeat`` runs of ``function``, in seconds."""
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def render_climate(controller, zone_number, installation_unique):
+    """Read what a climate entity reads when its state is written."""
+    controller.is_connected(installation_unique)
+    controller.get_zone_celsius(zone_number, installation_unique, "current_temperature")
+    controller.get_zone_celsius(zone_number, installation_unique, "target_temperature")
+    channel = controller.get_zone(zone_number).channels[0]
+    return channel.operating_mode, channel.energy_level
+
+
+def measure(size, repeat, messages):
+    """Measure every stage for one installation size, in seconds."""
+    sites, groups, zones, channels = size
+    user = make_user_document(sites, groups, zones, channels)
+    body = json.dumps({"success": True, "data": {"user": user}}).encode()
+    selected = loads_selected(body, USER_DOCUMENT_FIELDS)["data"]["user"]
+
+    def parse():
+        validate_installations(parse_installations(selected["installs"], None))
+
+    controller = Controller(None, "user@example.com", "password")
+    client = controller.mqtt_client = MqttClient(None, "user@example.com", "password")
+    installations = parse_installations(selected["installs"], None)
+    client.store.load(installations)
+    zones_by_number = {}
+    for installation in installations:
+        for group in installation["groups"]:
+            for zone in group["zones"]:
+                zones_by_number.setdefault(zone["number"], installation["unique"])
+
+    def lookup():
+        for number, unique in zones_by_number.items():
+            controller.get_zone(number)
+            controller.get_installation_unique_by_zone(number)
+            controller.get_zone_celsius(number, unique, "current_temperature")
+
+    def render():
+        for number, unique in zones_by_number.items():
+            render_climate(controller, number, unique)
+
+    updates = make_channel_updates(user, messages)
+
+    async def stream():
+        for topic, payload in updates:
+            await handle_message(topic, payload, client)
+
+    results = {
+        "decode": best_of(repeat, lambda: loads_selected(body, USER_DOCUMENT_FIELDS)),
+        "parse": best_of(repeat, parse),
+        "load": best_of(repeat, lambda: client.store.load(installations)),
+        "lookup": best_of(repeat, lookup),
+        "render": best_of(repeat, render),
+    }
+    results["update"] = best_of(max(1, repeat // 5), lambda: asyncio.run(stream())) / messages
+    return sites * groups * zones * channels, len(body), results
+
+
+def exponent(small, large, small_n, large_n):
+    """Return the exponent k of ``time ~ n ** k`` between two measurements."""
+    if small <= 0 or large_n == small_n:
+        return float("nan")
+    return math.log(large / small) / math.log(large_n / small_n)
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--messages", type=int, default=500)
+    args = parser.parse_args()
+
+    header = f"{'sites x groups x zones x channels':>34} {'channels':>9} {'body KiB':>9}"
+    print(header + "".join(f" {stage + ' us':>11}" for stage in STAGES))
+    rows = []
+    for size in SIZES:
+        total, body_size, results = measure(size, args.repeat, args.messages)
+        rows.append((total, results))
+        label = " x ".join(str(part) for part in size)
+        print(f"{label:>34} {total:9d} {body_size / 1024:9.1f}" + "".join(f" {results[stage] * 1e6:11.1f}" for stage in STAGES))
+    (small_n, small), (large_n, large) = rows[0], rows[-1]
+    print(f"{'scaling exponent':>34} {'':>9} {'':>9}" + "".join(
+        f" {exponent(small[stage], large[stage], small_n, large_n):11.2f}" for stage in STAGES
+    ))
+
+    print()
+    print(f"{'referential entries':>34} {'KiB':>9} {'decode us':>11}")
+    client = MqttClient(None, "user@example.com", "password")
+    referential_rows = []
+    for entries in REFERENTIAL_SIZES:
+        payload = make_referential_message(entries)
+        seconds = best_of(args.repeat, lambda payload=payload: asyncio.run(handle_message("client/x", payload, client)))
+        assert len(client.referentials) == entries
+        referential_rows.append((entries, seconds))
+        print(f"{entries:>34} {len(payload.encode()) / 1024:9.1f} {seconds * 1e6:11.1f}")
+    (small_n, small), (large_n, large) = referential_rows[0], referential_rows[-1]
+    print(f"{'scaling exponent':>34} {'':>9} {exponent(small, large, small_n, large_n):11.2f}")
+
+
+if __name__ == "__main__":
+    main()
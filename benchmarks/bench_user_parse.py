@@ -0,0 +1,84 @@
+"""Peak memory of decoding large ``getDataofInstall`` responses.
+
+Compares decoding the whole response (what ``response.json()`` did) with the
+field-selective decoding used by ``read_user_state``. Each measurement runs in
+a fresh interpreter so the peak RSS of one run does not hide the next.
+
+Usage:
+    python benchmarks/bench_user_parse.py
+"""
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from _common import use_client_package
+from synthetic import make_user_document
+
+SIZES = ((1, 2, 8, 1), (4, 8, 16, 2), (16, 8, 16, 2), (32, 8, 16, 4))
+MODES = ("full", "selective")
+
+
+def measure(mode, path):
+    """Decode the response in ``path`` and return the measurements."""
+    use_client_package()
+    from rehau_mqtt_client.handlers import USER_DOCUMENT_FIELDS, parse_installations
+    from rehau_mqtt_client.utils import loads_selected
+
+    with open(path, "rb") as file:
+        body = file.read()
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    tracemalloc.start()
+    start = time.perf_counter()
+    if mode == "full":
+        user = json.loads(body.decode("utf-8"))["data"]["user"]
+    else:
+        user = loads_selected(body, USER_DOCUMENT_FIELDS)["data"]["user"]
+    installations = parse_installations(user["installs"], None)
+    elapsed = time.perf_counter() - start
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    assert installations
+    return {
+        "seconds": elapsed,
+        "peak": peak,
+        "retained": retained,
+        # ru_maxrss is reported in kilobytes on Linux.
+        "rss": (rss_after - rss_before) * 1024,
+    }
+
+
+def main():
+    """Run the benchmark."""
+    if len(sys.argv) == 3:
+        print(json.dumps(measure(sys.argv[1], sys.argv[2])))
+        return
+
+    print(f"{'sites x groups x zones x channels':>34} {'body MiB':>9} {'mode':>10} {'ms':>8} {'peak MiB':>9} {'kept MiB':>9} {'RSS +MiB':>9}")
+    for sites, groups, zones, channels in SIZES:
+        document = {"success": True, "data": {"user": make_user_document(sites, groups, zones, channels)}}
+        with tempfile.NamedTemporaryFile("wb", suffix=".json", delete=False) as file:
+            file.write(json.dumps(document).encode("utf-8"))
+            path = file.name
+        try:
+            size = os.path.getsize(path)
+            for mode in MODES:
+                result = json.loads(subprocess.run(
+                    [sys.executable, __file__, mode, path], capture_output=True, text=True, check=True
+                ).stdout)
+                label = f"{sites} x {groups} x {zones} x {channels}"
+                print(
+                    f"{label:>34} {size / 2**20:9.2f} {mode:>10} {result['seconds'] * 1000:8.1f} "
+                    f"{result['peak'] / 2**20:9.2f} {result['retained'] / 2**20:9.2f} {result['rss'] / 2**20:9.2f}"
+                )
+        finally:
+            os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
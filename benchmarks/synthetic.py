@@ -0,0 +1,192 @@
+"""Synthetic Rehau NEA Smart 2 payloads for the benchmarks.
+
+The documents mimic the shape of the ``getDataofInstall`` user document: the
+fields read by the integration plus the kind of per-channel and
+per-installation data the API returns but the integration never uses. The
+``channel_update`` streams and the LZString compressed referentials match
+what the broker pushes for such a document.
+"""
+import json
+import random
+
+HEATCOOL_AUTO = {"heating": True, "cooling": False, "manual": False}
+
+
+def _object_id(rng):
+    return "".join(rng.choice("0123456789abcdef") for _ in range(24))
+
+
+def _fahrenheit_tenths(celsius):
+    return int(round(celsius * 18 + 320))
+
+
+def make_channel(rng, channel_number):
+    """Build one raw channel of a zone."""
+    return {
+        "_id": _object_id(rng),
+        "number": channel_number,
+        "temp_zone": _fahrenheit_tenths(rng.uniform(17, 24)),
+        "setpoint_used": _fahrenheit_tenths(rng.choice((19, 20, 20.5, 21, 22))),
+        "mode_permanent": rng.choice((0, 0, 0, 1, 3)),
+        "mode_used": 0,
+        "setpoint_h_normal": 698,
+        "setpoint_h_reduced": 626,
+        "setpoint_h_standby": 446,
+        "setpoint_c_normal": 752,
+        "setpoint_c_reduced": 788,
+        "setpoint_min": 410,
+        "setpoint_max": 860,
+        "humidity": rng.randint(30, 60),
+        "dewpoint": _fahrenheit_tenths(rng.uniform(5, 12)),
+        "demand": rng.randint(0, 100),
+        "valve_state": rng.choice((True, False)),
+        "battery": rng.randint(0, 3),
+        "signal": rng.randint(-90, -40),
+        "sensor_type": "SENSOR_ROOM",
+        "firmware": "2.4.1",
+        "program": [[rng.randint(0, 95) for _ in range(6)] for _ in range(7)],
+        "history": [_fahrenheit_tenths(rng.uniform(17, 24)) for _ in range(24)],
+    }
+
+
+def make_zone(rng, zone_number, channels):
+    """Build one raw zone with its channels."""
+    return {
+        "_id": _object_id(rng),
+        "name": f"Room {zone_number}",
+        "number": zone_number,
+        "picture": "living_room",
+        "program_name": rng.choice(("Comfort", "Eco", "Custom")),
+        "channels": [make_channel(rng, channel) for channel in range(channels)],
+    }
+
+
+def make_installation(rng, site, groups, zones, channels):
+    """Build one raw installation with its groups and zones."""
+    zone_numbers = iter(range(groups * zones))
+    return {
+        "_id": _object_id(rng),
+        "unique": f"NEA{site:08d}",
+        "hash": _object_id(rng),
+        "name": f"Site {site}",
+        "lastConnection": "2024-03-01T12:00:00.000Z",
+        "connectionState": True,
+        "timezone": "Europe/Berlin",
+        "address": {"street": "Example street 1", "city": "Example", "zip": "12345"},
+        "user": {"heatcool_auto_01": dict(HEATCOOL_AUTO), "language": "en"},
+        "errors": [{"code": rng.randint(1, 99), "date": "2024-02-01T00:00:00.000Z"} for _ in range(20)],
+        "groups": [
+            {
+                "_id": _object_id(rng),
+                "name": f"Floor {group}",
+                "zones": [make_zone(rng, next(zone_numbers), channels) for _ in range(zones)],
+            }
+            for group in range(groups)
+        ],
+    }
+
+
+def make_user_document(sites=1, groups=2, zones=4, channels=1, seed=0):
+    """Build a raw user document as returned in ``data.user`` by the API.
+
+    Args:
+        sites (int): Number of installations.
+        groups (int): Groups per installation.
+        zones (int): Zones per group.
+        channels (int): Channels per zone.
+        seed (int): Seed for the random values.
+
+    Returns:
+        dict: The user document.
+    """
+    rng = random.Random(seed)
+    installs = [make_installation(rng, site, groups, zones, channels) for site in range(sites)]
+    return {
+        "_id": _object_id(rng),
+        "email": "user@example.com",
+        "defaultInstall": installs[0]["unique"],
+        "transactionId": _object_id(rng),
+        "installs": installs,
+    }
+
+
+# Keys the integration sends through the referentials, the remaining entries are filler.
+REFERENTIAL_KEYS = (
+    "controller", "data", "type", "zone", "zone_impacted", "setpoint_used",
+    "mode_used", "mode_permanent", "heat_cool", "channel", "unique",
+)
+
+
+def iter_channels(user):
+    """Yield the installation unique and the raw channel of every channel of a user document."""
+    for installation in user["installs"]:
+        for group in installation["groups"]:
+            for zone in group["zones"]:
+                for channel in zone["channels"]:
+                    yield installation["unique"], channel
+
+
+def make_channel_updates(user, count, seed=0):
+    """Build a stream of ``channel_update`` messages for the channels of a user document.
+
+    Args:
+        user (dict): The user document from ``make_user_document``.
+        count (int): Number of messages.
+        seed (int): Seed for the random values.
+
+    Returns:
+        list[tuple[str, str]]: The topic and JSON payload of every message.
+    """
+    rng = random.Random(seed)
+    channels = list(iter_channels(user))
+    messages = []
+    for _ in range(count):
+        unique, channel = rng.choice(channels)
+        payload = {
+            "type": "channel_update",
+            "data": {
+                "channel": channel["_id"],
+                "unique": unique,
+                "data": {
+                    "mode_used": rng.choice((0, 0, 1, 3)),
+                    "setpoint_used": _fahrenheit_tenths(rng.choice((19, 20, 20.5, 21, 22))),
+                    "temp_zone": _fahrenheit_tenths(rng.uniform(17, 24)),
+                    "demand": rng.randint(0, 100),
+                },
+            },
+        }
+        messages.append((f"client/{unique}/realtime", json.dumps(payload)))
+    return messages
+
+
+def make_referentials(entries=400, seed=0):
+    """Build a referential table with the keys used by the integration and filler entries.
+
+    Args:
+        entries (int): Total number of entries.
+        seed (int): Seed for the filler names.
+
+    Returns:
+        list[dict]: The referential entries with their ``index`` and ``value``.
+    """
+    rng = random.Random(seed)
+    values = list(REFERENTIAL_KEYS)
+    while len(values) < entries:
+        values.append("_".join(rng.choice(("temp", "mode", "valve", "pump", "dew", "hum", "prog", "err")) for _ in range(3)) + f"_{len(values):03d}")
+    return [{"index": index, "value": value} for index, value in enumerate(values[:max(entries, len(REFERENTIAL_KEYS))])]
+
+
+def make_referential_message(entries=400, seed=0):
+    """Build a ``referential`` message with its table compressed like the broker does.
+
+    Args:
+        entries (int): Number of referential entries.
+        seed (int): Seed for the filler names.
+
+    Returns:
+        str: The JSON payload of the message.
+    """
+    from rehau_mqtt_client.utils.lzstring import LZString
+
+    table = json.dumps(make_referentials(entries, seed))
+    return json.dumps({"type": "referential", "data": LZString.compressToUTF16(table)})
@@ -8,11 +8,19 @@ from __future__ import annotations
 from homeassistant.config_entries import ConfigEntry, ConfigEntryNotReady
 from homeassistant.const import CONF_EMAIL, CONF_PASSWORD, Platform
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.event import async_track_time_interval
 
+from .rehau_mqtt_client import preload_transports
 from .rehau_mqtt_client.Controller import Controller
-from .const import DOMAIN
+from .const import CONF_METRICS_EXPORTER, DOMAIN
+from .faults import FAULT_INTERVAL, RehauFaultMonitor
+from .metrics import async_register_metrics_view
+from .programs import RehauProgramStore
+from .services import async_setup_services
+from .statistics import STATISTICS_INTERVAL, RehauStatisticsImporter
 
 PLATFORMS: list[Platform] = [
+    Platform.BINARY_SENSOR,
     Platform.CLIMATE,
     Platform.SENSOR,
     Platform.SELECT,
@@ -21,12 +29,28 @@ PLATFORMS: list[Platform] = [
 # https://developers.home-assistant.io/docs/config_entries_index/#setting-up-an-entry
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up this integration using UI."""
+    await hass.async_add_executor_job(preload_transports)
 
     controller = Controller(hass, entry.data[CONF_EMAIL], entry.data[CONF_PASSWORD])
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = controller
     await controller.connect()
+    await RehauProgramStore(hass, entry.entry_id, controller).async_load()
+    monitor = RehauFaultMonitor(hass, entry.entry_id, controller)
+    await monitor.async_load()
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    if entry.options.get(CONF_METRICS_EXPORTER, False):
+        async_register_metrics_view(hass)
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+    async_setup_services(hass)
+
+    importer = RehauStatisticsImporter(hass, entry.entry_id, controller)
+    await importer.async_load()
+    entry.async_on_unload(async_track_time_interval(hass, importer.async_import, STATISTICS_INTERVAL))
+    entry.async_create_background_task(hass, importer.async_import(), f"{DOMAIN} statistics import")
+    entry.async_on_unload(async_track_time_interval(hass, monitor.async_refresh, FAULT_INTERVAL))
+    entry.async_create_background_task(hass, monitor.async_refresh(), f"{DOMAIN} error log refresh")
+
     return True
 
 
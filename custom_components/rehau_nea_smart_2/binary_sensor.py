@@ -0,0 +1,175 @@
+"""Binary sensor platform for rehau_nea_smart_2."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING
+
+from homeassistant.components.binary_sensor import (
+    BinarySensorDeviceClass,
+    BinarySensorEntity,
+    BinarySensorEntityDescription,
+)
+from homeassistant.core import callback
+from homeassistant.helpers.entity import DeviceInfo, EntityCategory
+
+from .rehau_mqtt_client.Controller import Controller
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from .rehau_mqtt_client import Installation, Zone
+
+FAULT_DESCRIPTION = BinarySensorEntityDescription(
+    key="fault",
+    name="Fault",
+    icon="mdi:alert-circle-outline",
+    device_class=BinarySensorDeviceClass.PROBLEM,
+)
+
+CONNECTION_DESCRIPTION = BinarySensorEntityDescription(
+    key="connection",
+    name="Connection",
+    icon="mdi:cloud-check-outline",
+    device_class=BinarySensorDeviceClass.CONNECTIVITY,
+    entity_category=EntityCategory.DIAGNOSTIC,
+)
+
+
+async def async_setup_entry(hass, entry, async_add_devices):
+    """Set up the binary sensor platform."""
+    controller: Controller = hass.data[DOMAIN][entry.entry_id]
+
+    installations: list[Installation] = controller.get_installations()
+
+    devices = []
+
+    for installation in installations:
+        devices.append(RehauNeasmart2FaultBinarySensor(controller, installation.unique, None, FAULT_DESCRIPTION))
+        devices.append(RehauNeasmart2ConnectionBinarySensor(controller, installation.unique, CONNECTION_DESCRIPTION))
+        for group in installation.groups:
+            for zone in group.zones:
+                devices.append(RehauNeasmart2FaultBinarySensor(controller, installation.unique, zone, FAULT_DESCRIPTION))
+
+    async_add_devices(devices)
+
+
+class RehauNeasmart2FaultBinarySensor(BinarySensorEntity):
+    """Binary sensor that is on while the controller logs an active error.
+
+    Without a zone the sensor covers every error of the installation,
+    otherwise only the errors of the zone. The active errors are read from
+    the fault index, which the fault monitor keeps up to date.
+    """
+
+    _attr_has_entity_name = False
+    should_poll = False
+
+    def __init__(
+            self,
+            controller: Controller,
+            installation_unique: str,
+            zone: Zone | None,
+            entity_description: BinarySensorEntityDescription,
+    ):
+        """Initialize the fault binary sensor."""
+        self._controller = controller
+        self._installation_unique = installation_unique
+        self._zone_number = zone.number if zone is not None else None
+        if zone is None:
+            self._attr_unique_id = f"{installation_unique}_{entity_description.key}"
+            self._attr_name = f"{controller.name} {entity_description.name}"
+        else:
+            self._attr_unique_id = f"{zone.id}_{entity_description.key}"
+            self._attr_name = f"{zone.name} {entity_description.name}"
+        self.entity_description = entity_description
+
+    async def async_added_to_hass(self) -> None:
+        """Run when this Entity has been added to HA."""
+        self._controller.register_callback(self.async_write_ha_state)
+
+    async def async_will_remove_from_hass(self):
+        """Run when this Entity will be removed from HA."""
+        self._controller.remove_callback(self.async_write_ha_state)
+
+    @property
+    def device_info(self):
+        """Return device information for the binary sensor."""
+        return DeviceInfo(
+            identifiers={(DOMAIN, self._controller.id)},
+            name=self._controller.name,
+            manufacturer=self._controller.manufacturer,
+            model=self._controller.model,
+        )
+
+    @property
+    def is_on(self) -> bool:
+        """Return True if an error is active."""
+        return bool(self._controller.get_active_faults(self._installation_unique, self._zone_number))
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Return the active errors."""
+        return {
+            "faults": [
+                {
+                    "code": code,
+                    "zone": zone,
+                    "since": datetime.fromtimestamp(timestamp, timezone.utc).isoformat(),
+                }
+                for code, zone, timestamp in self._controller.get_active_faults(
+                    self._installation_unique, self._zone_number
+                )
+            ]
+        }
+
+
+class RehauNeasmart2ConnectionBinarySensor(BinarySensorEntity):
+    """Binary sensor that is on while the installation is connected to the REHAU cloud.
+
+    The state is read from the indexed installation and only written when
+    it changed.
+    """
+
+    _attr_has_entity_name = False
+    should_poll = False
+
+    def __init__(
+            self,
+            controller: Controller,
+            installation_unique: str,
+            entity_description: BinarySensorEntityDescription,
+    ):
+        """Initialize the connection binary sensor."""
+        self._controller = controller
+        self._installation_unique = installation_unique
+        self._attr_unique_id = f"{installation_unique}_{entity_description.key}"
+        self._attr_name = f"{controller.name} {entity_description.name}"
+        self.entity_description = entity_description
+        self._attr_is_on = controller.is_connected(installation_unique)
+
+    async def async_added_to_hass(self) -> None:
+        """Run when this Entity has been added to HA."""
+        self._controller.register_callback(self._async_connection_changed)
+
+    async def async_will_remove_from_hass(self):
+        """Run when this Entity will be removed from HA."""
+        self._controller.remove_callback(self._async_connection_changed)
+
+    @callback
+    def _async_connection_changed(self):
+        connected = self._controller.is_connected(self._installation_unique)
+        if connected == self._attr_is_on:
+            return
+        self._attr_is_on = connected
+        self.async_write_ha_state()
+
+    @property
+    def device_info(self):
+        """Return device information for the binary sensor."""
+        return DeviceInfo(
+            identifiers={(DOMAIN, self._controller.id)},
+            name=self._controller.name,
+            manufacturer=self._controller.manufacturer,
+            model=self._controller.model,
+        )
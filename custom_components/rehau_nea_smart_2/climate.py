@@ -1,7 +1,15 @@
 """Platform for climate integration."""
+from __future__ import annotations
+
 import logging
-from .rehau_mqtt_client import Installation, Zone
+from typing import TYPE_CHECKING
+
+import voluptuous as vol
+
+from .rehau_mqtt_client import raw_to_celsius, raw_to_celsius_half
 from .rehau_mqtt_client.Controller import Controller
+from .rehau_mqtt_client.exceptions import MqttClientError
+from .rehau_mqtt_client.store import DAYS, parse_period
 
 from .const import (
     DOMAIN,
@@ -18,11 +26,16 @@ from homeassistant.components.climate import (
     ClimateEntityFeature,
     HVACMode,
 )
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv, entity_platform
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.const import UnitOfTemperature
 from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.const import ATTR_TEMPERATURE
 
+if TYPE_CHECKING:
+    from .rehau_mqtt_client import Installation, Zone
+
 _LOGGER = logging.getLogger(__name__)
 
 ENTITY_DESCRIPTIONS = (
@@ -34,6 +47,16 @@ ENTITY_DESCRIPTIONS = (
     ),
 )
 
+SERVICE_SET_PROGRAM = "set_program"
+SERVICE_CLEAR_PROGRAM = "clear_program"
+
+ATTR_PROGRAM_NAME = "name"
+
+SET_PROGRAM_SCHEMA = {
+    vol.Optional(ATTR_PROGRAM_NAME): cv.string,
+    **{vol.Optional(day): vol.All(cv.ensure_list, [cv.string]) for day in DAYS},
+}
+
 
 async def async_setup_entry(hass, entry, async_add_devices):
     """Set up the climate platform."""
@@ -52,6 +75,10 @@ async def async_setup_entry(hass, entry, async_add_devices):
 
     async_add_devices(devices)
 
+    platform = entity_platform.async_get_current_platform()
+    platform.async_register_entity_service(SERVICE_SET_PROGRAM, SET_PROGRAM_SCHEMA, "async_set_program")
+    platform.async_register_entity_service(SERVICE_CLEAR_PROGRAM, {}, "async_clear_program")
+
 
 class IntegrationRehauNeaSmart2Climate(ClimateEntity, RestoreEntity):
     """Representation of a Rehau Nea Smart 2 climate entity."""
@@ -142,61 +169,57 @@ class RehauNeaSmart2RoomClimate(IntegrationRehauNeaSmart2Climate):
 
         self._attr_preset_mode = PRESET_ENERGY_LEVELS_MAPPING_REVERSE[self._mode]
         self._attr_hvac_mode = PRESET_CLIMATE_MODES_MAPPING[self._operation_mode]
-        self._attr_current_temperature = self.format_temperature(self._current_temp)
-        self._attr_target_temperature = self.format_temperature(self._target_temp, True)
-        self._attr_max_temp = self.format_temperature(self._max_temp)
-        self._attr_min_temp = self.format_temperature(self._min_temp)
-
-    def format_temperature(self, temperature, round_half=False) -> float:
-        """Format the temperature."""
-        converted_temperature = (temperature / 10 - 32) / 1.8
-
-        if round_half:
-            return round(2 * converted_temperature) / 2
-        else:
-            return round(converted_temperature, 1)
+        self._attr_current_temperature = raw_to_celsius(self._current_temp)
+        self._attr_target_temperature = raw_to_celsius_half(self._target_temp)
+        self._attr_max_temp = raw_to_celsius(self._max_temp)
+        self._attr_min_temp = raw_to_celsius(self._min_temp)
 
     @property
     def current_temperature(self) -> float | None:
         """Return the current temperature."""
-        _LOGGER.debug(f"Getting current temperature for zone {self._zone_number}")
-        zone = self._controller.get_zone(self._zone_number)
-        if zone is not None:
-            channel = zone.channels[0]
-            return self.format_temperature(channel.current_temperature)
+        # The mean over the channels, like the zone temperature sensor.
+        aggregate = self._controller.get_zone_aggregate(self._zone_number, self._installation_unique, "current_temperature")
+        if aggregate is not None:
+            return aggregate["mean"]
 
         return self._attr_current_temperature
 
     @property
     def target_temperature(self) -> float | None:
         """Return the target temperature."""
-        _LOGGER.debug(f"Getting target temperature for zone {self._zone_number}")
-        zone = self._controller.get_zone(self._zone_number)
-        if zone is not None:
-            channel = zone.channels[0]
-            return self.format_temperature(channel.target_temperature, True)
+        temperature = self._controller.get_zone_celsius(self._zone_number, self._installation_unique, "target_temperature")
+        if temperature is not None:
+            return temperature
 
         return self._attr_target_temperature
 
+    @property
+    def min_temp(self) -> float:
+        """Return the minimum setpoint of the zone."""
+        temperature = self._controller.get_zone_celsius(self._zone_number, self._installation_unique, "setpoint_min")
+        return temperature if temperature is not None else self._attr_min_temp
+
+    @property
+    def max_temp(self) -> float:
+        """Return the maximum setpoint of the zone."""
+        temperature = self._controller.get_zone_celsius(self._zone_number, self._installation_unique, "setpoint_max")
+        return temperature if temperature is not None else self._attr_max_temp
+
     @property
     def hvac_mode(self) -> str | None:
         """Return the current operation mode."""
-        _LOGGER.debug(f"Getting operation mode for zone {self._zone_number}")
-        zone = self._controller.get_zone(self._zone_number)
-        if zone is not None:
-            channel = zone.channels[0]
-            return PRESET_CLIMATE_MODES_MAPPING[channel.operating_mode]
+        operating_mode = self._controller.get_zone_state(self._zone_number, self._installation_unique, "operating_mode")
+        if operating_mode is not None:
+            return PRESET_CLIMATE_MODES_MAPPING[operating_mode]
 
         return self._attr_hvac_mode
 
     @property
     def preset_mode(self) -> str | None:
         """Return the current energy level."""
-        _LOGGER.debug(f"Getting energy level for zone {self._zone_number}")
-        zone = self._controller.get_zone(self._zone_number)
-        if zone is not None:
-            channel = zone.channels[0]
-            return PRESET_ENERGY_LEVELS_MAPPING_REVERSE[channel.energy_level]
+        energy_level = self._controller.get_zone_state(self._zone_number, self._installation_unique, "energy_level")
+        if energy_level is not None:
+            return PRESET_ENERGY_LEVELS_MAPPING_REVERSE[energy_level]
 
         return self._attr_preset_mode
 
@@ -204,7 +227,9 @@ class RehauNeaSmart2RoomClimate(IntegrationRehauNeaSmart2Climate):
         """Set the preset mode of the climate entity."""
         mode = PRESET_ENERGY_LEVELS_MAPPING[preset_mode]
         _LOGGER.debug(f"Setting mode to {mode}")
-        self._controller.set_energy_level({"zone": self._zone_number, "mode": mode})
+        self._controller.set_energy_level(
+            {"zone": self._zone_number, "mode": mode, "installation": self._installation_unique}
+        )
 
     async def async_set_temperature(self, **kwargs):
         """Set the target temperature of the climate entity."""
@@ -212,10 +237,37 @@ class RehauNeaSmart2RoomClimate(IntegrationRehauNeaSmart2Climate):
         if temperature is None:
             return
         _LOGGER.debug(f"Setting temperature to {temperature}")
-        self._controller.set_temperature({"zone": self._zone_number, "temperature": temperature})
+        self._controller.set_temperature(
+            {"zone": self._zone_number, "temperature": temperature, "installation": self._installation_unique}
+        )
 
     async def async_set_hvac_mode(self, hvac_mode: str):
         """Set the HVAC mode of the climate entity."""
         operation_mode = PRESET_CLIMATE_MODES_MAPPING_REVERSE[hvac_mode]
         _LOGGER.debug(f"Setting operation mode to {operation_mode}")
         self._controller.set_operation_mode(operation_mode)
+
+    async def async_set_program(self, name: str | None = None, **days: list[str]):
+        """Update the comfort periods of the given days of the zone program."""
+        try:
+            program = {DAYS.index(day): [parse_period(period) for period in periods] for day, periods in days.items()}
+            sent = self._controller.set_zone_program(self._zone_number, self._installation_unique, program, name)
+        except MqttClientError as e:
+            raise HomeAssistantError(str(e)) from e
+        if not sent:
+            _LOGGER.warning("Program of zone %s already matches the edit, nothing was sent", self._zone_number)
+            return
+        _LOGGER.debug("Program of zone %s updated with %d messages", self._zone_number, sent)
+
+    async def async_clear_program(self):
+        """Remove the program of every day of the zone."""
+        try:
+            sent = self._controller.set_zone_program(
+                self._zone_number, self._installation_unique, {day: [] for day in range(len(DAYS))}
+            )
+        except MqttClientError as e:
+            raise HomeAssistantError(str(e)) from e
+        if not sent:
+            _LOGGER.warning("Program of zone %s is already cleared, nothing was sent", self._zone_number)
+            return
+        _LOGGER.debug("Program of zone %s cleared with %d messages", self._zone_number, sent)
@@ -4,6 +4,7 @@ from __future__ import annotations
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.const import CONF_EMAIL, CONF_PASSWORD
+from homeassistant.core import callback
 from homeassistant.helpers import selector
 
 from .rehau_mqtt_client import (
@@ -11,9 +12,10 @@ from .rehau_mqtt_client import (
     MqttClientCommunicationError,
     MqttClientError,
     MqttClient,
+    preload_transports,
 )
 
-from .const import DOMAIN, LOGGER
+from .const import CONF_METRICS_EXPORTER, DOMAIN, LOGGER
 
 
 class RehauNeaSmart2FlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
@@ -21,6 +23,14 @@ class RehauNeaSmart2FlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+            config_entry: config_entries.ConfigEntry,
+    ) -> config_entries.OptionsFlow:
+        """Get the options flow for this handler."""
+        return RehauNeaSmart2OptionsFlowHandler(config_entry)
+
     async def async_step_user(
             self,
             user_input: dict | None = None,
@@ -77,7 +87,36 @@ class RehauNeaSmart2FlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
         """Validate credentials."""
         try:
             LOGGER.debug("Testing credentials")
+            await self.hass.async_add_executor_job(preload_transports)
             await MqttClient.check_credentials(email=email, password=password)
         except Exception as exception:
             LOGGER.exception(exception)
             raise MqttClientAuthenticationError from exception
+
+
+class RehauNeaSmart2OptionsFlowHandler(config_entries.OptionsFlow):
+    """Options flow for the diagnostics features."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialize the options flow."""
+        self.config_entry = config_entry
+
+    async def async_step_init(
+            self,
+            user_input: dict | None = None,
+    ) -> config_entries.FlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_METRICS_EXPORTER,
+                        default=self.config_entry.options.get(CONF_METRICS_EXPORTER, False),
+                    ): selector.BooleanSelector(),
+                }
+            ),
+        )
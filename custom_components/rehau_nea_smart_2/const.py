@@ -16,6 +16,8 @@ DOMAIN = "rehau_nea_smart_2"
 VERSION = "0.1.0"
 ATTRIBUTION = "Data provided by REHAU Nea Smart 2.0 Mqtt API"
 
+CONF_METRICS_EXPORTER = "metrics_exporter"
+
 PRESET_ENERGY_LEVELS_MAPPING = {
     "normal": EnergyLevels.PRESENT_MODE.value,
     "reduced": EnergyLevels.ABSENT_MODE.value,
@@ -0,0 +1,55 @@
+"""Diagnostics support for rehau_nea_smart_2."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_EMAIL, CONF_PASSWORD
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .rehau_mqtt_client.Controller import Controller
+
+REDACTED = "**REDACTED**"
+
+TO_REDACT = {
+    CONF_EMAIL,
+    CONF_PASSWORD,
+    "id",
+    "unique",
+    "hash",
+    "title",
+}
+
+
+def _redact_topic(topic: str, secrets: list[str]) -> str:
+    """Replace the email and installation identifiers embedded in a topic."""
+    for secret in secrets:
+        topic = topic.replace(secret, REDACTED)
+    return topic
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    controller: Controller = hass.data[DOMAIN][entry.entry_id]
+    installations = controller.get_installations_as_dict() if controller.is_ready() else []
+
+    secrets = [entry.data[CONF_EMAIL]]
+    secrets.extend(installation["unique"] for installation in installations if installation["unique"])
+    messages = controller.get_recent_messages()
+    for message in messages:
+        message["topic"] = _redact_topic(message["topic"], secrets)
+
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "status": controller.get_status(),
+        "stage_timings": controller.get_stage_timings(),
+        "command_latency": controller.get_command_latency(),
+        "message_counts": controller.get_message_counts(),
+        "faults": async_redact_data(controller.get_fault_summary(), TO_REDACT),
+        "installations": async_redact_data(installations, TO_REDACT),
+        "recent_messages": messages,
+    }
@@ -0,0 +1,91 @@
+"""Monitoring of the controller error logs."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import issue_registry as ir
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, LOGGER
+from .rehau_mqtt_client.Controller import Controller
+from .rehau_mqtt_client.exceptions import MqttClientError
+
+FAULT_INTERVAL = timedelta(minutes=5)
+
+STORAGE_VERSION = 1
+
+# Seconds the save of the fault index is delayed.
+SAVE_DELAY = 30
+
+
+class RehauFaultMonitor:
+    """Read the new errors of every installation and raise repair issues for the active ones.
+
+    The fault index of the entry is persisted, so after a restart only the
+    errors logged since the newest indexed one are requested. Every active
+    error gets a repair issue, which is deleted once the error is resolved.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, controller: Controller):
+        """Initialize the monitor.
+
+        Args:
+            hass (HomeAssistant): The Home Assistant instance.
+            entry_id (str): The config entry the faults belong to.
+            controller (Controller): The controller of the entry.
+        """
+        self.hass = hass
+        self.controller = controller
+        self.issue_prefix = f"fault_{entry_id}_"
+        self.store: Store[dict] = Store(hass, STORAGE_VERSION, f"{DOMAIN}.faults.{entry_id}")
+
+    async def async_load(self):
+        """Load the persisted fault index and reconcile the repair issues with it."""
+        if data := await self.store.async_load():
+            self.controller.mqtt_client.faults.load(data)
+        self._async_update_issues()
+
+    async def async_refresh(self, now: datetime | None = None):
+        """Read the new errors of every installation.
+
+        Args:
+            now (datetime | None): The time of the run, passed by the time tracker.
+        """
+        changed = 0
+        for installation in self.controller.get_installations() or ():
+            try:
+                changed += len(await self.controller.fetch_errors(installation.unique))
+            except MqttClientError as e:
+                LOGGER.warning("Could not read the error log of %s: %s", installation.unique, e)
+        if not changed:
+            return
+        self.store.async_delay_save(self.controller.mqtt_client.faults.as_dict, SAVE_DELAY)
+        self._async_update_issues()
+        await self.controller.mqtt_client.publish_updates()
+
+    @callback
+    def _async_update_issues(self):
+        issues = {}
+        for unique, index in self.controller.mqtt_client.faults.installations.items():
+            for code, zone, timestamp in index.active_faults():
+                issues[f"{self.issue_prefix}{unique}_{code}_{zone}"] = {
+                    "code": code,
+                    "zone": str(zone) if zone is not None else "-",
+                    "since": datetime.fromtimestamp(timestamp, timezone.utc).isoformat(),
+                }
+
+        registry = ir.async_get(self.hass)
+        for domain, issue_id in list(registry.issues):
+            if domain == DOMAIN and issue_id.startswith(self.issue_prefix) and issue_id not in issues:
+                ir.async_delete_issue(self.hass, DOMAIN, issue_id)
+        for issue_id, placeholders in issues.items():
+            ir.async_create_issue(
+                self.hass,
+                DOMAIN,
+                issue_id,
+                is_fixable=False,
+                severity=ir.IssueSeverity.ERROR,
+                translation_key="controller_fault",
+                translation_placeholders=placeholders,
+            )
@@ -0,0 +1,46 @@
+"""Prometheus metrics exporter for rehau_nea_smart_2."""
+from __future__ import annotations
+
+from aiohttp import web
+from homeassistant.components.http import KEY_HASS, HomeAssistantView
+from homeassistant.core import HomeAssistant, callback
+
+from .const import CONF_METRICS_EXPORTER, DOMAIN
+from .rehau_mqtt_client import render_prometheus
+
+DATA_METRICS_VIEW = f"{DOMAIN}_metrics_view"
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class RehauNeaSmart2MetricsView(HomeAssistantView):
+    """Serve the metrics of the entries that enabled the exporter."""
+
+    url = f"/api/{DOMAIN}/metrics"
+    name = f"api:{DOMAIN}:metrics"
+    requires_auth = True
+
+    async def get(self, request: web.Request) -> web.Response:
+        """Render the metrics of every enabled entry, labelled by entry id."""
+        hass: HomeAssistant = request.app[KEY_HASS]
+        registries = {}
+        for entry in hass.config_entries.async_entries(DOMAIN):
+            controller = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+            if controller is None or controller.mqtt_client is None:
+                continue
+            if entry.options.get(CONF_METRICS_EXPORTER, False):
+                registries[entry.entry_id] = controller.mqtt_client.metrics
+
+        if not registries:
+            return web.Response(status=404)
+
+        return web.Response(body=render_prometheus(registries).encode(), headers={"Content-Type": CONTENT_TYPE})
+
+
+@callback
+def async_register_metrics_view(hass: HomeAssistant) -> None:
+    """Register the metrics view once; it serves every enabled entry."""
+    if hass.data.get(DATA_METRICS_VIEW):
+        return
+    hass.http.register_view(RehauNeaSmart2MetricsView())
+    hass.data[DATA_METRICS_VIEW] = True
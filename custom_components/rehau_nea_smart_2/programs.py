@@ -0,0 +1,39 @@
+"""Persistence of the cached room programs."""
+from __future__ import annotations
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+from .rehau_mqtt_client.Controller import Controller
+
+STORAGE_VERSION = 1
+
+# Seconds the save of an edited program is delayed, so consecutive edits are written once.
+SAVE_DELAY = 10
+
+
+class RehauProgramStore:
+    """Load the program cache of an entry and save it after every edit."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, controller: Controller):
+        """Initialize the program store.
+
+        Args:
+            hass (HomeAssistant): The Home Assistant instance.
+            entry_id (str): The config entry the programs belong to.
+            controller (Controller): The controller of the entry.
+        """
+        self.controller = controller
+        self.store: Store[dict] = Store(hass, STORAGE_VERSION, f"{DOMAIN}.programs.{entry_id}")
+
+    async def async_load(self):
+        """Load the cached programs and persist the later edits."""
+        programs = self.controller.mqtt_client.programs
+        if data := await self.store.async_load():
+            programs.load(data)
+        programs.listener = self._async_schedule_save
+
+    @callback
+    def _async_schedule_save(self):
+        self.store.async_delay_save(self.controller.mqtt_client.programs.as_dict, SAVE_DELAY)
@@ -1,11 +1,26 @@
 """Controller module for the REHAU NEA SMART 2 integration."""
+from __future__ import annotations
+
 from collections.abc import Callable
-from .utils import replace_keys, EnergyLevels, OperationModes, ClientTopics
-from .handlers import update_temperature, update_energy_level, update_operating_mode
+from typing import TYPE_CHECKING
+
+from .utils import get_by_value, replace_keys, EnergyLevels, OperationModes, ClientTopics, ServerTopics, raw_to_celsius, celsius_to_raw
 from .models import Installation, Zone
 from .MqttClient import MqttClient
 from .exceptions import MqttClientError
-from homeassistant.core import HomeAssistant
+from .store import ZoneAggregate, diff_program
+from .store.channel_table import COLUMNS, convert
+
+if TYPE_CHECKING:
+    import cProfile
+    from datetime import datetime
+
+    from homeassistant.core import HomeAssistant
+
+    from .instrumentation import TrafficRecorder
+    from .store import ZoneHistory
+
+EVENT_COMMAND_LATENCY = "rehau_nea_smart_2_command_latency"
 
 
 class Controller:
@@ -26,24 +41,26 @@ class Controller:
         self.auth_password = password
         self.mqtt_client = None
         self.hass = hass
+        self._snapshot_revision = None
+        self._installations_snapshot = None
+        self._zones_by_number = {}
 
     async def connect(self):
         """Connect to the MQTT broker and authenticates the user."""
         self.mqtt_client = MqttClient(hass=self.hass, username=self.auth_username, password=self.auth_password)
+        self.mqtt_client.tracer.listener = self._fire_command_latency
         await self.mqtt_client.auth_user()
 
     async def disconnect(self):
         """Disconnect from the MQTT broker."""
         self.mqtt_client.disconnect()
 
-    def is_connected(self, installation_unique: str):
+    def is_connected(self, installation_unique: str) -> bool:
         """Check if the installation is connected to the MQTT broker."""
-        Installations = self.get_installations_as_dict()
-        if Installations is None:
+        installation = self.mqtt_client.store.get_installation(installation_unique)
+        if installation is None:
             return False
-        for installation in Installations:
-            if installation["unique"] == installation_unique:
-                return installation["connected"]
+        return installation["connected"]
 
 
     def is_authenticated(self):
@@ -57,13 +74,26 @@ class Controller:
     def get_installations(self) -> list[Installation]:
         """Retrieve the list of installations.
 
+        The models are rebuilt only when the MQTT client reports a state change,
+        so repeated reads between two updates return the same snapshot.
+
         Returns:
             list[Installation]: The list of installations.
         """
-        installations = self.mqtt_client.get_installations()
-        if installations is None:
-            return None
-        return [Installation(**installation) for installation in installations]
+        revision = self.mqtt_client.installations_revision
+        if self._snapshot_revision != revision:
+            installations = self.mqtt_client.get_installations()
+            if installations is None:
+                return None
+            self._installations_snapshot = [Installation.from_dict(installation) for installation in installations]
+            self._zones_by_number = {
+                zone.number: zone
+                for installation in self._installations_snapshot
+                for group in installation.groups
+                for zone in group.zones
+            }
+            self._snapshot_revision = revision
+        return self._installations_snapshot
 
     def get_installations_as_dict(self) -> list[dict]:
         """Retrieve the list of installations as a dictionary.
@@ -98,11 +128,24 @@ class Controller:
         Raises:
             MqttClientError: If no zone is found for the given zone number.
         """
-        for zone in self.get_zones():
-            if zone.number == zone_number:
-                return zone
+        self.get_installations()
+        zone = self._zones_by_number.get(zone_number)
+        if zone is not None:
+            return zone
         raise MqttClientError("No zone found for zone " + str(zone_number))
 
+    def get_zone_history(self, zone_number: int, installation_unique: str) -> ZoneHistory | None:
+        """Retrieve the recorded history of a specific zone.
+
+        Args:
+            zone_number (int): The zone number.
+            installation_unique (str): The unique of the installation of the zone.
+
+        Returns:
+            ZoneHistory | None: The samples, downsampled series and running averages, None before the first sample.
+        """
+        return self.mqtt_client.history.get(installation_unique, zone_number)
+
     def get_installation_unique_by_zone(self, zone_number: int) -> str:
         """Retrieve the unique installation identifier for a specific zone.
 
@@ -115,12 +158,9 @@ class Controller:
         Raises:
             MqttClientError: If no zone is found for the given zone number.
         """
-        installations = self.get_installations_as_dict()
-        for installation in installations:
-            for group in installation["groups"]:
-                for zone in group["zones"]:
-                    if zone["number"] == zone_number:
-                        return installation["unique"]
+        entry = self.mqtt_client.store.get_zone(zone_number)
+        if entry is not None:
+            return entry[0]["unique"]
         raise MqttClientError("No zone found for zone " + str(zone_number))
 
     def get_zone_value_by_key(self, key: str, zone_number: int):
@@ -136,38 +176,166 @@ class Controller:
         Raises:
             MqttClientError: If no zone is found for the given zone number or if no value is found for the key.
         """
-        installations = self.get_installations_as_dict()
-        for installation in installations:
-            for group in installation["groups"]:
-                for zone in group["zones"]:
-                    if zone["number"] == zone_number:
-                        if len(zone["channels"]) > 1 or key != "_id":
-                            values = []
-                            for channel in zone["channels"]:
-                                if key in channel:
-                                    values.append(channel[key])
-                            if len(values) == 0:
-                                raise MqttClientError(
-                                    "No value found for key "
-                                    + key
-                                    + " in zone "
-                                    + str(zone_number)
-                                )
-                            return sum(values) / len(values)
-                        else:
-                            raise MqttClientError(
-                                "Multiple channels found for zone "
-                                + str(zone_number)
-                                + " cannot return _id"
-                            )
-        raise MqttClientError("No zone found for zone " + str(zone_number))
+        entry = self.mqtt_client.store.get_zone(zone_number)
+        if entry is None:
+            raise MqttClientError("No zone found for zone " + str(zone_number))
+
+        zone = entry[1]
+        if len(zone["channels"]) > 1 or key != "_id":
+            values = []
+            for channel in zone["channels"]:
+                if key in channel:
+                    values.append(channel[key])
+            if len(values) == 0:
+                raise MqttClientError(
+                    "No value found for key "
+                    + key
+                    + " in zone "
+                    + str(zone_number)
+                )
+            return sum(values) / len(values)
+        else:
+            raise MqttClientError(
+                "Multiple channels found for zone "
+                + str(zone_number)
+                + " cannot return _id"
+            )
 
-    def get_temperature(self, zone: int, unit="C") -> float:
+    def get_zone_celsius(self, zone_number: int, installation_unique: str, column: str) -> float | None:
+        """Retrieve a Celsius value of the first channel of a zone.
+
+        Reads the channel table when it is enabled and converts the stored
+        raw value otherwise.
+
+        Args:
+            zone_number (int): The zone number.
+            installation_unique (str): The unique of the installation of the zone.
+            column (str): The channel table column, e.g. "current_temperature".
+
+        Returns:
+            float | None: The value in Celsius, or None if the zone is unknown.
+        """
+        store = self.mqtt_client.store
+        if store.channel_table is not None:
+            return store.channel_table.zone_value(zone_number, installation_unique, column)
+
+        zone = store.get_installation_zone(installation_unique, zone_number)
+        if zone is None or len(zone["channels"]) == 0:
+            return None
+        getter, round_half = COLUMNS[column]
+        return convert(getter(zone["channels"][0]), round_half)
+
+    def get_zone_state(self, zone_number: int, installation_unique: str, column: str) -> int | None:
+        """Retrieve the energy level or operating mode of the first channel of a zone.
+
+        Args:
+            zone_number (int): The zone number.
+            installation_unique (str): The unique of the installation of the zone.
+            column (str): "energy_level" or "operating_mode".
+
+        Returns:
+            int | None: The value, or None if the zone is unknown.
+        """
+        store = self.mqtt_client.store
+        if store.channel_table is not None:
+            return store.channel_table.zone_state(zone_number, installation_unique, column)
+
+        zone = store.get_installation_zone(installation_unique, zone_number)
+        if zone is None or len(zone["channels"]) == 0:
+            return None
+        return zone["channels"][0][column]
+
+    def get_zone_aggregate(self, zone_number: int, installation_unique: str, column: str) -> dict[str, float] | None:
+        """Retrieve the mean, minimum and maximum Celsius value of a zone over its channels.
+
+        The aggregates are kept up to date by the channel table. Without it
+        they are computed from the stored channels.
+
+        Args:
+            zone_number (int): The zone number.
+            installation_unique (str): The unique of the installation of the zone.
+            column (str): "current_temperature" or "target_temperature".
+
+        Returns:
+            dict[str, float] | None: The "mean", "min" and "max" values, or None if the zone is unknown.
+        """
+        store = self.mqtt_client.store
+        if store.channel_table is not None:
+            return store.channel_table.zone_aggregate(zone_number, installation_unique, column)
+
+        zone = store.get_installation_zone(installation_unique, zone_number)
+        if zone is None or len(zone["channels"]) == 0:
+            return None
+        getter, round_half = COLUMNS[column]
+        values = [getter(channel) for channel in zone["channels"]]
+        aggregate = ZoneAggregate(tuple(range(len(values))), values)
+        return {
+            "mean": convert(aggregate.mean, round_half),
+            "min": convert(aggregate.minimum, round_half),
+            "max": convert(aggregate.maximum, round_half),
+        }
+
+    def get_channel_celsius(self, channel_id: str, column: str) -> float | None:
+        """Retrieve a Celsius value of one channel.
+
+        Args:
+            channel_id (str): The channel identifier.
+            column (str): The channel table column, e.g. "current_temperature".
+
+        Returns:
+            float | None: The value in Celsius, or None if the channel is unknown.
+        """
+        store = self.mqtt_client.store
+        if store.channel_table is not None:
+            return store.channel_table.channel_value(channel_id, column)
+
+        entry = store.get_channel(channel_id)
+        if entry is None:
+            return None
+        getter, round_half = COLUMNS[column]
+        return convert(getter(entry[2]), round_half)
+
+    def get_channel_state(self, channel_id: str, column: str) -> int | None:
+        """Retrieve the energy level or operating mode of one channel.
+
+        Args:
+            channel_id (str): The channel identifier.
+            column (str): "energy_level" or "operating_mode".
+
+        Returns:
+            int | None: The value, or None if the channel is unknown.
+        """
+        store = self.mqtt_client.store
+        if store.channel_table is not None:
+            return store.channel_table.channel_state(channel_id, column)
+
+        entry = store.get_channel(channel_id)
+        return entry[2][column] if entry is not None else None
+
+    def get_channel_version(self, channel_id: str) -> int | None:
+        """Retrieve a number that changes whenever a value of the channel changes.
+
+        Without the channel table the revision of the whole store is returned.
+
+        Args:
+            channel_id (str): The channel identifier.
+
+        Returns:
+            int | None: The version, or None if the channel is unknown.
+        """
+        store = self.mqtt_client.store
+        if store.channel_table is not None:
+            return store.channel_table.channel_version(channel_id)
+        return store.revision if store.get_channel(channel_id) is not None else None
+
+    def get_temperature(self, zone: int, unit="C", installation_unique: str | None = None) -> float:
         """Retrieve the temperature for a specific zone.
 
         Args:
             zone (int): The zone number.
             unit (str, optional): The unit of temperature. Defaults to "C".
+            installation_unique (str | None, optional): The unique of the installation of the zone.
+                Defaults to the first installation with that zone number.
 
         Returns:
             float: The temperature value.
@@ -175,18 +343,30 @@ class Controller:
         Raises:
             MqttClientError: If no zone is found for the given zone number.
         """
-        temperature = self.get_zone_value_by_key("current_temperature", zone) / 10
+        store = self.mqtt_client.store
+        if installation_unique is None:
+            installation_unique = self.get_installation_unique_by_zone(zone)
+        if unit == "C" and store.channel_table is not None:
+            temperature = store.channel_table.zone_current_temperature.get((installation_unique, zone))
+            if temperature is None:
+                raise MqttClientError("No zone found for zone " + str(zone))
+            return temperature
+
+        entry = store.get_installation_zone(installation_unique, zone)
+        if entry is None or len(entry["channels"]) == 0:
+            raise MqttClientError("No zone found for zone " + str(zone))
+        temperature = sum(channel["current_temperature"] for channel in entry["channels"]) / len(entry["channels"])
         if unit == "C":
-            temperature_celsius = (temperature - 32) / 1.8
-            return round(temperature_celsius, 1)
+            return raw_to_celsius(temperature)
 
-        return temperature
+        return temperature / 10
 
     def set_temperature(self, payload: dict):
         """Set the temperature for a specific zone.
 
         Args:
-            payload (dict): The payload containing the temperature and zone information.
+            payload (dict): The payload containing the temperature and zone information, and
+                optionally the unique of the installation of the zone, the default installation if missing.
 
         Returns:
             Any: The result of the message sending operation.
@@ -200,24 +380,29 @@ class Controller:
         if "zone" not in payload:
             raise MqttClientError("No zone found in payload")
 
-        temperature = payload["temperature"] * 10
         if "unit" not in payload or payload["unit"] == "C":
-            temperature = temperature * 1.8 + 320
-
-        int_temperature = int(temperature)
+            int_temperature = celsius_to_raw(payload["temperature"])
+        else:
+            int_temperature = int(payload["temperature"] * 10)
 
-        temperature_request = replace_keys(
+        temperature_request = self._build_request(
+            "set_temperature",
             {
                 "controller": payload["controller"] if "controller" in payload else 0,
                 "data": {"setpoint_used": int_temperature},
                 "type": "REQ_TH",
                 "zone": payload["zone"],
             },
-            self.mqtt_client.get_referentials(),
         )
 
-        update_temperature(self.get_installations_as_dict(), payload["zone"], int_temperature)
-        return self.mqtt_client.send_message(ClientTopics.INSTALLATION.value, temperature_request)
+        unique = payload.get("installation") or self.mqtt_client.get_install_unique()
+        published, result = self.mqtt_client.publish_message(ClientTopics.INSTALLATION.value, temperature_request, unique)
+        if published:
+            self.mqtt_client.tracer.start("set_temperature", unique, payload["zone"], "setpoint_used", int_temperature)
+            self._apply_pending(
+                self.mqtt_client.pending.set_zone(unique, payload["zone"], "target_temperature", int_temperature)
+            )
+        return result
 
     def get_energy_level(self, zone: int) -> EnergyLevels:
         """Retrieve the energy level for a specific zone.
@@ -238,7 +423,8 @@ class Controller:
         """Set the energy level for a specific zone.
 
         Args:
-            payload (dict): The payload containing the mode and zone information.
+            payload (dict): The payload containing the mode and zone information, and
+                optionally the unique of the installation of the zone, the default installation if missing.
 
         Returns:
             Any: The result of the message sending operation.
@@ -252,18 +438,135 @@ class Controller:
         if "zone" not in payload:
             raise MqttClientError("No zone found in payload")
 
-        energy_level_request = replace_keys(
+        energy_level_request = self._build_request(
+            "set_energy_level",
             {
                 "controller": payload["controller"] if "controller" in payload else 0,
                 "data": {"mode_permanent": payload["mode"]},
                 "type": "REQ_TH",
                 "zone": payload["zone"],
             },
-            self.mqtt_client.get_referentials(),
         )
 
-        update_energy_level(self.get_installations_as_dict(), payload["zone"], payload["mode"])
-        return self.mqtt_client.send_message(ClientTopics.INSTALLATION.value, energy_level_request)
+        unique = payload.get("installation") or self.mqtt_client.get_install_unique()
+        published, result = self.mqtt_client.publish_message(ClientTopics.INSTALLATION.value, energy_level_request, unique)
+        if published:
+            self.mqtt_client.tracer.start("set_energy_level", unique, payload["zone"], "mode_used", payload["mode"])
+            self._apply_pending(self.mqtt_client.pending.set_zone(unique, payload["zone"], "energy_level", payload["mode"]))
+        return result
+
+    def set_zones(self, changes: list[dict]) -> dict:
+        """Set the temperature and energy level of many zones with as few messages as possible.
+
+        The changes are grouped by installation and controller and zones
+        already at the requested value are skipped. The energy levels of a
+        group are sent as one message per level listing the impacted zones.
+        A setpoint request names a single zone, so every changed setpoint is
+        its own message, with the referential keys looked up once. A zone is
+        only reported as sent once all of its messages were published.
+
+        Args:
+            changes (list[dict]): Per zone the "zone" number, a "temperature" in Celsius, a "mode" energy
+                level or both, and optionally the "installation" unique (the first installation with that
+                zone number if missing) and the "controller" (0 if missing). A later change of a zone wins.
+
+        Returns:
+            dict: The number of messages sent, their message IDs and the zone numbers per status:
+                "sent", "failed", "unchanged" and "unknown".
+
+        Raises:
+            MqttClientError: If a change has neither a temperature nor a mode.
+        """
+        store = self.mqtt_client.store
+        result = {"messages": 0, "message_ids": [], "sent": [], "failed": [], "unchanged": [], "unknown": []}
+        setpoints: dict[tuple[str, int], dict[int, int]] = {}
+        modes: dict[tuple[str, int], dict[int, int]] = {}
+        changed_zones: dict[tuple[str, int], None] = {}
+        for change in changes:
+            if change.get("temperature") is None and change.get("mode") is None:
+                raise MqttClientError("No temperature or mode found for zone " + str(change.get("zone")))
+            zone_number = change["zone"]
+            unique = change.get("installation")
+            if unique is None:
+                entry = store.get_zone(zone_number)
+                zone = entry[1] if entry is not None else None
+                unique = entry[0]["unique"] if entry is not None else None
+            else:
+                zone = store.get_installation_zone(unique, zone_number)
+            if zone is None:
+                result["unknown"].append(zone_number)
+                continue
+
+            group = (unique, change.get("controller", 0))
+            channels = zone["channels"]
+            changed = False
+            if change.get("temperature") is not None:
+                raw = celsius_to_raw(change["temperature"])
+                if any(channel["target_temperature"] != raw for channel in channels):
+                    setpoints.setdefault(group, {})[zone_number] = raw
+                    changed = True
+            if change.get("mode") is not None:
+                if any(channel["energy_level"] != change["mode"] for channel in channels):
+                    modes.setdefault(group, {})[zone_number] = change["mode"]
+                    changed = True
+            if changed:
+                changed_zones[(unique, zone_number)] = None
+            else:
+                result["unchanged"].append(zone_number)
+
+        if not changed_zones:
+            return result
+
+        keys = self._referential_keys("controller", "data", "type", "zone", "setpoint_used", "mode_used", "zone_impacted")
+        counter = self.mqtt_client.metrics.counter("rehau_commands_total", "Commands sent by name.")
+        channel_ids = []
+        failed: set[tuple[str, int]] = set()
+        for (unique, controller), zone_setpoints in setpoints.items():
+            for zone_number, raw in zone_setpoints.items():
+                counter.inc(command="set_zones_temperature")
+                published, mid = self.mqtt_client.publish_message(
+                    ClientTopics.INSTALLATION.value,
+                    {
+                        keys["controller"]: controller,
+                        keys["data"]: {keys["setpoint_used"]: raw},
+                        keys["type"]: "REQ_TH",
+                        keys["zone"]: zone_number,
+                    },
+                    unique,
+                )
+                if not published:
+                    failed.add((unique, zone_number))
+                    continue
+                result["message_ids"].append(mid)
+                self.mqtt_client.tracer.start("set_temperature", unique, zone_number, "setpoint_used", raw)
+                channel_ids.extend(self.mqtt_client.pending.set_zone(unique, zone_number, "target_temperature", raw))
+        for (unique, controller), zone_modes in modes.items():
+            by_mode: dict[int, list[int]] = {}
+            for zone_number, mode in zone_modes.items():
+                by_mode.setdefault(mode, []).append(zone_number)
+            for mode, zone_numbers in by_mode.items():
+                counter.inc(command="set_zones_energy_level")
+                published, mid = self.mqtt_client.publish_message(
+                    ClientTopics.INSTALLATION.value,
+                    {
+                        keys["controller"]: controller,
+                        keys["data"]: {keys["mode_used"]: mode, keys["zone_impacted"]: zone_numbers},
+                        keys["type"]: "REQ_TH",
+                    },
+                    unique,
+                )
+                if not published:
+                    failed.update((unique, zone_number) for zone_number in zone_numbers)
+                    continue
+                result["message_ids"].append(mid)
+                for zone_number in zone_numbers:
+                    self.mqtt_client.tracer.start("set_energy_level", unique, zone_number, "mode_used", mode)
+                    channel_ids.extend(self.mqtt_client.pending.set_zone(unique, zone_number, "energy_level", mode))
+        for key in changed_zones:
+            result["failed" if key in failed else "sent"].append(key[1])
+        result["messages"] = len(result["message_ids"])
+        self._apply_pending(channel_ids)
+        return result
 
     def get_global_energy_level(self) -> EnergyLevels:
         """Retrieve the global energy level.
@@ -300,7 +603,8 @@ class Controller:
                     zones[installation["unique"]].append(zone["number"])
 
         for _installation_unique, zones in zones.items():
-            global_energy_level_request = replace_keys(
+            global_energy_level_request = self._build_request(
+                "set_global_energy_level",
                 {
                     "controller": payload["controller"]
                     if "controller" in payload
@@ -308,7 +612,6 @@ class Controller:
                     "data": {"mode_used": payload["mode"], "zone_impacted": zones},
                     "type": "REQ_TH",
                 },
-                self.mqtt_client.get_referentials(),
             )
 
             return self.mqtt_client.send_message(ClientTopics.INSTALLATION.value, global_energy_level_request)
@@ -343,17 +646,308 @@ class Controller:
         # mode to string with 0 padding
         mode = str(mode).zfill(2)
 
-        operation_mode_request = replace_keys(
+        operation_mode_request = self._build_request(
+            "set_operation_mode",
             {
                 "data": {"heat_cool": mode},
                 "type": "REQ_TH",
             },
-            self.mqtt_client.get_referentials(),
         )
 
 
-        update_operating_mode(self.get_installations_as_dict(), self.mqtt_client.get_install_id, mode)
-        return self.mqtt_client.send_message(ClientTopics.INSTALLATION.value, operation_mode_request)
+        result = self.mqtt_client.send_message(ClientTopics.INSTALLATION.value, operation_mode_request)
+        # The snapshots are not coerced like the former pydantic models, so store the numeric mode.
+        self._apply_pending(
+            self.mqtt_client.pending.set_installation(self.mqtt_client.get_install_unique(), "operating_mode", int(mode))
+        )
+        return result
+
+    def get_zone_program(self, zone_number: int, installation_unique: str) -> dict[int, tuple[tuple[int, int], ...]]:
+        """Retrieve the cached weekly program of a zone.
+
+        Args:
+            zone_number (int): The zone number.
+            installation_unique (str): The unique of the installation of the zone.
+
+        Returns:
+            dict[int, tuple[tuple[int, int], ...]]: The comfort periods in minutes by day index, Monday being 0.
+        """
+        return self.mqtt_client.programs.get(installation_unique, zone_number)
+
+    def get_zone_program_name(self, zone_number: int, installation_unique: str) -> str | None:
+        """Retrieve the cached program name of a zone, None if it has none."""
+        return self.mqtt_client.programs.get_name(installation_unique, zone_number)
+
+    def get_zone_comfort_period(self, zone_number: int, installation_unique: str, when: datetime) -> tuple[int, int] | None:
+        """Retrieve the cached comfort period a zone is in at a time.
+
+        Args:
+            zone_number (int): The zone number.
+            installation_unique (str): The unique of the installation of the zone.
+            when (datetime): The local time to check.
+
+        Returns:
+            tuple[int, int] | None: The start and end minute of the period, None outside of the comfort periods.
+        """
+        return self.mqtt_client.programs.comfort_period(installation_unique, zone_number, when)
+
+    def get_zone_program_next_change(self, zone_number: int, installation_unique: str, when: datetime) -> tuple[int, int] | None:
+        """Retrieve the next switch of the cached program of a zone after a time.
+
+        Args:
+            zone_number (int): The zone number.
+            installation_unique (str): The unique of the installation of the zone.
+            when (datetime): The local time to start from.
+
+        Returns:
+            tuple[int, int] | None: The day index and minute of the switch, None if the zone has no program.
+        """
+        return self.mqtt_client.programs.next_change(installation_unique, zone_number, when)
+
+    def set_zone_program(self, zone_number: int, installation_unique: str, days: dict, name: str | None = None) -> int:
+        """Update the weekly program of a zone, sending only what changed.
+
+        The edited days the cache knows to be current are compared with the
+        cached program, the others are always sent since the app may have
+        changed them. The changed days are sent in one program set request,
+        the emptied days in one unset request and the name only if it differs
+        from a current cache.
+
+        Args:
+            zone_number (int): The zone number.
+            installation_unique (str): The unique of the installation of the zone.
+            days (dict): The comfort periods in minutes of the edited days, by day index. An empty list removes the day.
+            name (str | None): The program name, None to keep it.
+
+        Returns:
+            int: The number of messages sent.
+
+        Raises:
+            MqttClientError: If a day or period is invalid.
+        """
+        programs = self.mqtt_client.programs
+        known = programs.known_days(installation_unique, zone_number)
+        changed, cleared = diff_program(programs.get(installation_unique, zone_number), days, known)
+        if known and name == programs.get_name(installation_unique, zone_number):
+            name = None
+        counter = self.mqtt_client.metrics.counter("rehau_commands_total", "Commands sent by name.")
+        base = {"unique": installation_unique, "zone": zone_number}
+        sent = 0
+        if changed:
+            counter.inc(command="set_program")
+            days_data = {str(day): [list(period) for period in periods] for day, periods in changed.items()}
+            self.mqtt_client.send_server_request(
+                ServerTopics.ROOM_PROGRAM_SET.value, {**base, "days": days_data}, installation_unique
+            )
+            sent += 1
+        if cleared:
+            counter.inc(command="unset_program")
+            self.mqtt_client.send_server_request(
+                ServerTopics.ROOM_PROGRAM_UNSET.value, {**base, "days": cleared}, installation_unique
+            )
+            sent += 1
+        if name is not None:
+            counter.inc(command="program_name")
+            self.mqtt_client.send_server_request(ServerTopics.PROGRAM_NAME.value, {**base, "name": name}, installation_unique)
+            sent += 1
+        if sent:
+            programs.apply(installation_unique, zone_number, changed, cleared, name)
+        return sent
+
+    def _apply_pending(self, channel_ids: list[str]):
+        """Publish the optimistic values of a sent command without waiting for the echo.
+
+        Args:
+            channel_ids (list[str]): The channels the pending values were written to.
+        """
+        self.mqtt_client.mark_installations_changed(channel_ids)
+        self.hass.async_create_task(self.mqtt_client.publish_updates())
+
+    def _referential_keys(self, *names: str) -> dict[str, str]:
+        """Look up the referential indexes ``replace_keys`` would use for the given keys.
+
+        Args:
+            names (str): The readable key names.
+
+        Returns:
+            dict[str, str]: The key to send for each name, the name itself if it has no referential.
+        """
+        referentials = self.mqtt_client.get_referentials()
+        with self.mqtt_client.timings.measure("replace_keys"):
+            keys = {}
+            for name in names:
+                referential = get_by_value(name, referentials)
+                keys[name] = str(referential["index"]) if referential else name
+            return keys
+
+    def _build_request(self, command: str, request: dict) -> dict:
+        """Count a command and replace the keys of its request with their referential indexes.
+
+        Args:
+            command (str): The name of the command, used as metric label.
+            request (dict): The request using the readable key names.
+
+        Returns:
+            dict: The request to send.
+        """
+        self.mqtt_client.metrics.counter("rehau_commands_total", "Commands sent by name.").inc(command=command)
+        with self.mqtt_client.timings.measure("replace_keys"):
+            return replace_keys(request, self.mqtt_client.get_referentials())
+
+    def get_stage_timings(self) -> dict[str, dict]:
+        """Retrieve the rolling timings of the message and polling stages.
+
+        Returns:
+            dict[str, dict]: The count and the p50, p95, max and last durations in milliseconds per stage.
+        """
+        return self.mqtt_client.timings.summary()
+
+    def get_message_counts(self) -> dict[str, dict[str, int]]:
+        """Retrieve the number of inbound messages by type and dispatch result.
+
+        Returns:
+            dict[str, dict[str, int]]: The handled, unhandled, invalid and failed counts per message type.
+        """
+        return self.mqtt_client.dispatcher.summary()
+
+    def get_stage_timing(self, stage: str) -> dict:
+        """Retrieve the rolling timing of one stage.
+
+        Args:
+            stage (str): The stage name.
+
+        Returns:
+            dict: The count and the p50, p95, max and last durations in milliseconds.
+        """
+        return self.mqtt_client.timings.stages[stage].summary()
+
+    def get_status(self) -> dict:
+        """Retrieve the connection and scheduler status of the MQTT client.
+
+        Returns:
+            dict: The status reported by the MQTT client.
+        """
+        return self.mqtt_client.get_status()
+
+    def get_recent_messages(self) -> list[dict]:
+        """Retrieve the most recent inbound and outbound MQTT messages.
+
+        Returns:
+            list[dict]: The timestamp, direction, topic, size and type of each message, oldest first.
+        """
+        return self.mqtt_client.message_log.as_list()
+
+    async def read_statistics(self, installation_unique: str, start: float, end: float) -> list[dict]:
+        """Retrieve the statistics buckets of an installation from the server.
+
+        Args:
+            installation_unique (str): The installation unique.
+            start (float): The UNIX timestamp of the first bucket.
+            end (float): The UNIX timestamp after the last bucket.
+
+        Returns:
+            list[dict]: The zone, start, temperature, setpoint and demand of each bucket.
+
+        Raises:
+            MqttClientCommunicationError: If the statistics are not received in time.
+        """
+        return await self.mqtt_client.read_statistics(installation_unique, start, end)
+
+    async def fetch_errors(self, installation_unique: str) -> list[str]:
+        """Read the new part of the error log of an installation into the fault index.
+
+        Args:
+            installation_unique (str): The installation unique.
+
+        Returns:
+            list[str]: The identifiers of the new errors and of the errors whose active state changed.
+
+        Raises:
+            MqttClientCommunicationError: If a page is not received in time.
+        """
+        return await self.mqtt_client.fetch_errors(installation_unique)
+
+    def get_mixed_circuits(self, installation_unique: str) -> dict[int, dict]:
+        """Retrieve the last polled mixed circuits of an installation.
+
+        Args:
+            installation_unique (str): The installation unique.
+
+        Returns:
+            dict[int, dict]: The name, flow and return temperatures and valve opening by circuit number.
+        """
+        return self.mqtt_client.store.mixed_circuits.get(installation_unique, {})
+
+    def get_active_faults(self, installation_unique: str, zone_number: int | None = None) -> list[tuple[str, int | None, float]]:
+        """Retrieve the active errors of an installation.
+
+        Args:
+            installation_unique (str): The installation unique.
+            zone_number (int | None): Only return the errors of this zone, all of them if None.
+
+        Returns:
+            list[tuple[str, int | None, float]]: The code, zone number and timestamp of each error, newest first.
+        """
+        return self.mqtt_client.faults.get(installation_unique).active_faults(zone_number)
+
+    def get_fault_summary(self) -> list[dict]:
+        """Retrieve the error counts of every installation.
+
+        Returns:
+            list[dict]: The installation "unique", its "errors_by_code" and the number of "active" errors.
+        """
+        return [
+            {"unique": unique, "errors_by_code": index.count_by_code(), "active": len(index.active)}
+            for unique, index in self.mqtt_client.faults.installations.items()
+        ]
+
+    def get_command_latency(self) -> dict:
+        """Retrieve the latency histograms of the traced zone commands.
+
+        Returns:
+            dict: The round trip and state latencies in milliseconds and the timeout counters.
+        """
+        return self.mqtt_client.tracer.summary()
+
+    def start_profiling(self):
+        """Start profiling the message, polling and state update paths."""
+        self.mqtt_client.profiler.start()
+
+    def stop_profiling(self) -> cProfile.Profile | None:
+        """Stop profiling.
+
+        Returns:
+            cProfile.Profile | None: The collected profile, or None if profiling was not started.
+        """
+        return self.mqtt_client.profiler.stop()
+
+    def start_capture(self, path: str):
+        """Start capturing the inbound traffic to a file.
+
+        Args:
+            path (str): The gzip compressed capture file.
+
+        Raises:
+            MqttClientError: If a capture is already running.
+        """
+        self.mqtt_client.start_capture(path)
+
+    def stop_capture(self) -> TrafficRecorder | None:
+        """Stop capturing the inbound traffic.
+
+        Returns:
+            TrafficRecorder | None: The recorder to close from an executor, or None if no capture was running.
+        """
+        return self.mqtt_client.stop_capture()
+
+    def _fire_command_latency(self, result: dict):
+        """Fire the command latency event for a finished command.
+
+        Args:
+            result (dict): The command, installation, zone, value, status and latencies of the command.
+        """
+        if self.hass is not None:
+            self.hass.bus.async_fire(EVENT_COMMAND_LATENCY, result)
 
     def is_ready(self) -> bool:
         """Check if the controller is connected to the MQTT broker.
@@ -1,38 +1,85 @@
 """MQTT client for the Rehau NEA Smart 2 integration."""
+from __future__ import annotations
+
 import asyncio
 import json
 from collections.abc import Callable
-import paho.mqtt.client as mqtt
 import logging
-import schedule
-import aiocron
 import time
-import re
-
-from .utils import generate_uuid, ServerTopics, ClientTopics
-from .handlers import handle_message, auth, refresh, parse_installations, read_user_state
+from typing import TYPE_CHECKING
+
+from .utils import AdaptiveInterval, generate_uuid, get_global_energy_level, ServerTopics
+from .handlers import handle_message, auth, refresh, parse_installations, read_user_state, create_dispatcher, TopicRouter
+from .handlers.errors import ERROR_SEARCH_RESPONSE
+from .handlers.mixed_circuits import MIXED_CIRCUITS_RESPONSE
+from .instrumentation import (
+    OUTBOUND,
+    SIZE_BUCKETS,
+    KIND_HTTP,
+    KIND_MQTT,
+    CommandTracer,
+    MessageLog,
+    MetricsRegistry,
+    SectionProfiler,
+    StageTimings,
+    TrafficRecorder,
+)
+from .store import FaultStore, HistoryStore, PendingOverlay, ProgramCache, StateStore, compact_user
+from .store.pending import CHANNEL_UPDATE_FIELDS
 from .exceptions import (
     MqttClientAuthenticationError,
     MqttClientCommunicationError,
     MqttClientError,
 )
-from homeassistant.core import HomeAssistant
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
 
 
 _LOGGER = logging.getLogger(__name__)
 
+# Mirrors paho.mqtt.client.MQTT_ERR_SUCCESS so paho is only imported when a
+# connection is actually opened (see init_mqtt_client).
+MQTT_ERR_SUCCESS = 0
+
+# Seconds to wait for the response of a server request.
+RESPONSE_TIMEOUT = 30
+
+# Errors requested per page of the error log, and the pages read per fetch.
+ERROR_PAGE_SIZE = 50
+ERROR_MAX_PAGES = 20
+
+# Seconds between two reads of the log from the oldest active error, to pick up resolutions.
+ERROR_RECHECK_INTERVAL = 1800
+
+# Bounds of the adaptive polling interval of the mixed circuits, in seconds.
+MIXED_CIRCUITS_MIN_INTERVAL = 60
+MIXED_CIRCUITS_MAX_INTERVAL = 900
+
+# Seconds between the HTTP polls while the realtime topic keeps the state current.
+RECONCILE_INTERVAL = 900
+
+
+def _validate_installations(installations: list[dict]):
+    """Validate parsed installations, importing the schema and pydantic on first use."""
+    from .models.schema import validate_installations
+
+    validate_installations(installations)
+
+
 class MqttClient:
     """MQTT client for the Rehau NEA Smart 2 integration."""
 
     MAX_CONNECT_RETRIES = 5
 
-    def __init__(self, hass: HomeAssistant, username, password):
+    def __init__(self, hass: HomeAssistant, username, password, use_channel_table=True):
         """Initialize the MQTT client.
 
         Args:
             hass: The Home Assistant instance.
             username: The MQTT username.
             password: The MQTT password.
+            use_channel_table: Keep the channel values in the columnar channel table.
         """
         self.hass = hass
         self.username = "app"
@@ -41,7 +88,14 @@ class MqttClient:
         self.auth_password = password
         self.token_data = None
         self.user = None
-        self.installations = None
+        self.store = StateStore(use_channel_table=use_channel_table)
+        self.history = HistoryStore()
+        self.programs = ProgramCache()
+        self.faults = FaultStore()
+        self.errors_rechecked: dict[str, float] = {}
+        self.pending = PendingOverlay(self.store)
+        self.pending.listener = self._rolled_back
+        self.mixed_circuit_schedules: dict[str, AdaptiveInterval] = {}
         self.authenticated = False
         self.referentials = None
         self.transaction_id = None
@@ -53,15 +107,44 @@ class MqttClient:
         }
         self.client_id = "app-" + generate_uuid()
         self.client = None
-        self.subscribe_topics = lambda: [
-            {"topic": ClientTopics.LISTEN.value, "options": {}},
-            {"topic": ClientTopics.LISTEN_TO_CONTROLLER.value, "options": {}},
-        ]
+        self.topics = TopicRouter()
+        self.subscribed_topics: list[str] = []
         self.stop_scheduler_loop = False
         self.scheduler_task = None
+        self.scheduler_jobs = []
+        self.last_refresh = None
+        self.reconcile_due = True
+        self.temperature_pushed = False
         self.number_of_retries = 0
         self.number_of_message_failures = 0
         self.callbacks = set()
+        self.metrics = MetricsRegistry()
+        self.timings = StageTimings(registry=self.metrics)
+        self.message_log = MessageLog()
+        self.tracer = CommandTracer(registry=self.metrics)
+        self.profiler = SectionProfiler()
+        self.recorder: TrafficRecorder | None = None
+        self._response_locks: dict[str, asyncio.Lock] = {}
+        self._pending_responses: dict[str, asyncio.Future] = {}
+        self.dispatcher = create_dispatcher(self.metrics, self.topics)
+        self._messages_metric = self.metrics.counter("rehau_mqtt_messages_total", "MQTT messages by direction and type.")
+        self._fanout_metric = self.metrics.histogram(
+            "rehau_callback_fanout", "Callbacks notified per state update.", SIZE_BUCKETS
+        )
+        self._token_refreshes_metric = self.metrics.counter("rehau_token_refreshes_total", "Token refreshes by result.")
+        self._reconnects_metric = self.metrics.counter("rehau_reconnects_total", "Reconnections to the MQTT broker.")
+        self._poll_errors_metric = self.metrics.counter("rehau_poll_errors_total", "Failed user state polls by reason.")
+        self.update_topics()
+
+    @property
+    def installations(self):
+        """Return the parsed installations held by the state store."""
+        return self.store.installations
+
+    @property
+    def installations_revision(self):
+        """Return the revision of the installation state."""
+        return self.store.revision
 
     @staticmethod
     async def check_credentials(email, password):
@@ -112,6 +195,8 @@ class MqttClient:
         """
         _LOGGER.debug("Connected with result code " + str(rc))
         self.authenticated = True
+        # Pushed messages may have been missed while disconnected.
+        self.reconcile_due = True
         self.send_topics()
         self.request_server_referentials()
 
@@ -123,6 +208,8 @@ class MqttClient:
             userdata: The user data.
             msg: The received message.
         """
+        if self.recorder is not None:
+            self.recorder.record(KIND_MQTT, msg.topic, msg.payload)
         await handle_message(msg.topic, msg.payload, self)
 
     def on_disconnect(self, client, userdata, rc):
@@ -142,6 +229,30 @@ class MqttClient:
                 _LOGGER.error("Unexpected disconnection. Stopping...")
                 self.disconnect()
 
+    def get_status(self) -> dict:
+        """Describe the connection and scheduler state of the client.
+
+        Returns:
+            dict: The connection, retry, scheduler, pending command and state store status.
+        """
+        return {
+            "authenticated": self.authenticated,
+            "connected": self.client.is_connected() if self.client else False,
+            "ready": self.is_ready(),
+            "number_of_retries": self.number_of_retries,
+            "number_of_message_failures": self.number_of_message_failures,
+            "referentials_loaded": self.referentials is not None,
+            "token_expires_in": self.token_data.get("expires_in") if self.token_data else None,
+            "installations_revision": self.installations_revision,
+            "pending_commands": self.pending.summary(),
+            "scheduler": {
+                "running": self.scheduler_task is not None and not self.scheduler_task.done(),
+                "jobs": [job.spec for job in self.scheduler_jobs],
+                "last_refresh": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(self.last_refresh))
+                if self.last_refresh is not None else None,
+            },
+        }
+
     def set_install_id(self):
         """Set the installation ID based on the user's default installation."""
         default_install = self.user["defaultInstall"]
@@ -166,21 +277,49 @@ class MqttClient:
             "demand": self.get_install_id(),
         }
         try:
-            user = await read_user_state(payload)
+            with self.timings.measure("read_user_http"):
+                user = await read_user_state(payload)
             if user is not None:
+                if self.recorder is not None:
+                    self.recorder.record(KIND_HTTP, "getDataofInstall", user)
                 await self.set_user(user)
         except MqttClientCommunicationError as e:
+            self._poll_errors_metric.inc(reason="communication")
             _LOGGER.error("Error while refreshing user state: %s", e)
         except MqttClientAuthenticationError:
+            self._poll_errors_metric.inc(reason="authentication")
             _LOGGER.info("Token expired. Refreshing...")
             await self.refresh_token()
 
     async def refresh_http(self):
         """Refresh the user data periodically."""
         _LOGGER.debug("Refreshing user data")
-        self.number_of_retries = 0
-        self.send_topics()
-        await self.read_user_http()
+        self.last_refresh = time.time()
+        with self.profiler.section():
+            self.number_of_retries = 0
+            self.send_topics()
+            await self.read_user_http()
+
+    async def reconcile(self):
+        """Poll the user data over HTTP unless the realtime topic keeps it current.
+
+        While connected, the pushed messages are applied as they arrive and
+        the poll only runs every ``RECONCILE_INTERVAL`` seconds to correct
+        missed ones. Without a connection, once after every reconnect and
+        until a pushed current temperature has been applied, it runs on
+        every call, since not every controller pushes its temperatures.
+        """
+        connected = self.client is not None and self.client.is_connected()
+        if (
+            connected
+            and self.temperature_pushed
+            and not self.reconcile_due
+            and self.last_refresh is not None
+            and time.time() - self.last_refresh < RECONCILE_INTERVAL
+        ):
+            return
+        self.reconcile_due = False
+        await self.refresh_http()
 
     def refresh(self):
         """Refresh the user data periodically."""
@@ -212,30 +351,34 @@ class MqttClient:
         Returns:
             str: The topic with the wildcards replaced.
         """
-        replacements = {
-            "{id}": self.get_install_unique(),
-            "{email}": self.auth_username,
-        }
+        return self.topics.outbound(topic)
 
-        def replace(match):
-            return replacements[match.group(0)]
-
-        return re.sub(r"{id}|{email}", replace, topic, flags=re.I)
+    def update_topics(self):
+        """Recompile the topic router if the installations changed."""
+        uniques = [installation["unique"] for installation in self.installations or ()]
+        if self.topics.update(self.auth_username, uniques, self.get_install_unique()):
+            _LOGGER.debug("Compiled the topics of %d installations", len(uniques))
 
     def send_topics(self):
-        """Subscribe to the configured topics."""
-        for topic in self.subscribe_topics():
-            topic_str = self.replace_wildcards(topic["topic"])
-            _LOGGER.debug(f"Subscribing to topic: {topic_str}")
+        """Subscribe to the topics of the user and of every installation."""
+        topics = self.topics.subscriptions
+        for topic_str in self.subscribed_topics:
+            if topic_str not in topics:
+                _LOGGER.debug("Unsubscribing from topic: %s", topic_str)
+                self.client.unsubscribe(topic_str)
+        for topic_str in topics:
+            _LOGGER.debug("Subscribing to topic: %s", topic_str)
             self.client.unsubscribe(topic_str)
-            self.client.subscribe(topic_str, **topic["options"])
+            self.client.subscribe(topic_str)
+        self.subscribed_topics = list(topics)
 
-    def send_message(self, topic: str, message: dict):
+    def send_message(self, topic: str, message: dict, installation: str | None = None):
         """Send a message to the MQTT broker.
 
         Args:
             topic: The topic to publish the message to.
             message: The message to send.
+            installation: The unique of the installation the topic is for, the default installation if None.
 
         Returns:
             int: The message ID.
@@ -243,17 +386,71 @@ class MqttClient:
         Raises:
             MqttClientCommunicationError: If there is a communication error.
         """
-        json_message = json.dumps(message)
-        topic = self.replace_wildcards(topic)
-        _LOGGER.debug(f"Sending message {topic}: {json_message}")
-        result, mid = self.client.publish(topic, payload=json_message)
-        if result != mqtt.MQTT_ERR_SUCCESS:
+        return self.publish_message(topic, message, installation)[1]
+
+    def publish_message(self, topic: str, message: dict, installation: str | None = None) -> tuple[bool, int]:
+        """Send a message to the MQTT broker and report whether it was handed over.
+
+        Args:
+            topic: The topic to publish the message to.
+            message: The message to send.
+            installation: The unique of the installation the topic is for, the default installation if None.
+
+        Returns:
+            tuple[bool, int]: Whether the client accepted the message, and the message ID.
+        """
+        with self.timings.measure("send_message"):
+            json_message = json.dumps(message)
+            topic = self.topics.outbound(topic, installation)
+            _LOGGER.debug("Sending message %s: %s", topic, json_message)
+            result, mid = self.client.publish(topic, payload=json_message)
+        self.record_message(OUTBOUND, topic, len(json_message), message.get("type"))
+        if result != MQTT_ERR_SUCCESS:
             self.number_of_message_failures += 1
             if self.number_of_message_failures > 5:
                 _LOGGER.error(f"Error sending message {topic}. Failed {self.number_of_message_failures} times. Data: {json_message}")
-        else:
-            self.number_of_message_failures = 0
-        return mid
+            return False, mid
+        self.number_of_message_failures = 0
+        return True, mid
+
+    def record_message(self, direction: str, topic: str, size: int, message_type: str | None):
+        """Record a message in the message log and the message counter.
+
+        Args:
+            direction: ``INBOUND`` or ``OUTBOUND``.
+            topic: The MQTT topic.
+            size: The payload size in bytes.
+            message_type: The ``type`` field of the message, if any.
+        """
+        self.message_log.record(direction, topic, size, message_type)
+        self._messages_metric.inc(direction=direction, type=message_type)
+
+    def start_capture(self, path: str):
+        """Start capturing the inbound MQTT messages and the user state responses.
+
+        The access token, refresh token and account email are redacted.
+
+        Args:
+            path: The gzip compressed capture file, appended to if it exists.
+
+        Raises:
+            MqttClientError: If a capture is already running.
+        """
+        if self.recorder is not None:
+            raise MqttClientError("A capture is already running")
+        secrets = [self.auth_username]
+        if self.token_data:
+            secrets += [self.token_data.get("access_token"), self.token_data.get("refresh_token")]
+        self.recorder = TrafficRecorder(path, secrets)
+
+    def stop_capture(self) -> TrafficRecorder | None:
+        """Stop capturing.
+
+        Returns:
+            TrafficRecorder | None: The recorder to close from an executor, or None if no capture was running.
+        """
+        recorder, self.recorder = self.recorder, None
+        return recorder
 
     def start_mqtt_client(self):
         """Start the MQTT client's event loop."""
@@ -261,14 +458,15 @@ class MqttClient:
 
     async def reconnect(self):
         """Reconnect to the MQTT broker."""
+        self._reconnects_metric.inc()
         await self.init_mqtt_client()
 
     def disconnect(self):
         """Disconnect from the MQTT broker."""
-        for topic in self.subscribe_topics():
-            topic_str = self.replace_wildcards(topic["topic"])
-            _LOGGER.debug(f"Unsubscribing from topic: {topic_str}")
+        for topic_str in self.subscribed_topics:
+            _LOGGER.debug("Unsubscribing from topic: %s", topic_str)
             self.client.unsubscribe(topic_str)
+        self.subscribed_topics = []
         self.client.disconnect()
         self.client.loop_stop()
         self.stop_scheduler()
@@ -287,6 +485,8 @@ class MqttClient:
 
     async def init_mqtt_client(self):
         """Initialize the MQTT client."""
+        import paho.mqtt.client as mqtt
+
         _LOGGER.debug("Initializing MQTT client")
         if self.client:
             self.disconnect()
@@ -307,6 +507,8 @@ class MqttClient:
         """Authenticate the user with the provided credentials."""
         token_data, user = await auth(self.auth_username, self.auth_password)
         self.set_token_data(token_data)
+        if self.recorder is not None:
+            self.recorder.record(KIND_HTTP, "getDataofInstall", user)
         await self.set_user(user)
         await self.init_mqtt_client()
 
@@ -316,9 +518,11 @@ class MqttClient:
         _LOGGER.debug("Refreshing token")
         try:
             token_data = await refresh(self.token_data["refresh_token"])
+            self._token_refreshes_metric.inc(result="success")
             self.set_token_data(token_data)
             await self.reconnect()
         except MqttClientAuthenticationError as e:
+            self._token_refreshes_metric.inc(result="failure")
             _LOGGER.error("Could not refresh token: " + str(e))
             await self.auth_user()
 
@@ -331,13 +535,39 @@ class MqttClient:
         if len(installations) > 0 and "groups" in installations[0] and len(installations[0]["groups"]) > 0:
             await self.update_installations(installations)
             self.set_install_id()
+            self.update_topics()
 
     async def update_installations(self, installations):
-        """Write the installations to a file."""
+        """Parse and validate the installations of an API response and replace the current state.
+
+        This only runs for the user documents returned over HTTP. The pushed
+        updates are checked by their handlers. The validation runs in an
+        executor, the schema is imported there by ``preload_transports``.
 
-        self.installations = parse_installations(installations, self.last_operating_mode)
+        Raises:
+            MqttClientCommunicationError: If the installation data is malformed.
+        """
+        with self.timings.measure("parse_installations"):
+            parsed_installations = parse_installations(installations, self.last_operating_mode)
+        if self.hass is not None:
+            await self.hass.async_add_executor_job(_validate_installations, parsed_installations)
+        else:
+            _validate_installations(parsed_installations)
+        self.store.load(parsed_installations)
+        if self.pending:
+            # A poll sent before a command was confirmed would revert it.
+            self.mark_installations_changed(self.pending.reapply())
+        self.history.record_installations(parsed_installations)
         await self.publish_updates()
 
+    def mark_installations_changed(self, channel_ids=None):
+        """Record that the installation state changed so cached snapshots are rebuilt.
+
+        Args:
+            channel_ids: The identifiers of the changed channels, if known.
+        """
+        self.store.touch(channel_ids)
+
     def set_token_data(self, token_data):
         """Set the authentication token data and start the refresh timer.
 
@@ -345,6 +575,9 @@ class MqttClient:
             token_data: The token data.
         """
         self.token_data = token_data
+        if self.recorder is not None:
+            self.recorder.add_secret(token_data.get("access_token"))
+            self.recorder.add_secret(token_data.get("refresh_token"))
 
     def get_installations(self):
         """Get the list of installations.
@@ -380,12 +613,14 @@ class MqttClient:
         Args:
             user: The user data.
         """
-        self.user = user
-        if "installs" in user:
-            if len(user["installs"]) > 0 and "user" in user["installs"][0] and "heatcool_auto_01" in user["installs"][0]["user"]:
-                self.last_operating_mode = user["installs"][0]["user"]["heatcool_auto_01"]
-                _LOGGER.debug("Setting last operating mode to " + str(self.last_operating_mode))
-            await self.set_installations(user["installs"])
+        with self.timings.measure("set_user"):
+            # Only the identifiers are kept, the installations live in the state store.
+            self.user = compact_user(user)
+            if "installs" in user:
+                if len(user["installs"]) > 0 and "user" in user["installs"][0] and "heatcool_auto_01" in user["installs"][0]["user"]:
+                    self.last_operating_mode = user["installs"][0]["user"]["heatcool_auto_01"]
+                    _LOGGER.debug("Setting last operating mode to " + str(self.last_operating_mode))
+                await self.set_installations(user["installs"])
 
     def get_install_id(self):
         """Get the installation ID.
@@ -434,19 +669,185 @@ class MqttClient:
         """Request the referentials from the server."""
 
         _LOGGER.debug("Requesting referentials from server")
+        self.send_server_request(ServerTopics.USER_REFERENTIAL.value, {})
+
+    def send_server_request(self, topic: str, data: dict, installation: str | None = None):
+        """Send an authenticated request to a server topic.
+
+        Args:
+            topic: The ``ServerTopics`` value.
+            data: The request data.
+            installation: The unique of the installation the topic is for, the default installation if None.
+
+        Returns:
+            int: The message ID.
+        """
         payload = {
             "ID": self.auth_username,
-            "data": {},
+            "data": data,
             "sso": True,
             "token": self.token_data["access_token"],
         }
-        self.send_message(ServerTopics.USER_REFERENTIAL.value, payload)
+        return self.send_message(topic, payload, installation)
+
+    async def request(self, topic: str, data: dict, installation: str, response_type: str):
+        """Send a server request and wait for the response of its type.
+
+        Requests of one response type are serialized because the responses
+        do not identify the request they answer.
+
+        Args:
+            topic: The ``ServerTopics`` value.
+            data: The request data.
+            installation: The unique of the installation the request is for.
+            response_type: The message type of the response.
+
+        Returns:
+            The parsed response handed to ``resolve_response``.
+
+        Raises:
+            MqttClientCommunicationError: If the response is not received in time.
+        """
+        async with self._response_locks.setdefault(response_type, asyncio.Lock()):
+            future = self._pending_responses[response_type] = asyncio.get_running_loop().create_future()
+            try:
+                self.send_server_request(topic, data, installation)
+                return await asyncio.wait_for(future, RESPONSE_TIMEOUT)
+            except asyncio.TimeoutError as e:
+                raise MqttClientCommunicationError(
+                    f"No {response_type} response received for {installation} within {RESPONSE_TIMEOUT} seconds"
+                ) from e
+            finally:
+                del self._pending_responses[response_type]
+
+    def resolve_response(self, response_type: str, result):
+        """Hand a parsed response to the pending ``request`` waiting for it.
+
+        Args:
+            response_type: The message type of the response.
+            result: The parsed response.
+        """
+        future = self._pending_responses.get(response_type)
+        if future is None or future.done():
+            _LOGGER.debug("Ignoring an unrequested %s response", response_type)
+            return
+        future.set_result(result)
+
+    async def read_statistics(self, installation_unique: str, start: float, end: float) -> list[dict]:
+        """Request the statistics of an installation and wait for them.
+
+        Args:
+            installation_unique: The installation unique.
+            start: The UNIX timestamp of the first statistics bucket.
+            end: The UNIX timestamp after the last statistics bucket.
+
+        Returns:
+            list[dict]: The buckets from ``parse_statistics``.
+
+        Raises:
+            MqttClientCommunicationError: If the statistics are not received in time.
+        """
+        _LOGGER.debug("Requesting statistics of %s since %s", installation_unique, start)
+        data = {"unique": installation_unique, "start": int(start * 1000), "end": int(end * 1000)}
+        return await self.request(ServerTopics.USER_ASK_STATISTICS.value, data, installation_unique, "statistic")
+
+    async def fetch_errors(self, installation_unique: str) -> list[str]:
+        """Index the errors logged since the newest one already indexed.
+
+        The log is paged newest first from the timestamp of the newest indexed
+        change. Paging stops at a short page or at a page reaching errors
+        that were already seen, so only the new part of the history is read.
+
+        A resolution does not always change the timestamp of an error, so
+        every ``ERROR_RECHECK_INTERVAL`` seconds the log is read from the
+        oldest active error instead. Active errors the complete read no
+        longer reports as such are marked resolved.
+
+        Args:
+            installation_unique: The installation unique.
+
+        Returns:
+            list[str]: The identifiers of the new errors and of the errors whose active state changed.
+
+        Raises:
+            MqttClientCommunicationError: If a page is not received in time.
+        """
+        index = self.faults.get(installation_unique)
+        now = time.monotonic()
+        rechecked = self.errors_rechecked.get(installation_unique)
+        recheck = bool(index.active) and (rechecked is None or now - rechecked >= ERROR_RECHECK_INTERVAL)
+        since = min(index.errors[error_id][2] for error_id in index.active) if recheck else index.newest
+        changed = []
+        seen = set()
+        complete = False
+        for page in range(ERROR_MAX_PAGES):
+            data = {"unique": installation_unique, "since": int(since * 1000), "page": page, "limit": ERROR_PAGE_SIZE}
+            errors = await self.request(ServerTopics.ERROR_SEARCH.value, data, installation_unique, ERROR_SEARCH_RESPONSE)
+            fresh = [error for error in errors if error["timestamp"] >= since]
+            seen.update(error["id"] for error in fresh if error["active"])
+            changed.extend(index.add(fresh))
+            if len(errors) < ERROR_PAGE_SIZE or len(fresh) < len(errors):
+                complete = True
+                break
+        if recheck:
+            self.errors_rechecked[installation_unique] = now
+            if complete:
+                changed.extend(index.resolve(index.active - seen))
+        _LOGGER.debug("Read %d changed errors of %s", len(changed), installation_unique)
+        return changed
+
+    async def fetch_mixed_circuits(self, installation_unique: str) -> bool:
+        """Read all mixed circuits of an installation with one request.
+
+        The callbacks are only notified when a circuit changed.
+
+        Args:
+            installation_unique: The installation unique.
+
+        Returns:
+            bool: Whether the mixed circuits changed.
+
+        Raises:
+            MqttClientCommunicationError: If the circuits are not received in time.
+        """
+        circuits = await self.request(
+            ServerTopics.MIXED_CIRCUITS_SEARCH.value,
+            {"unique": installation_unique},
+            installation_unique,
+            MIXED_CIRCUITS_RESPONSE,
+        )
+        changed = self.store.set_mixed_circuits(installation_unique, circuits)
+        if changed:
+            await self.publish_updates()
+        return changed
+
+    async def poll_mixed_circuits(self):
+        """Poll the mixed circuits of the installations whose adaptive interval elapsed."""
+        now = time.monotonic()
+        for installation in self.installations or ():
+            unique = installation["unique"]
+            schedule = self.mixed_circuit_schedules.get(unique)
+            if schedule is None:
+                schedule = self.mixed_circuit_schedules[unique] = AdaptiveInterval(
+                    MIXED_CIRCUITS_MIN_INTERVAL, MIXED_CIRCUITS_MAX_INTERVAL
+                )
+            if not schedule.due(now):
+                continue
+            try:
+                changed = await self.fetch_mixed_circuits(unique)
+            except MqttClientError as e:
+                self._poll_errors_metric.inc(reason="mixed_circuits")
+                _LOGGER.warning("Could not read the mixed circuits of %s: %s", unique, e)
+                schedule.failed(time.monotonic())
+            else:
+                schedule.done(time.monotonic(), changed)
 
     async def update_channel(self, payload: dict):
         """Update the channel with the provided payload.
 
         Args:
-            payload: The payload containing the channel ID, installation ID, mode used, and setpoint used.
+            payload: The payload containing the channel ID, installation ID, mode used, setpoint used
+                and, when pushed, the zone temperature.
 
         Raises:
             MqttClientError: If the channel or installation is not found.
@@ -456,34 +857,138 @@ class MqttClient:
         mode_used = payload["mode_used"]
         setpoint_used = payload["setpoint_used"]
 
-        installation = next(
-            (
-                installation
-                for installation in self.installations
-                if installation["unique"] == install_id
-            ),
-            None,
-        )
+        if self.store.get_installation(install_id) is None:
+            raise MqttClientError("No installation found for id " + install_id)
+
+        entry = self.store.get_channel(channel_id)
+        if entry is None or entry[0]["unique"] != install_id:
+            raise MqttClientError("No channel found for id " + channel_id)
+
+        channel = entry[2]
+        channel["energy_level"] = mode_used
+        channel["target_temperature"] = setpoint_used
+        if "temp_zone" in payload:
+            channel["current_temperature"] = payload["temp_zone"]
+            self.temperature_pushed = True
+        self.pending.confirm_channel(channel_id, {"mode_used": mode_used, "setpoint_used": setpoint_used})
+        self.mark_installations_changed([channel_id])
+        self.history.record_zone(install_id, entry[1])
+        confirmed = self.tracer.confirm(install_id, entry[1]["number"], {"mode_used": mode_used, "setpoint_used": setpoint_used})
+        await self.publish_updates()
+        if confirmed:
+            self.tracer.reflected(confirmed)
+
+
+    async def update_zone(self, install_id: str, zone_number: int, values: dict):
+        """Apply pushed values to every channel of a zone.
+
+        Args:
+            install_id: The installation unique.
+            zone_number: The zone number.
+            values: The changed values, keyed like the channel update fields.
+
+        Raises:
+            MqttClientError: If the installation or zone is not found.
+        """
+        installation = self.store.get_installation(install_id)
+        if installation is None:
+            raise MqttClientError("No installation found for id " + install_id)
+        zone = self.store.get_installation_zone(install_id, zone_number)
+        if zone is None:
+            raise MqttClientError("No zone found for zone " + str(zone_number))
+
+        confirmed = self._apply_zone(install_id, zone, values)
+        if "mode_used" in values:
+            installation["global_energy_level"] = get_global_energy_level(installation, "energy_level").value
+        self.mark_installations_changed([channel["id"] for channel in zone["channels"]])
+        await self.publish_updates()
+        if confirmed:
+            self.tracer.reflected(confirmed)
+
+    async def update_energy_level(self, install_id: str, mode_used: int, zones: list[int] | None = None):
+        """Apply a pushed energy level to the zones of an installation.
+
+        Args:
+            install_id: The installation unique.
+            mode_used: The energy level.
+            zones: The numbers of the impacted zones, all zones if None.
+
+        Raises:
+            MqttClientError: If the installation is not found.
+        """
+        installation = self.store.get_installation(install_id)
         if installation is None:
             raise MqttClientError("No installation found for id " + install_id)
 
+        channel_ids = []
+        confirmed = []
         for group in installation["groups"]:
             for zone in group["zones"]:
-                for channel in zone["channels"]:
-                    if channel["id"] == channel_id:
-                        channel["energy_level"] = mode_used
-                        channel["target_temperature"] = setpoint_used
-                        await self.publish_updates()
-                        return
+                if zones is not None and zone["number"] not in zones:
+                    continue
+                confirmed.extend(self._apply_zone(install_id, zone, {"mode_used": mode_used}))
+                channel_ids.extend(channel["id"] for channel in zone["channels"])
+        installation["global_energy_level"] = get_global_energy_level(installation, "energy_level").value
+        self.mark_installations_changed(channel_ids)
+        await self.publish_updates()
+        if confirmed:
+            self.tracer.reflected(confirmed)
+
+    async def update_installation_state(self, install_id: str, values: dict):
+        """Apply pushed installation values, such as the operating mode or the connection state.
+
+        The operating mode is also written to every channel of the installation.
+
+        Args:
+            install_id: The installation unique.
+            values: The changed installation keys and their values.
+
+        Raises:
+            MqttClientError: If the installation is not found.
+        """
+        installation = self.store.get_installation(install_id)
+        if installation is None:
+            raise MqttClientError("No installation found for id " + install_id)
 
+        installation.update(values)
+        channel_ids = []
+        if "operating_mode" in values:
+            for group in installation["groups"]:
+                for zone in group["zones"]:
+                    for channel in zone["channels"]:
+                        channel["operating_mode"] = values["operating_mode"]
+                        channel_ids.append(channel["id"])
+        self.pending.confirm_installation(install_id, values)
+        self.mark_installations_changed(channel_ids)
+        await self.publish_updates()
 
-        raise MqttClientError("No channel found for id " + channel_id)
+    def _apply_zone(self, install_id: str, zone: dict, values: dict) -> list:
+        """Write channel update values to every channel of a zone.
 
+        Returns:
+            list: The traced commands the values confirm, to be reflected once published.
+        """
+        for channel in zone["channels"]:
+            for field, value in values.items():
+                channel[CHANNEL_UPDATE_FIELDS[field]] = value
+            self.pending.confirm_channel(channel["id"], values)
+        if "temp_zone" in values:
+            self.temperature_pushed = True
+        self.history.record_zone(install_id, zone)
+        return self.tracer.confirm(install_id, zone["number"], values)
+
+    def _rolled_back(self, channel_ids: list[str]):
+        """Publish the values restored for commands that were not confirmed in time."""
+        _LOGGER.warning("Command for channels %s was not confirmed, restoring the reported state", channel_ids)
+        self.mark_installations_changed(channel_ids)
+        self.hass.async_create_task(self.publish_updates())
 
     async def publish_updates(self) -> None:
         """Publish updates to all registered callbacks."""
-        for callback in self.callbacks:
-            callback()
+        self._fanout_metric.observe(len(self.callbacks))
+        with self.timings.measure("publish_updates"), self.profiler.section():
+            for callback in self.callbacks:
+                callback()
 
 
     def register_callback(self, callback: Callable[[], None]) -> None:
@@ -502,17 +1007,16 @@ class MqttClient:
         """
         self.callbacks.discard(callback)
 
-    def run_scheduler(self):
-        """Run the scheduler in a separate thread."""
-        while not self.stop_scheduler_loop:
-            schedule.run_pending()
-            time.sleep(1)
-
     async def start_scheduler_task(self):
         """Start the scheduler in a separate thread."""
+        import aiocron
+
         _LOGGER.debug("Starting scheduler thread")
-        aiocron.crontab("*/1 * * * *", func=self.refresh_http, start=True)
-        aiocron.crontab("*/5 * * * *", func=self.request_server_referentials, start=True)
+        self.scheduler_jobs = [
+            aiocron.crontab("*/1 * * * *", func=self.reconcile, start=True),
+            aiocron.crontab("*/5 * * * *", func=self.request_server_referentials, start=True),
+            aiocron.crontab("*/1 * * * *", func=self.poll_mixed_circuits, start=True),
+        ]
         if "access_token" in self.token_data:
             _LOGGER.debug("Scheduling token refresh")
             expires_in = self.token_data["expires_in"] - 300
@@ -526,12 +1030,17 @@ class MqttClient:
 
     def start_scheduler(self):
         """Start the scheduler to run periodic tasks."""
+        # A reconnect stops the previous scheduler first.
+        self.stop_scheduler_loop = False
         self.scheduler_task = asyncio.create_task(self.start_scheduler_task(), name="Rehau NEA Smart 2 Scheduler")
 
     def stop_scheduler(self):
         """Stop the scheduler."""
         _LOGGER.debug("Stopping scheduler")
         self.stop_scheduler_loop = True
+        for job in self.scheduler_jobs:
+            job.stop()
+        self.scheduler_jobs = []
         if self.scheduler_task:
             self.scheduler_task.cancel()
             self.scheduler_task = None
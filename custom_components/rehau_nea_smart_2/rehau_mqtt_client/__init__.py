@@ -11,7 +11,15 @@ from .models import (
     Group,
     Installation,
 )
-from .utils import EnergyLevels, OperationModes
+from .utils import (
+    EnergyLevels,
+    OperationModes,
+    preload_transports,
+    raw_to_celsius,
+    raw_to_celsius_half,
+    celsius_to_raw,
+)
+from .instrumentation import render_prometheus
 from .exceptions import (
     MqttClientError,
     MqttClientAuthenticationError,
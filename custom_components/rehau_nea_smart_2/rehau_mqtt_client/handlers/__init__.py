@@ -1,8 +1,16 @@
 """The Rehau Nea Smart 2 MQTT handlers."""
 
 from .auth import auth, refresh
-from .installation import parse_installations, update_temperature, update_energy_level, update_operating_mode
-from .message import handle_message
+from .installation import (
+    USER_DOCUMENT_FIELDS,
+    parse_installations,
+)
+from .dispatcher import MessageDispatcher
+from .errors import parse_errors
+from .message import create_dispatcher, handle_message
+from .mixed_circuits import parse_mixed_circuits
+from .router import TopicRouter
+from .statistics import parse_statistics
 from .user import read_user_state
 
 def __init__():
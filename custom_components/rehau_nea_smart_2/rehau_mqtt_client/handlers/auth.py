@@ -1,15 +1,14 @@
 """Auth handler for Rehau NEA Smart 2."""
 import logging
 import secrets
-import httpx
 from urllib.parse import urlparse, parse_qs
 
 from ..exceptions import (
     MqttClientAuthenticationError,
     MqttClientCommunicationError,
 )
-from ..utils import generate_auth_url
-from homeassistant.core import HomeAssistant
+from ..utils import generate_auth_url, loads_selected
+from .installation import USER_DOCUMENT_FIELDS
 
 _LOGGER = logging.getLogger(__name__)
 CLIENT_ID = "3f5d915d-a06f-42b9-89cc-2e5d63aa96f1"
@@ -21,6 +20,8 @@ AUTH_URL_ORIGIN = "https://accounts.rehau.com"
 
 async def auth(email, password, check_credentials=False):
     """Authenticate with Rehau NEA Smart 2."""
+    import httpx
+
     challenge = secrets.token_urlsafe(16)
     url = await generate_auth_url(
         CLIENT_ID,
@@ -95,12 +96,13 @@ async def auth(email, password, check_credentials=False):
         if user_response.status_code != 200:
             raise MqttClientAuthenticationError("Could not get user data")
 
-        user = user_response.json()
+        user = loads_selected(user_response.content, USER_DOCUMENT_FIELDS)
 
         return token_data, user["data"]["user"]
 
 async def refresh(refresh_token):
     """Handle the refresh of the authentication token."""
+    import httpx
 
     async with httpx.AsyncClient() as client:
         token_response = await client.post(AUTH_URL_ORIGIN + "/token-srv/token", timeout=30, data={
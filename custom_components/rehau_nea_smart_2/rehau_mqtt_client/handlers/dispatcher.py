@@ -0,0 +1,178 @@
+"""Registry-based dispatch of the inbound MQTT messages."""
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+import json
+import logging
+import re
+from typing import TYPE_CHECKING
+
+from ..exceptions import MqttClientError
+from ..instrumentation import INBOUND
+
+if TYPE_CHECKING:
+    from ..MqttClient import MqttClient
+    from ..instrumentation import MetricsRegistry
+    from .router import TopicRouter
+
+_LOGGER = logging.getLogger(__name__)
+
+Handler = Callable[[dict, "MqttClient"], Awaitable[None]]
+
+RESULT_HANDLED = "handled"
+RESULT_UNHANDLED = "unhandled"
+RESULT_INVALID = "invalid"
+RESULT_FAILED = "failed"
+
+UNKNOWN_TYPE = "unknown"
+
+# Every "type" member of a payload. A nested one may come first, so all of
+# them are collected and the top-level type is only trusted after decoding.
+_TYPE_PATTERN = re.compile(r'"type"\s*:\s*"([^"\\]*)"')
+_TYPE_PATTERN_BYTES = re.compile(rb'"type"\s*:\s*"([^"\\]*)"')
+
+
+class Route:
+    """A handler and the fields its messages must contain."""
+
+    __slots__ = ("handler", "required")
+
+    def __init__(self, handler: Handler, required: tuple[tuple[str, ...], ...]):
+        """Initialize the route.
+
+        Args:
+            handler (Handler): The coroutine handling the decoded message.
+            required (tuple[tuple[str, ...], ...]): The paths of the required fields.
+        """
+        self.handler = handler
+        self.required = required
+
+    def missing_field(self, message: dict) -> str | None:
+        """Return the first required field missing from the message, if any."""
+        for path in self.required:
+            value = message
+            for key in path:
+                if not isinstance(value, dict) or key not in value:
+                    return ".".join(path)
+                value = value[key]
+        return None
+
+
+class MessageDispatcher:
+    """Route inbound messages to handlers registered by topic and type.
+
+    Handlers are registered for a topic template, an exact topic or every
+    topic (``None``) and a message type. With a router, inbound topics are
+    resolved to their ``ClientTopics`` template so one registration covers
+    the topics of every installation. Before decoding, the ``type`` members of the payload
+    are peeked with a regular expression; if none of them has a handler for
+    the topic the payload is dropped undecoded. Otherwise it is decoded once,
+    its required fields are checked and the handler runs. Handler errors are
+    logged and counted instead of escaping into the message task.
+    """
+
+    def __init__(self, registry: MetricsRegistry | None = None, router: TopicRouter | None = None):
+        """Initialize an empty dispatcher.
+
+        Args:
+            registry (MetricsRegistry | None): Count the messages per type and result in it.
+            router (TopicRouter | None): Resolve the inbound topics to their templates with it.
+        """
+        self.router = router
+        self._routes: dict[tuple[str | None, str], Route] = {}
+        self.counts: dict[tuple[str, str], int] = {}
+        self._metric = None
+        if registry is not None:
+            self._metric = registry.counter(
+                "rehau_messages_dispatched_total", "Inbound messages by type and dispatch result."
+            )
+
+    def register(self, message_type: str, handler: Handler, topic: str | None = None, required=()):
+        """Register the handler of a message type.
+
+        Args:
+            message_type (str): The ``type`` of the messages.
+            handler (Handler): The coroutine called with the decoded message and the client.
+            topic (str | None): The topic template or exact topic, or None for every topic
+                without a more specific route.
+            required: The paths of the fields the handler reads, such as ``("data", "channel")``.
+        """
+        self._routes[(topic, message_type)] = Route(handler, tuple(tuple(path) for path in required))
+
+    def route(self, topic: str, message_type) -> Route | None:
+        """Return the route of a message type on a topic, if any."""
+        if not isinstance(message_type, str):
+            return None
+        return self._routes.get((topic, message_type)) or self._routes.get((None, message_type))
+
+    def summary(self) -> dict[str, dict[str, int]]:
+        """Return the message counts by type and result."""
+        summary: dict[str, dict[str, int]] = {}
+        for (message_type, result), count in self.counts.items():
+            summary.setdefault(message_type, {})[result] = count
+        return summary
+
+    async def dispatch(self, topic: str, payload: str | bytes, client: MqttClient):
+        """Decode and handle one inbound message.
+
+        Args:
+            topic (str): The MQTT topic.
+            payload (str | bytes): The raw payload.
+            client (MqttClient): The client the handlers act on.
+        """
+        resolved = self.router.resolve(topic) if self.router is not None else None
+        key = resolved.template if resolved is not None else topic
+        pattern = _TYPE_PATTERN_BYTES if isinstance(payload, bytes | bytearray) else _TYPE_PATTERN
+        # Scanning stops at the first routed type, usually the top-level one.
+        if not any(self.route(key, _as_str(match.group(1))) for match in pattern.finditer(payload)):
+            first = pattern.search(payload)
+            message_type = _as_str(first.group(1)) if first else UNKNOWN_TYPE
+            client.record_message(INBOUND, topic, len(payload), message_type)
+            _LOGGER.debug("Unhandled message %s on %s", message_type, topic)
+            self._count(message_type, RESULT_UNHANDLED)
+            return
+
+        try:
+            with client.timings.measure("json"):
+                message = json.loads(payload)
+        except ValueError as e:
+            client.record_message(INBOUND, topic, len(payload), None)
+            _LOGGER.warning("Malformed message on %s: %s", topic, e)
+            self._count(UNKNOWN_TYPE, RESULT_INVALID)
+            return
+
+        message_type = message.get("type") if isinstance(message, dict) else None
+        client.record_message(INBOUND, topic, len(payload), message_type)
+        route = self.route(key, message_type)
+        if route is None:
+            _LOGGER.debug("Unhandled message %s on %s", message_type, topic)
+            self._count(message_type if isinstance(message_type, str) else UNKNOWN_TYPE, RESULT_UNHANDLED)
+            return
+
+        missing = route.missing_field(message)
+        if missing is not None:
+            _LOGGER.warning("Dropping %s message without %s", message_type, missing)
+            self._count(message_type, RESULT_INVALID)
+            return
+
+        _LOGGER.debug("Handling %s message", message_type)
+        try:
+            await route.handler(message, client)
+        except MqttClientError as e:
+            _LOGGER.warning("Could not handle %s message: %s", message_type, e)
+            self._count(message_type, RESULT_FAILED)
+        except Exception:
+            _LOGGER.exception("Error while handling %s message", message_type)
+            self._count(message_type, RESULT_FAILED)
+        else:
+            self._count(message_type, RESULT_HANDLED)
+
+    def _count(self, message_type: str, result: str):
+        key = (message_type, result)
+        self.counts[key] = self.counts.get(key, 0) + 1
+        if self._metric is not None:
+            self._metric.inc(type=message_type, result=result)
+
+
+def _as_str(value: str | bytes) -> str:
+    return value.decode("utf-8", errors="replace") if isinstance(value, bytes) else value
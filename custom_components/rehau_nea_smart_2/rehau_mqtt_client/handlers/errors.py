@@ -0,0 +1,68 @@
+"""Parsing of the error log pages the server returns for an installation."""
+from __future__ import annotations
+
+import logging
+
+from ..store.retention import intern_string
+from ..utils import decompress_utf16
+from .statistics import parse_timestamp
+
+_LOGGER = logging.getLogger(__name__)
+
+ERROR_SEARCH_RESPONSE = "error_search"
+
+
+def parse_errors(data) -> list[dict]:
+    """Parse a page of the error log.
+
+    The data is the ``data`` member of an ``error_search`` message: the
+    entries themselves, an object holding them under ``errors``, or either
+    of them LZString compressed. Entries without an identifier, a code or a
+    timestamp are skipped.
+
+    Args:
+        data: The error log page.
+
+    Returns:
+        list[dict]: The errors, newest first, with the identifier, code, zone
+            number (None for errors of the controller), the UNIX timestamp of
+            the last change and whether the error is still active.
+    """
+    if isinstance(data, str):
+        data = decompress_utf16(data)
+    if isinstance(data, dict):
+        data = data.get("errors", [])
+    if not isinstance(data, list):
+        return []
+
+    errors = []
+    skipped = 0
+    for entry in data:
+        if not isinstance(entry, dict):
+            skipped += 1
+            continue
+        error_id = entry.get("_id", entry.get("id"))
+        code = entry.get("code")
+        timestamp = parse_timestamp(entry.get("timestamp", entry.get("date")))
+        if error_id is None or code is None or timestamp is None:
+            skipped += 1
+            continue
+        zone = entry.get("zone")
+        errors.append({
+            "id": str(error_id),
+            "code": intern_string(str(code)),
+            "zone": zone if isinstance(zone, int) and not isinstance(zone, bool) else None,
+            "timestamp": timestamp,
+            "active": bool(entry.get("active", not entry.get("resolved", False))),
+        })
+    if skipped:
+        _LOGGER.debug("Skipped %d malformed error log entries", skipped)
+    errors.sort(key=lambda error: error["timestamp"], reverse=True)
+    return errors
+
+
+async def handle_error_search(message, client):
+    """Handle a page of the error log requested by ``MqttClient.fetch_errors``."""
+    with client.timings.measure("decode"):
+        errors = parse_errors(message["data"])
+    client.resolve_response(ERROR_SEARCH_RESPONSE, errors)
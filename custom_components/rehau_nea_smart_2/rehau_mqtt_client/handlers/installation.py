@@ -1,7 +1,53 @@
 """Handlers for installation data."""
-from ..models import Installation
-from ..utils import parse_operating_mode, get_global_energy_level, save_as_json
+from __future__ import annotations
+
 import datetime
+from typing import TYPE_CHECKING
+
+from ..store.retention import intern_string
+from ..utils import parse_operating_mode, get_global_energy_level, save_as_json
+
+if TYPE_CHECKING:
+    from ..models import Installation
+
+# Object keys of the user document read by the client. The documents returned
+# by the API are decoded keeping only these keys (see read_user_state).
+USER_DOCUMENT_FIELDS = frozenset({
+    # Response envelope and user
+    "data",
+    "user",
+    "defaultInstall",
+    "transactionId",
+    "installs",
+    # Installation
+    "_id",
+    "unique",
+    "hash",
+    "lastConnection",
+    "connectionState",
+    "heatcool_auto_01",
+    "heating",
+    "cooling",
+    "manual",
+    "groups",
+    # Group and zone
+    "name",
+    "zones",
+    "number",
+    "channels",
+    # Channel
+    "setpoint_used",
+    "temp_zone",
+    "mode_permanent",
+    "setpoint_c_normal",
+    "setpoint_c_reduced",
+    "setpoint_h_normal",
+    "setpoint_h_reduced",
+    "setpoint_h_standby",
+    "setpoint_min",
+    "setpoint_max",
+})
+
 
 def is_installation_connected(installation) -> bool:
     """Check if installation is connected."""
@@ -16,30 +62,34 @@ def is_installation_connected(installation) -> bool:
     return False
 
 def parse_installations(installations, last_operation_mode) -> list[Installation]:
-    """Parse installations data."""
+    """Parse installations data.
+
+    Identifiers and names are interned: every poll decodes them again, and
+    the parsed state and its snapshots then share one object per string.
+    """
 
     installations_data = [
         {
-            "id": installation["_id"],
+            "id": intern_string(installation["_id"]),
             "connected": is_installation_connected(installation),
-            "unique": installation["unique"],
-            "hash": installation["hash"] if "hash" in installation else None,
+            "unique": intern_string(installation["unique"]),
+            "hash": intern_string(installation["hash"]) if "hash" in installation else None,
             "global_energy_level": get_global_energy_level(installation).value,
             "operating_mode": parse_operating_mode(
                 installation["user"]["heatcool_auto_01"] if "user" in installation else last_operation_mode
             ),
             "groups": [
                 {
-                    "id": group["_id"],
-                    "group_name": group["name"],
+                    "id": intern_string(group["_id"]),
+                    "group_name": intern_string(group["name"]),
                     "zones": [
                         {
-                            "id": zone["_id"],
-                            "name": zone["name"],
+                            "id": intern_string(zone["_id"]),
+                            "name": intern_string(zone["name"]),
                             "number": zone["number"],
                             "channels": [
                                 {
-                                    "id": channel["_id"],
+                                    "id": intern_string(channel["_id"]),
                                     "target_temperature": channel["setpoint_used"],
                                     "current_temperature": channel["temp_zone"],
                                     "energy_level": channel["mode_permanent"],
@@ -74,37 +124,3 @@ def parse_installations(installations, last_operation_mode) -> list[Installation
 
     return installations_data
 
-
-def update_temperature(installations: list[Installation], zone_number: str, temperature: float) -> list[Installation]:
-    """Update temperature."""
-    for installation in installations:
-        for group in installation["groups"]:
-            for zone in group["zones"]:
-                if zone["number"] == zone_number:
-                    for channel in zone["channels"]:
-                        channel["target_temperature"] = temperature
-
-    return installations
-
-def update_energy_level(installations: list[Installation], zone_number: str, energy_level: int) -> list[Installation]:
-    """Update energy level."""
-    for installation in installations:
-        for group in installation["groups"]:
-            for zone in group["zones"]:
-                if zone["number"] == zone_number:
-                    for channel in zone["channels"]:
-                        channel["energy_level"] = energy_level
-
-    return installations
-
-def update_operating_mode(installations: list[Installation], unique: str, operating_mode: str) -> list[Installation]:
-    """Update operating mode."""
-    for installation in installations:
-        if installation["unique"] == unique:
-            installation["operating_mode"] = operating_mode
-        for group in installation["groups"]:
-            for zone in group["zones"]:
-                for channel in zone["channels"]:
-                    channel["operating_mode"] = operating_mode
-
-    return installations
@@ -1,73 +1,114 @@
 """Handlers for MQTT messages."""
-import json
+from __future__ import annotations
+
 import logging
+from typing import TYPE_CHECKING
 
+from ..store import compact_referentials
 from ..utils import decompress_utf16
+from .dispatcher import MessageDispatcher
+from .errors import ERROR_SEARCH_RESPONSE, handle_error_search
+from .mixed_circuits import MIXED_CIRCUITS_RESPONSE, handle_mixed_circuits
+from .realtime import (
+    CONNECTION_UPDATE,
+    ENERGY_LEVEL_UPDATE,
+    OPERATING_MODE_UPDATE,
+    ZONE_UPDATE,
+    handle_connection_update,
+    handle_energy_level_update,
+    handle_operating_mode_update,
+    handle_zone_update,
+    is_numeric,
+)
+from .statistics import handle_statistics
+
+if TYPE_CHECKING:
+    from ..instrumentation import MetricsRegistry
+    from .router import TopicRouter
 
 _LOGGER = logging.getLogger(__name__)
 
 
-async def handle_message(topic: str, payload: str, client):
+def create_dispatcher(registry: MetricsRegistry | None = None, router: TopicRouter | None = None) -> MessageDispatcher:
+    """Create a dispatcher with the handlers of the messages the client consumes.
+
+    Args:
+        registry (MetricsRegistry | None): Count the dispatched messages in it.
+        router (TopicRouter | None): Resolve the inbound topics with it.
+
+    Returns:
+        MessageDispatcher: The dispatcher.
+    """
+    dispatcher = MessageDispatcher(registry, router)
+    dispatcher.register(
+        "channel_update",
+        handle_channel_update,
+        required=(
+            ("data", "channel"),
+            ("data", "unique"),
+            ("data", "data", "mode_used"),
+            ("data", "data", "setpoint_used"),
+        ),
+    )
+    dispatcher.register(
+        ZONE_UPDATE,
+        handle_zone_update,
+        required=(("data", "unique"), ("data", "zone"), ("data", "data")),
+    )
+    dispatcher.register(
+        ENERGY_LEVEL_UPDATE,
+        handle_energy_level_update,
+        required=(("data", "unique"), ("data", "data", "mode_used")),
+    )
+    dispatcher.register(
+        OPERATING_MODE_UPDATE,
+        handle_operating_mode_update,
+        required=(("data", "unique"), ("data", "data", "heatcool_auto_01")),
+    )
+    dispatcher.register(
+        CONNECTION_UPDATE,
+        handle_connection_update,
+        required=(("data", "unique"), ("data", "data", "connectionState")),
+    )
+    dispatcher.register("referential", handle_referential, required=(("data",),))
+    dispatcher.register("statistic", handle_statistics, required=(("data",),))
+    dispatcher.register(ERROR_SEARCH_RESPONSE, handle_error_search, required=(("data",),))
+    dispatcher.register(MIXED_CIRCUITS_RESPONSE, handle_mixed_circuits, required=(("data",),))
+    return dispatcher
+
+
+async def handle_message(topic: str, payload: str | bytes, client):
     """Handle MQTT message."""
-    _LOGGER.debug("Handling message: " + topic)
-    if topic == "$client/app":
-        await handle_app_message(payload, client)
-    else:
-        await handle_user_message(payload, client)
-
-
-async def handle_app_message(payload: str, client):
-    """Handle app message."""
-    message = json.loads(payload)
-    _LOGGER.debug("Handling app message: " + message["type"])
-    if message["type"] == "auth_user":
-        await handle_user_auth(message, client)
-    else:
-        _LOGGER.debug("Unhandled app message: " + message["type"])
-
-
-async def handle_user_message(payload: str, client):
-    """Handle user message."""
-    message = json.loads(payload)
-    _LOGGER.debug("Handling user message: " + message["type"])
-    if message["type"] == "read_user":
-        await handle_user_read(message, client)
-    elif message["type"] == "channel_update":
-        await handle_channel_update(message, client)
-    elif message["type"] == "referential":
-        await handle_referential(message, client)
-    else:
-        _LOGGER.debug("Unhandled user message: " + message["type"])
-
-
-async def handle_user_read(message: dict, client):
-    """Handle user read."""
-    raise NotImplementedError("handle_user_read is deprecated")
-
-
-async def handle_user_auth(message: dict, client):
-    """Handle user auth."""
-    raise NotImplementedError("handle_user_auth is deprecated")
+    _LOGGER.debug("Handling message: %s", topic)
+    with client.timings.measure("handle_message"), client.profiler.section():
+        await client.dispatcher.dispatch(topic, payload, client)
 
 
 async def handle_channel_update(message, client):
-    """Handle channel update."""
+    """Handle channel update.
+
+    The current temperature is applied when the update carries a numeric ``temp_zone``.
+    """
     channel_id = message["data"]["channel"]
     unique = message["data"]["unique"]
     data = message["data"]["data"]
     mode_used = data["mode_used"]
     setpoint_used = data["setpoint_used"]
-    _LOGGER.debug(f"Channel {channel_id} updated to {mode_used} {setpoint_used}")
-    await client.update_channel({
+    _LOGGER.debug("Channel %s updated to %s %s", channel_id, mode_used, setpoint_used)
+    payload = {
         "channel_id": channel_id,
         "install_id": unique,
         "mode_used": mode_used,
         "setpoint_used": setpoint_used
-    })
+    }
+    if is_numeric(data.get("temp_zone")):
+        payload["temp_zone"] = data["temp_zone"]
+    await client.update_channel(payload)
 
 
 async def handle_referential(message, client):
     """Handle referential."""
-    referentials = decompress_utf16(message["data"])
-    client.referentials = referentials
+    with client.timings.measure("decode"):
+        referentials = decompress_utf16(message["data"])
+    client.referentials = compact_referentials(referentials)
     _LOGGER.debug("Referentials updated")
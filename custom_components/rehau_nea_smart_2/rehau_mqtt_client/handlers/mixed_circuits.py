@@ -0,0 +1,58 @@
+"""Parsing of the mixed circuits the server returns for an installation."""
+from __future__ import annotations
+
+import logging
+
+from ..store.retention import intern_string
+from ..utils import decompress_utf16, raw_to_celsius
+
+_LOGGER = logging.getLogger(__name__)
+
+MIXED_CIRCUITS_RESPONSE = "mixedcircuit_search"
+
+# The raw temperature fields of a mixed circuit and the keys they are parsed to.
+TEMPERATURE_FIELDS = {"temp_flow": "flow_temperature", "temp_return": "return_temperature"}
+VALVE_FIELD = "valve_opening"
+
+
+def parse_mixed_circuits(data) -> list[dict]:
+    """Parse the mixed circuits of an installation.
+
+    The data is the ``data`` member of a ``mixedcircuit_search`` message:
+    the circuits themselves, an object holding them under ``mixedcircuits``,
+    or either of them LZString compressed. Circuits without a number are
+    skipped.
+
+    Args:
+        data: The mixed circuits data.
+
+    Returns:
+        list[dict]: The circuits with their number, name, flow and return
+            temperatures in Celsius and valve opening in percent. Missing
+            values are None.
+    """
+    if isinstance(data, str):
+        data = decompress_utf16(data)
+    if isinstance(data, dict):
+        data = data.get("mixedcircuits", [])
+    if not isinstance(data, list):
+        return []
+
+    circuits = []
+    for entry in data:
+        if not isinstance(entry, dict) or not isinstance(entry.get("number"), int):
+            _LOGGER.debug("Skipping malformed mixed circuit %s", entry)
+            continue
+        circuit = {"number": entry["number"], "name": intern_string(entry.get("name"))}
+        for field, key in TEMPERATURE_FIELDS.items():
+            raw = entry.get(field)
+            circuit[key] = raw_to_celsius(raw) if isinstance(raw, int | float) and not isinstance(raw, bool) else None
+        valve = entry.get(VALVE_FIELD)
+        circuit[VALVE_FIELD] = valve if isinstance(valve, int | float) and not isinstance(valve, bool) else None
+        circuits.append(circuit)
+    return circuits
+
+
+async def handle_mixed_circuits(message, client):
+    """Handle the mixed circuits requested by ``MqttClient.fetch_mixed_circuits``."""
+    client.resolve_response(MIXED_CIRCUITS_RESPONSE, parse_mixed_circuits(message["data"]))
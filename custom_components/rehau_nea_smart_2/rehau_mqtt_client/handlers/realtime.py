@@ -0,0 +1,68 @@
+"""Handlers for the state changes the server pushes on the realtime topic.
+
+Besides ``channel_update``, the server pushes zone, energy level,
+operating mode and connection changes. They are applied to the state
+store as they arrive, so the HTTP poll only has to reconcile.
+"""
+from __future__ import annotations
+
+import logging
+
+from ..utils import parse_operating_mode
+
+_LOGGER = logging.getLogger(__name__)
+
+ZONE_UPDATE = "zone_update"
+ENERGY_LEVEL_UPDATE = "energy_level_update"
+OPERATING_MODE_UPDATE = "operating_mode_update"
+CONNECTION_UPDATE = "connection_update"
+
+# The zone fields applied to its channels, named like the channel update fields.
+ZONE_FIELDS = ("setpoint_used", "temp_zone", "mode_used")
+
+
+def is_numeric(value) -> bool:
+    """Check that a pushed value is a number, booleans excluded."""
+    return isinstance(value, int | float) and not isinstance(value, bool)
+
+
+async def handle_zone_update(message, client):
+    """Handle a pushed change of the values of a zone.
+
+    ``mode_permanent`` is accepted as an alias of ``mode_used``, values that
+    are missing or not numeric are ignored.
+    """
+    data = message["data"]
+    values = dict(data["data"])
+    if "mode_used" not in values and "mode_permanent" in values:
+        values["mode_used"] = values["mode_permanent"]
+    values = {field: values[field] for field in ZONE_FIELDS if is_numeric(values.get(field))}
+    if not values:
+        _LOGGER.debug("Zone update for zone %s without values", data["zone"])
+        return
+    await client.update_zone(data["unique"], data["zone"], values)
+
+
+async def handle_energy_level_update(message, client):
+    """Handle a pushed energy level of the impacted zones, all zones if none are listed."""
+    data = message["data"]
+    mode_used = data["data"]["mode_used"]
+    if not is_numeric(mode_used):
+        _LOGGER.debug("Energy level update with invalid mode %s", mode_used)
+        return
+    zones = data["data"].get("zone_impacted")
+    await client.update_energy_level(data["unique"], mode_used, zones if isinstance(zones, list) else None)
+
+
+async def handle_operating_mode_update(message, client):
+    """Handle a pushed heating and cooling mode of an installation."""
+    data = message["data"]
+    heat_cool_auto = data["data"]["heatcool_auto_01"]
+    client.last_operating_mode = heat_cool_auto
+    await client.update_installation_state(data["unique"], {"operating_mode": parse_operating_mode(heat_cool_auto)})
+
+
+async def handle_connection_update(message, client):
+    """Handle a pushed connection state of an installation."""
+    data = message["data"]
+    await client.update_installation_state(data["unique"], {"connected": bool(data["data"]["connectionState"])})
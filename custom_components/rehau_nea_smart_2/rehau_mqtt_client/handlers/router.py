@@ -0,0 +1,114 @@
+"""Compiled routing of the MQTT topics of the installations."""
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+from ..utils import ClientTopics, ServerTopics
+
+# The templates every installation gets an outbound topic for.
+OUTBOUND_TEMPLATES = tuple(topic.value for topic in (*ServerTopics, *ClientTopics))
+
+# The templates the client subscribes to, the ones with ``{id}`` once per installation.
+SUBSCRIBED_TEMPLATES = (ClientTopics.LISTEN.value, ClientTopics.LISTEN_TO_CONTROLLER.value)
+
+
+class TopicRoute:
+    """The template and installation a concrete topic was expanded from."""
+
+    __slots__ = ("template", "installation")
+
+    def __init__(self, template: str, installation: str | None):
+        """Initialize the route.
+
+        Args:
+            template (str): The ``ClientTopics`` value the topic was expanded from.
+            installation (str | None): The installation unique, None for the user topics.
+        """
+        self.template = template
+        self.installation = installation
+
+
+def expand_topic(template: str, email: str | None, installation: str | None) -> str:
+    """Replace the ``{email}`` and ``{id}`` wildcards of a topic template."""
+    return template.replace("{email}", str(email)).replace("{id}", str(installation))
+
+
+class TopicRouter:
+    """Resolve the topics of every installation with dictionary lookups.
+
+    The router is compiled from ``ClientTopics`` and ``ServerTopics`` for the
+    account email and the installation uniques. Inbound topics resolve to the
+    template and installation they belong to, so the dispatcher can pick the
+    handler without parsing the topic. Outbound topics are expanded once per
+    installation; ``update`` only recompiles when the email or the set of
+    installations changes, not on every poll.
+    """
+
+    def __init__(self):
+        """Initialize a router without installations."""
+        self.email: str | None = None
+        self.installations: tuple[str, ...] = ()
+        self.default: str | None = None
+        self.subscriptions: list[str] = []
+        self._inbound: dict[str, TopicRoute] = {}
+        self._outbound: dict[str | None, dict[str, str]] = {}
+
+    def update(self, email: str | None, installations: Iterable[str], default: str | None = None) -> bool:
+        """Compile the topics of the account, unless they are already compiled.
+
+        Args:
+            email (str | None): The account email.
+            installations (Iterable[str]): The uniques of the installations.
+            default (str | None): The installation outbound topics expand to when none is given.
+
+        Returns:
+            bool: Whether the topics were recompiled.
+        """
+        installations = tuple(installations)
+        self.default = default
+        if email == self.email and installations == self.installations and self._outbound:
+            return False
+
+        self.email = email
+        self.installations = installations
+        self._inbound = {}
+        self._outbound = {}
+        self.subscriptions = []
+        for template in SUBSCRIBED_TEMPLATES:
+            for installation in installations if "{id}" in template else (None,):
+                topic = expand_topic(template, email, installation)
+                self._inbound[topic] = TopicRoute(template, installation)
+                self.subscriptions.append(topic)
+        for installation in installations:
+            topic = expand_topic(ClientTopics.INSTALLATION.value, email, installation)
+            self._inbound.setdefault(topic, TopicRoute(ClientTopics.INSTALLATION.value, installation))
+        for installation in (*installations, None):
+            self._outbound[installation] = {
+                template: expand_topic(template, email, installation) for template in OUTBOUND_TEMPLATES
+            }
+        return True
+
+    def resolve(self, topic: str) -> TopicRoute | None:
+        """Return the route of an inbound topic, None if it is not one of the account."""
+        return self._inbound.get(topic)
+
+    def outbound(self, template: str, installation: str | None = None) -> str:
+        """Return the concrete topic of a template.
+
+        Args:
+            template (str): The ``ServerTopics`` or ``ClientTopics`` value.
+            installation (str | None): The installation unique, the default installation if None.
+
+        Returns:
+            str: The topic with the wildcards replaced.
+        """
+        if installation is None:
+            installation = self.default
+        topics = self._outbound.get(installation)
+        if topics is None:
+            topics = self._outbound[installation] = {}
+        topic = topics.get(template)
+        if topic is None:
+            # Templates outside of the enums are expanded once and kept.
+            topic = topics[template] = expand_topic(template, self.email, installation)
+        return topic
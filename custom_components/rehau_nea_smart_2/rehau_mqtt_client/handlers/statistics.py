@@ -0,0 +1,86 @@
+"""Parsing of the statistics the server returns for an installation."""
+from __future__ import annotations
+
+from datetime import datetime
+import logging
+
+from ..utils import decompress_utf16, raw_to_celsius
+
+_LOGGER = logging.getLogger(__name__)
+
+# The raw temperature fields of a statistics entry and the bucket keys they map to.
+TEMPERATURE_FIELDS = {"temp_zone": "temperature", "setpoint_used": "setpoint"}
+DEMAND_FIELD = "demand"
+
+# Timestamps above this are in milliseconds.
+_MILLISECONDS_THRESHOLD = 10_000_000_000
+
+
+def parse_timestamp(value) -> float | None:
+    """Return a UNIX timestamp from seconds, milliseconds or an ISO 8601 string, None if invalid."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int | float):
+        return value / 1000 if value > _MILLISECONDS_THRESHOLD else float(value)
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+        except ValueError:
+            return None
+    return None
+
+
+def _number(value) -> float | None:
+    return float(value) if isinstance(value, int | float) and not isinstance(value, bool) else None
+
+
+def parse_statistics(data) -> list[dict]:
+    """Parse the statistics of an installation into buckets.
+
+    The data is the ``data`` member of a ``statistic`` message: the entries
+    themselves, an object holding them under ``statistics``, or either of
+    them LZString compressed like the referentials. Entries without a zone
+    or a timestamp are skipped.
+
+    Args:
+        data: The statistics data.
+
+    Returns:
+        list[dict]: The buckets, ordered by start, with the zone number, the
+            start as a UNIX timestamp, the temperature and setpoint in Celsius
+            and the demand in percent. Missing values are None.
+    """
+    if isinstance(data, str):
+        data = decompress_utf16(data)
+    if isinstance(data, dict):
+        data = data.get("statistics", [])
+    if not isinstance(data, list):
+        return []
+
+    buckets = []
+    skipped = 0
+    for entry in data:
+        if not isinstance(entry, dict):
+            skipped += 1
+            continue
+        zone = entry.get("zone")
+        start = parse_timestamp(entry.get("timestamp", entry.get("date")))
+        if not isinstance(zone, int) or start is None:
+            skipped += 1
+            continue
+        bucket = {"zone": zone, "start": start, DEMAND_FIELD: _number(entry.get(DEMAND_FIELD))}
+        for field, key in TEMPERATURE_FIELDS.items():
+            raw = _number(entry.get(field))
+            bucket[key] = raw_to_celsius(raw) if raw is not None else None
+        buckets.append(bucket)
+    if skipped:
+        _LOGGER.debug("Skipped %d malformed statistics entries", skipped)
+    buckets.sort(key=lambda bucket: bucket["start"])
+    return buckets
+
+
+async def handle_statistics(message, client):
+    """Handle the statistics requested by ``MqttClient.read_statistics``."""
+    with client.timings.measure("decode"):
+        buckets = parse_statistics(message["data"])
+    client.resolve_response("statistic", buckets)
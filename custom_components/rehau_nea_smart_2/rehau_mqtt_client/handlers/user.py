@@ -1,8 +1,9 @@
 """Handlers for the refresh of the authentication token."""
 import logging
-import httpx
 
 from ..exceptions import MqttClientCommunicationError, MqttClientAuthenticationError
+from ..utils import loads_selected
+from .installation import USER_DOCUMENT_FIELDS
 
 
 _LOGGER = logging.getLogger(__name__)
@@ -14,24 +15,35 @@ async def read_user_state(payload: dict):
     Args:
         payload: The payload to send to the API.
 
+    The response body is streamed into a byte buffer and decoded keeping only
+    the fields listed in USER_DOCUMENT_FIELDS, so the full document is never
+    materialized.
+
     Returns:
-        dict: The response from the refresh API call.
+        dict: The user document, reduced to the fields used by the client.
 
     Raises:
         MqttClientCommunicationError: If there is an error while communicating with the MQTT client.
     """
+    import httpx
+
     url = f"https://api.nea2aws.aws.rehau.cloud/v1/users/{payload['username']}/getDataofInstall?demand={payload['demand']}&installsList={payload['installs_ids']}&hash={payload['install_hash']}"
     headers = {"Authorization": payload['token']}
     try:
         async with httpx.AsyncClient() as client:
-            user_response = await client.get(url, headers=headers, timeout=60)
-            if user_response.status_code >= 400:
-                if user_response.status_code == 401:
-                    raise MqttClientAuthenticationError("Could not read user data from the API. Status code: " + str(user_response.status_code) + " Reason: " + user_response.text)
-                else:
-                    raise MqttClientCommunicationError("Could not read user data from the API. Status code: " + str(user_response.status_code) + " Reason: " + user_response.text)
-
-            user = user_response.json()
+            async with client.stream("GET", url, headers=headers, timeout=60) as user_response:
+                if user_response.status_code >= 400:
+                    await user_response.aread()
+                    if user_response.status_code == 401:
+                        raise MqttClientAuthenticationError("Could not read user data from the API. Status code: " + str(user_response.status_code) + " Reason: " + user_response.text)
+                    else:
+                        raise MqttClientCommunicationError("Could not read user data from the API. Status code: " + str(user_response.status_code) + " Reason: " + user_response.text)
+
+                body = bytearray()
+                async for chunk in user_response.aiter_bytes():
+                    body += chunk
+
+            user = loads_selected(body, USER_DOCUMENT_FIELDS)
             return user["data"]["user"]
     except httpx.RequestError as exception:
         raise MqttClientCommunicationError("Could not read user data from the API. Reason: " + str(exception)) from exception
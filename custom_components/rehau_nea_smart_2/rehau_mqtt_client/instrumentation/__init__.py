@@ -0,0 +1,12 @@
+"""The Rehau Nea Smart 2 MQTT instrumentation."""
+
+from .capture import KIND_HTTP, KIND_MQTT, TrafficRecorder, read_capture, replay
+from .message_log import INBOUND, OUTBOUND, MessageLog
+from .metrics import SIZE_BUCKETS, MetricsRegistry, render_prometheus
+from .profiler import SectionProfiler, write_profile
+from .stage_timings import STAGES, StageTimings
+from .tracing import CommandTracer
+
+def __init__():
+    """Initialize the Rehau Nea Smart 2 MQTT instrumentation."""
+    pass
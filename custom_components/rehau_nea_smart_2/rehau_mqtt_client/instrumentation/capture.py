@@ -0,0 +1,161 @@
+"""Capture of the raw MQTT and HTTP traffic and its replay."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable, Iterator
+import json
+import threading
+import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ..MqttClient import MqttClient
+
+CAPTURE_VERSION = 1
+
+KIND_MQTT = "mqtt"
+KIND_HTTP = "http"
+
+REDACTED = "**REDACTED**"
+
+# Keys whose values are replaced in the captured HTTP documents.
+REDACTED_KEYS = frozenset({"token", "access_token", "refresh_token", "password", "email"})
+
+_STOP = object()
+
+
+def redact_document(document, keys: frozenset = REDACTED_KEYS):
+    """Return a copy of a JSON document with the values of the given keys redacted."""
+    if isinstance(document, dict):
+        return {
+            key: REDACTED if key in keys else redact_document(value, keys)
+            for key, value in document.items()
+        }
+    if isinstance(document, list):
+        return [redact_document(value, keys) for value in document]
+    return document
+
+
+class TrafficRecorder:
+    """Append the captured traffic to a gzip compressed JSON lines file.
+
+    ``record`` only enqueues the message; decoding, redaction and the
+    compressed write happen on a background thread so the event loop never
+    blocks on file I/O. Every line holds the seconds since the capture
+    started (``t``), the kind (``k``), the topic and the payload text.
+    Opening an existing file appends a new gzip member to it.
+    """
+
+    def __init__(self, path: str, secrets: Iterable[str] = ()):
+        """Initialize the recorder.
+
+        Args:
+            path (str): The capture file.
+            secrets (Iterable[str]): Strings removed from every payload, such as the account email.
+        """
+        # Imported on first use, like gzip, since captures are rarely started.
+        import queue
+
+        self.path = path
+        self.secrets = {secret for secret in secrets if secret}
+        self.records = 0
+        self._started = time.monotonic()
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._write, name="Rehau NEA Smart 2 capture", daemon=True)
+        self._thread.start()
+
+    def record(self, kind: str, topic: str, payload):
+        """Queue one message.
+
+        Args:
+            kind (str): ``KIND_MQTT`` for an inbound MQTT message, ``KIND_HTTP`` for an HTTP response.
+            topic (str): The MQTT topic or the name of the HTTP request.
+            payload: The raw payload, or the decoded document of an HTTP response.
+        """
+        self._queue.put((time.monotonic() - self._started, kind, topic, payload))
+
+    def add_secret(self, secret: str | None):
+        """Redact another string, such as a refreshed access token."""
+        if secret:
+            self.secrets = self.secrets | {secret}
+
+    def close(self):
+        """Flush the queued messages and close the file.
+
+        This joins the writer thread and must not run on the event loop.
+        """
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def _redact(self, text: str) -> str:
+        for secret in self.secrets:
+            text = text.replace(secret, REDACTED)
+        return text
+
+    def _write(self):
+        import gzip
+
+        with gzip.open(self.path, "at", encoding="utf-8") as file:
+            file.write(json.dumps({"version": CAPTURE_VERSION, "started": time.time()}) + "\n")
+            while (item := self._queue.get()) is not _STOP:
+                offset, kind, topic, payload = item
+                if isinstance(payload, bytes | bytearray):
+                    payload = payload.decode("utf-8", errors="replace")
+                elif not isinstance(payload, str):
+                    payload = json.dumps(redact_document(payload), separators=(",", ":"))
+                record = {"t": round(offset, 4), "k": kind, "topic": self._redact(topic), "payload": self._redact(payload)}
+                file.write(json.dumps(record, separators=(",", ":")) + "\n")
+                self.records += 1
+
+
+def read_capture(path: str) -> Iterator[dict]:
+    """Yield the records of a capture file, across all of its sessions.
+
+    The offsets of a session appended to an earlier one are shifted so
+    they continue after it.
+    """
+    import gzip
+
+    base = 0.0
+    last = 0.0
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        for line in file:
+            record = json.loads(line)
+            if "version" in record:
+                base = last
+                continue
+            record["t"] += base
+            last = record["t"]
+            yield record
+
+
+async def replay(records: Iterable[dict], client: MqttClient, speed: float | None = 1.0) -> int:
+    """Feed captured traffic back through the client.
+
+    MQTT records go through ``handle_message`` and HTTP records through
+    ``set_user``, as they would on a live connection.
+
+    Args:
+        records (Iterable[dict]): The records, usually from ``read_capture``.
+        client (MqttClient): The client to feed, it does not need a connection.
+        speed (float | None): The replay speed, 1.0 for real time, 10.0 for ten
+            times faster, None to replay as fast as possible.
+
+    Returns:
+        int: The number of replayed records.
+    """
+    from ..handlers import handle_message
+
+    count = 0
+    started = time.monotonic()
+    for record in records:
+        if speed:
+            delay = record["t"] / speed - (time.monotonic() - started)
+            if delay > 0:
+                await asyncio.sleep(delay)
+        if record["k"] == KIND_MQTT:
+            await handle_message(record["topic"], record["payload"], client)
+        elif record["k"] == KIND_HTTP:
+            await client.set_user(json.loads(record["payload"]))
+        count += 1
+    return count
@@ -0,0 +1,57 @@
+"""Bounded log of the most recent MQTT messages."""
+from __future__ import annotations
+
+from collections import deque
+from datetime import datetime, timezone
+from time import time
+
+INBOUND = "in"
+OUTBOUND = "out"
+
+MESSAGE_LOG_SIZE = 100
+
+
+class MessageLog:
+    """Ring buffer of the last inbound and outbound MQTT messages.
+
+    Only the metadata of a message is kept, never its payload. Recording
+    appends a single tuple, so the log can stay enabled on the message path.
+    """
+
+    __slots__ = ("entries",)
+
+    def __init__(self, size: int = MESSAGE_LOG_SIZE):
+        """Initialize an empty log.
+
+        Args:
+            size (int): The number of messages to keep.
+        """
+        self.entries: deque[tuple] = deque(maxlen=size)
+
+    def record(self, direction: str, topic: str, size: int, message_type: str | None = None):
+        """Record one message.
+
+        Args:
+            direction (str): ``INBOUND`` or ``OUTBOUND``.
+            topic (str): The MQTT topic.
+            size (int): The payload size in bytes.
+            message_type (str | None): The ``type`` field of the message, if any.
+        """
+        self.entries.append((time(), direction, topic, size, message_type))
+
+    def as_list(self) -> list[dict]:
+        """Return the logged messages, oldest first.
+
+        Returns:
+            list[dict]: The timestamp, direction, topic, size and type of each message.
+        """
+        return [
+            {
+                "timestamp": datetime.fromtimestamp(timestamp, timezone.utc).isoformat(),
+                "direction": direction,
+                "topic": topic,
+                "size": size,
+                "type": message_type,
+            }
+            for timestamp, direction, topic, size, message_type in self.entries
+        ]
@@ -0,0 +1,149 @@
+"""Counters and histograms rendered in the Prometheus text format."""
+from __future__ import annotations
+
+from collections.abc import Mapping
+
+# Upper bounds of the default duration buckets, in seconds.
+DURATION_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Upper bounds of the buckets used for counts, such as the callback fan-out.
+SIZE_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+
+class Counter:
+    """Monotonic counter with optional labels."""
+
+    __slots__ = ("name", "help", "values")
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str):
+        """Initialize a counter without any series."""
+        self.name = name
+        self.help = help
+        self.values: dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        """Increase the series identified by the labels."""
+        key = tuple(labels.items())
+        self.values[key] = self.values.get(key, 0) + amount
+
+    def samples(self):
+        """Yield the name, labels and value of every series."""
+        for key, value in self.values.items():
+            yield self.name, key, value
+
+
+class Histogram:
+    """Histogram with fixed buckets and optional labels."""
+
+    __slots__ = ("name", "help", "buckets", "values")
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, buckets: tuple = DURATION_BUCKETS):
+        """Initialize a histogram without any series."""
+        self.name = name
+        self.help = help
+        self.buckets = buckets
+        # Per series: the non-cumulative bucket counts (last one is +Inf), the sum and the count.
+        self.values: dict[tuple, list] = {}
+
+    def observe(self, value: float, **labels):
+        """Record one observation in the series identified by the labels."""
+        key = tuple(labels.items())
+        series = self.values.get(key)
+        if series is None:
+            series = self.values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        index = 0
+        for bound in self.buckets:
+            if value <= bound:
+                break
+            index += 1
+        series[0][index] += 1
+        series[1] += value
+        series[2] += 1
+
+    def samples(self):
+        """Yield the name, labels and value of every bucket, sum and count."""
+        for key, (counts, total, count) in self.values.items():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                yield self.name + "_bucket", key + (("le", _format_value(bound)),), cumulative
+            yield self.name + "_bucket", key + (("le", "+Inf"),), count
+            yield self.name + "_sum", key, total
+            yield self.name + "_count", key, count
+
+
+class MetricsRegistry:
+    """Named counters and histograms of one client.
+
+    The metrics are updated from the event loop without any locking: every
+    update is a single dictionary write, and the exporter only reads.
+    """
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self.metrics: dict[str, Counter | Histogram] = {}
+
+    def counter(self, name: str, help: str) -> Counter:
+        """Return the counter with the given name, creating it if needed."""
+        metric = self.metrics.get(name)
+        if metric is None:
+            metric = self.metrics[name] = Counter(name, help)
+        return metric
+
+    def histogram(self, name: str, help: str, buckets: tuple = DURATION_BUCKETS) -> Histogram:
+        """Return the histogram with the given name, creating it if needed."""
+        metric = self.metrics.get(name)
+        if metric is None:
+            metric = self.metrics[name] = Histogram(name, help, buckets)
+        return metric
+
+    def render(self) -> str:
+        """Render the metrics in the Prometheus text format."""
+        return render_prometheus({None: self})
+
+
+def render_prometheus(registries: Mapping[str | None, MetricsRegistry], label: str = "entry") -> str:
+    """Render several registries as one Prometheus text exposition.
+
+    Args:
+        registries (Mapping[str | None, MetricsRegistry]): The registries by
+            the value of their distinguishing label. A ``None`` key adds no label.
+        label (str): The name of the distinguishing label.
+
+    Returns:
+        str: The exposition, one HELP and TYPE header per metric name.
+    """
+    metrics: dict[str, list] = {}
+    for value, registry in registries.items():
+        for name, metric in registry.metrics.items():
+            metrics.setdefault(name, []).append((value, metric))
+
+    lines = []
+    for name, entries in metrics.items():
+        lines.append(f"# HELP {name} {entries[0][1].help}")
+        lines.append(f"# TYPE {name} {entries[0][1].kind}")
+        for value, metric in entries:
+            extra = () if value is None else ((label, value),)
+            for sample_name, labels, sample in metric.samples():
+                lines.append(f"{sample_name}{_format_labels(extra + labels)} {_format_value(sample)}")
+    return "\n".join(lines) + "\n"
+
+
+def _format_labels(labels: tuple) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, int) or (isinstance(value, float) and value.is_integer()):
+        return str(int(value))
+    return repr(value)
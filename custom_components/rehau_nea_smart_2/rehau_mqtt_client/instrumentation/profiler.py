@@ -0,0 +1,112 @@
+"""On-demand profiling of the message, polling and state update paths."""
+from __future__ import annotations
+
+import contextlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import cProfile
+
+SUMMARY_LIMIT = 40
+
+_INACTIVE = contextlib.nullcontext()
+
+
+class ProfilerSection:
+    """Context manager enabling the profiler while its block runs.
+
+    Sections may nest or interleave across awaits; the profiler stays
+    enabled until the outermost open section exits.
+    """
+
+    __slots__ = ("_profiler", "_profile")
+
+    def __init__(self, profiler: SectionProfiler):
+        """Initialize the section."""
+        self._profiler = profiler
+        self._profile = profiler.profile
+
+    def __enter__(self):
+        """Enable the profiler if no other section holds it."""
+        profiler = self._profiler
+        if profiler.depth == 0:
+            self._profile.enable()
+        profiler.depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        """Disable the profiler when the last section exits."""
+        profiler = self._profiler
+        if profiler.profile is not self._profile:
+            # The capture was stopped while the section was open.
+            return
+        profiler.depth -= 1
+        if profiler.depth == 0:
+            self._profile.disable()
+
+
+class SectionProfiler:
+    """Deterministic profiler restricted to explicitly marked sections.
+
+    While inactive, ``section`` returns a shared null context so the marked
+    paths pay a single attribute check.
+    """
+
+    def __init__(self):
+        """Initialize an inactive profiler."""
+        self.profile: cProfile.Profile | None = None
+        self.depth = 0
+
+    @property
+    def active(self) -> bool:
+        """Return whether a profile is being captured."""
+        return self.profile is not None
+
+    def section(self):
+        """Return a context manager profiling its block while a capture runs."""
+        if self.profile is None:
+            return _INACTIVE
+        return ProfilerSection(self)
+
+    def start(self):
+        """Start a capture, discarding any previous one."""
+        # Imported on first use, the profiler is rarely started.
+        import cProfile
+
+        self.profile = cProfile.Profile()
+        self.depth = 0
+
+    def stop(self) -> cProfile.Profile | None:
+        """Stop the capture and return the collected profile."""
+        profile, self.profile = self.profile, None
+        if profile is not None and self.depth:
+            profile.disable()
+        self.depth = 0
+        return profile
+
+
+def write_profile(profile: cProfile.Profile, profile_path: str, summary_path: str, limit: int = SUMMARY_LIMIT):
+    """Write a profile and a summary of its top functions.
+
+    This does blocking file I/O and must run in an executor.
+
+    Args:
+        profile (cProfile.Profile): The collected profile.
+        profile_path (str): The path of the ``.prof`` file, readable with ``pstats`` or snakeviz.
+        summary_path (str): The path of the text summary.
+        limit (int): The number of functions listed per ordering.
+    """
+    import io
+    import pstats
+
+    stats = pstats.Stats(profile)
+    stats.dump_stats(profile_path)
+
+    summary = io.StringIO()
+    stats.stream = summary
+    summary.write("Top functions by cumulative time\n")
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(limit)
+    summary.write("\nTop functions by own time\n")
+    stats.sort_stats(pstats.SortKey.TIME).print_stats(limit)
+    with open(summary_path, "w", encoding="utf-8") as file:
+        file.write(summary.getvalue())
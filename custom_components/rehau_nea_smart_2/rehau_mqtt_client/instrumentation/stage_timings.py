@@ -0,0 +1,121 @@
+"""Rolling timings of the stages of the message and polling paths."""
+from __future__ import annotations
+
+from collections import deque
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .metrics import Histogram, MetricsRegistry
+
+# Stages timed by the client, in the order they are reported.
+STAGES = (
+    "handle_message",
+    "decode",
+    "json",
+    "parse_installations",
+    "replace_keys",
+    "read_user_http",
+    "set_user",
+    "publish_updates",
+    "send_message",
+)
+
+WINDOW_SIZE = 256
+
+
+def percentile(ordered: list[float], fraction: float) -> float | None:
+    """Return the nearest-rank percentile of sorted samples, or None when empty."""
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class Stage:
+    """Durations of one stage: a rolling window plus lifetime counters."""
+
+    __slots__ = ("name", "samples", "count", "total", "last", "histogram")
+
+    def __init__(self, name: str, window_size: int, histogram: Histogram | None = None):
+        """Initialize an empty stage."""
+        self.name = name
+        self.samples: deque[float] = deque(maxlen=window_size)
+        self.count = 0
+        self.total = 0.0
+        self.last = None
+        self.histogram = histogram
+
+    def add(self, seconds: float):
+        """Record one duration."""
+        self.samples.append(seconds)
+        self.count += 1
+        self.total += seconds
+        self.last = seconds
+        if self.histogram is not None:
+            self.histogram.observe(seconds, stage=self.name)
+
+    def summary(self) -> dict:
+        """Return the rolling p50, p95 and max and the counters in milliseconds."""
+        if not self.samples:
+            return {"count": self.count, "p50": None, "p95": None, "max": None, "last": None}
+        ordered = sorted(self.samples)
+        return {
+            "count": self.count,
+            "p50": percentile(ordered, 0.50) * 1000,
+            "p95": percentile(ordered, 0.95) * 1000,
+            "max": ordered[-1] * 1000,
+            "last": self.last * 1000,
+        }
+
+
+class StageTimer:
+    """Context manager adding the duration of its block to a stage."""
+
+    __slots__ = ("_stage", "_start")
+
+    def __init__(self, stage: Stage):
+        """Initialize the timer."""
+        self._stage = stage
+        self._start = 0.0
+
+    def __enter__(self):
+        """Start timing."""
+        self._start = perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        """Record the duration, also when the block raised."""
+        self._stage.add(perf_counter() - self._start)
+
+
+class StageTimings:
+    """Rolling timings for a fixed set of stages.
+
+    Recording only appends to a bounded deque, the percentiles are computed
+    when the summary is read.
+    """
+
+    def __init__(self, stages=STAGES, window_size: int = WINDOW_SIZE, registry: MetricsRegistry | None = None):
+        """Initialize the timings.
+
+        Args:
+            stages: The names of the timed stages.
+            window_size (int): The number of durations kept per stage.
+            registry (MetricsRegistry | None): Also record every duration in its stage duration histogram.
+        """
+        histogram = None
+        if registry is not None:
+            histogram = registry.histogram("rehau_stage_duration_seconds", "Duration of the message and polling stages.")
+        self.stages = {stage: Stage(stage, window_size, histogram) for stage in stages}
+
+    def measure(self, stage: str) -> StageTimer:
+        """Return a context manager timing its block as ``stage``."""
+        return StageTimer(self.stages[stage])
+
+    def record(self, stage: str, seconds: float):
+        """Record a duration measured by the caller."""
+        self.stages[stage].add(seconds)
+
+    def summary(self) -> dict[str, dict]:
+        """Return the summary of every stage."""
+        return {name: stage.summary() for name, stage in self.stages.items()}
@@ -0,0 +1,235 @@
+"""Tracing of zone commands until the cloud confirms them."""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Callable
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+from .stage_timings import WINDOW_SIZE, percentile
+
+if TYPE_CHECKING:
+    from .metrics import MetricsRegistry
+
+COMMAND_TIMEOUT = 30.0
+
+# Upper bounds of the latency histogram buckets, in milliseconds.
+LATENCY_BUCKETS = (250, 500, 1000, 2000, 5000, 10000, 30000)
+
+STATUS_CONFIRMED = "confirmed"
+STATUS_TIMEOUT = "timeout"
+STATUS_SUPERSEDED = "superseded"
+
+
+class LatencyHistogram:
+    """Cumulative bucket counts plus a rolling window for percentiles."""
+
+    __slots__ = ("buckets", "count", "total", "samples")
+
+    def __init__(self, window_size: int = WINDOW_SIZE):
+        """Initialize an empty histogram."""
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.samples: deque[float] = deque(maxlen=window_size)
+
+    def add(self, milliseconds: float):
+        """Record one latency in milliseconds."""
+        index = 0
+        for bound in LATENCY_BUCKETS:
+            if milliseconds <= bound:
+                break
+            index += 1
+        self.buckets[index] += 1
+        self.count += 1
+        self.total += milliseconds
+        self.samples.append(milliseconds)
+
+    def summary(self) -> dict:
+        """Return the bucket counts and the rolling percentiles in milliseconds."""
+        ordered = sorted(self.samples)
+        labels = [f"le_{bound}" for bound in LATENCY_BUCKETS] + ["le_inf"]
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else None,
+            "p50": percentile(ordered, 0.50),
+            "p95": percentile(ordered, 0.95),
+            "max": ordered[-1] if ordered else None,
+            "buckets": dict(zip(labels, self.buckets)),
+        }
+
+
+class PendingCommand:
+    """A command sent for a zone that has not been confirmed yet."""
+
+    __slots__ = ("command", "installation", "zone", "key", "value", "started", "confirmed_ms", "timer")
+
+    def __init__(self, command: str, installation: str, zone: int, key: str, value: int):
+        """Initialize a pending command.
+
+        Args:
+            command (str): The command name.
+            installation (str): The unique of the installation of the zone.
+            zone (int): The zone number.
+            key (str): The channel update field confirming the command.
+            value (int): The value expected in that field.
+        """
+        self.command = command
+        self.installation = installation
+        self.zone = zone
+        self.key = key
+        self.value = value
+        self.started = perf_counter()
+        self.confirmed_ms: float | None = None
+        self.timer: asyncio.TimerHandle | None = None
+
+
+class CommandTracer:
+    """Correlate outbound zone commands with the inbound channel updates.
+
+    A command is pending from the moment it is sent until a channel update
+    for the same zone carries the expected value. Zone numbers are only
+    unique within an installation, so commands are keyed by the installation
+    unique and the zone number. Two latencies are kept:
+    ``round_trip`` up to the channel update and ``state`` up to the moment
+    the registered callbacks have been notified of it. Commands that are
+    not confirmed within the timeout are counted as timeouts.
+    """
+
+    def __init__(
+        self,
+        timeout: float = COMMAND_TIMEOUT,
+        listener: Callable[[dict], None] | None = None,
+        registry: MetricsRegistry | None = None,
+    ):
+        """Initialize the tracer.
+
+        Args:
+            timeout (float): Seconds to wait for a confirmation.
+            listener (Callable[[dict], None] | None): Called with the result of every finished command.
+            registry (MetricsRegistry | None): Also record the latencies and timeouts as metrics.
+        """
+        self.timeout = timeout
+        self.listener = listener
+        self.pending: dict[tuple[str, int, str], PendingCommand] = {}
+        self.round_trip = LatencyHistogram()
+        self.state = LatencyHistogram()
+        self.timeouts = 0
+        self.superseded = 0
+        self._latency_metric = None
+        self._timeout_metric = None
+        if registry is not None:
+            self._latency_metric = registry.histogram(
+                "rehau_command_latency_seconds", "Latency of zone commands until confirmed (round_trip) and published (state)."
+            )
+            self._timeout_metric = registry.counter("rehau_command_timeouts_total", "Zone commands never confirmed.")
+
+    def start(self, command: str, installation: str, zone: int, key: str, value: int):
+        """Start tracing a command.
+
+        A command still pending for the same zone and field is superseded.
+
+        Args:
+            command (str): The command name.
+            installation (str): The unique of the installation of the zone.
+            zone (int): The zone number.
+            key (str): The channel update field confirming the command.
+            value (int): The value expected in that field.
+        """
+        previous = self.pending.pop((installation, zone, key), None)
+        if previous is not None:
+            self._cancel_timer(previous)
+            self.superseded += 1
+            self._notify(previous, STATUS_SUPERSEDED)
+
+        pending = PendingCommand(command, installation, zone, key, value)
+        self.pending[(installation, zone, key)] = pending
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        pending.timer = loop.call_later(self.timeout, self._expire, pending)
+
+    def confirm(self, installation: str, zone: int, values: dict) -> list[PendingCommand]:
+        """Match a channel update against the pending commands of its zone.
+
+        Args:
+            installation (str): The unique of the installation of the updated channel.
+            zone (int): The zone number of the updated channel.
+            values (dict): The updated channel fields.
+
+        Returns:
+            list[PendingCommand]: The confirmed commands, to be passed to ``reflected``.
+        """
+        if not self.pending:
+            return []
+
+        confirmed = []
+        now = perf_counter()
+        for key, value in values.items():
+            pending = self.pending.get((installation, zone, key))
+            if pending is None or pending.value != value:
+                continue
+            del self.pending[(installation, zone, key)]
+            self._cancel_timer(pending)
+            pending.confirmed_ms = (now - pending.started) * 1000
+            self.round_trip.add(pending.confirmed_ms)
+            if self._latency_metric is not None:
+                self._latency_metric.observe(now - pending.started, command=pending.command, phase="round_trip")
+            confirmed.append(pending)
+        return confirmed
+
+    def reflected(self, confirmed: list[PendingCommand]):
+        """Finish the confirmed commands once their state has been published.
+
+        Args:
+            confirmed (list[PendingCommand]): The commands returned by ``confirm``.
+        """
+        now = perf_counter()
+        for pending in confirmed:
+            self.state.add((now - pending.started) * 1000)
+            if self._latency_metric is not None:
+                self._latency_metric.observe(now - pending.started, command=pending.command, phase="state")
+            self._notify(pending, STATUS_CONFIRMED, now)
+
+    def summary(self) -> dict:
+        """Return the latency histograms and the timeout counters."""
+        return {
+            "round_trip": self.round_trip.summary(),
+            "state": self.state.summary(),
+            "timeouts": self.timeouts,
+            "superseded": self.superseded,
+            "pending": len(self.pending),
+        }
+
+    def _expire(self, pending: PendingCommand):
+        """Count a command that was not confirmed in time."""
+        key = (pending.installation, pending.zone, pending.key)
+        if self.pending.get(key) is not pending:
+            return
+        del self.pending[key]
+        self.timeouts += 1
+        if self._timeout_metric is not None:
+            self._timeout_metric.inc(command=pending.command)
+        self._notify(pending, STATUS_TIMEOUT)
+
+    @staticmethod
+    def _cancel_timer(pending: PendingCommand):
+        if pending.timer is not None:
+            pending.timer.cancel()
+            pending.timer = None
+
+    def _notify(self, pending: PendingCommand, status: str, now: float | None = None):
+        if self.listener is None:
+            return
+        elapsed = ((now if now is not None else perf_counter()) - pending.started) * 1000
+        self.listener({
+            "command": pending.command,
+            "installation": pending.installation,
+            "zone": pending.zone,
+            "value": pending.value,
+            "status": status,
+            "latency_ms": round(elapsed, 1),
+            "round_trip_ms": round(pending.confirmed_ms, 1) if pending.confirmed_ms is not None else None,
+        })
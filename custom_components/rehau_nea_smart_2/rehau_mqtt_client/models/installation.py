@@ -1,24 +1,45 @@
-"""Type definitions for the installation data."""
+"""Type definitions for the installation data.
 
-from pydantic import BaseModel
+The models are slotted snapshots of the parsed installation dictionaries and
+are treated as read-only. They are rebuilt only when the underlying state
+changes. They are not frozen because frozen dataclasses are about three times
+slower to construct. Validation of the data received from the API lives in
+``schema.py``.
+"""
+from __future__ import annotations
 
+from dataclasses import dataclass
 
-class Cooling(BaseModel):
+
+@dataclass(slots=True)
+class Cooling:
     """Type definition for cooling data."""
 
     normal: int
     reduced: int
 
+    @classmethod
+    def from_dict(cls, data: dict) -> Cooling:
+        """Build the cooling setpoints from a parsed dictionary."""
+        return cls(data["normal"], data["reduced"])
+
 
-class Heating(BaseModel):
+@dataclass(slots=True)
+class Heating:
     """Type definition for heating data."""
 
     normal: int
     reduced: int
     standby: int
 
+    @classmethod
+    def from_dict(cls, data: dict) -> Heating:
+        """Build the heating setpoints from a parsed dictionary."""
+        return cls(data["normal"], data["reduced"], data["standby"])
 
-class Setpoints(BaseModel):
+
+@dataclass(slots=True)
+class Setpoints:
     """Type definition for setpoints data."""
 
     cooling: Cooling
@@ -26,8 +47,19 @@ class Setpoints(BaseModel):
     min: int
     max: int
 
+    @classmethod
+    def from_dict(cls, data: dict) -> Setpoints:
+        """Build the setpoints from a parsed dictionary."""
+        return cls(
+            Cooling.from_dict(data["cooling"]),
+            Heating.from_dict(data["heating"]),
+            data["min"],
+            data["max"],
+        )
+
 
-class Channel(BaseModel):
+@dataclass(slots=True)
+class Channel:
     """Type definition for channel data."""
 
     id: str
@@ -37,25 +69,59 @@ class Channel(BaseModel):
     operating_mode: int
     setpoints: Setpoints
 
-
-class Zone(BaseModel):
+    @classmethod
+    def from_dict(cls, data: dict) -> Channel:
+        """Build a channel from a parsed dictionary."""
+        return cls(
+            data["id"],
+            data["target_temperature"],
+            data["current_temperature"],
+            data["energy_level"],
+            data["operating_mode"],
+            Setpoints.from_dict(data["setpoints"]),
+        )
+
+
+@dataclass(slots=True)
+class Zone:
     """Type definition for zone data."""
 
     id: str
     name: str
     number: int
-    channels: list[Channel]
+    channels: tuple[Channel, ...]
+
+    @classmethod
+    def from_dict(cls, data: dict) -> Zone:
+        """Build a zone from a parsed dictionary."""
+        return cls(
+            data["id"],
+            data["name"],
+            data["number"],
+            tuple(Channel.from_dict(channel) for channel in data["channels"]),
+        )
 
 
-class Group(BaseModel):
+@dataclass(slots=True)
+class Group:
     """Type definition for group data."""
 
     id: str
     group_name: str
-    zones: list[Zone]
+    zones: tuple[Zone, ...]
+
+    @classmethod
+    def from_dict(cls, data: dict) -> Group:
+        """Build a group from a parsed dictionary."""
+        return cls(
+            data["id"],
+            data["group_name"],
+            tuple(Zone.from_dict(zone) for zone in data["zones"]),
+        )
 
 
-class Installation(BaseModel):
+@dataclass(slots=True)
+class Installation:
     """Type definition for installation data."""
 
     id: str
@@ -63,4 +129,16 @@ class Installation(BaseModel):
     global_energy_level: int
     connected: bool
     operating_mode: int
-    groups: list[Group]
+    groups: tuple[Group, ...]
+
+    @classmethod
+    def from_dict(cls, data: dict) -> Installation:
+        """Build an installation from a parsed dictionary."""
+        return cls(
+            data["id"],
+            data["unique"],
+            data["global_energy_level"],
+            data["connected"],
+            data["operating_mode"],
+            tuple(Group.from_dict(group) for group in data["groups"]),
+        )
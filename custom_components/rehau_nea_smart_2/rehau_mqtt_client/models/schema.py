@@ -0,0 +1,88 @@
+"""Validation schema for the installation data received from the API.
+
+Importing this module imports pydantic, so it is only loaded when the parsed
+API data is validated.
+"""
+
+from pydantic import BaseModel, ValidationError
+
+from ..exceptions import MqttClientCommunicationError
+
+
+class CoolingSchema(BaseModel):
+    """Validation schema for cooling data."""
+
+    normal: int
+    reduced: int
+
+
+class HeatingSchema(BaseModel):
+    """Validation schema for heating data."""
+
+    normal: int
+    reduced: int
+    standby: int
+
+
+class SetpointsSchema(BaseModel):
+    """Validation schema for setpoints data."""
+
+    cooling: CoolingSchema
+    heating: HeatingSchema
+    min: int
+    max: int
+
+
+class ChannelSchema(BaseModel):
+    """Validation schema for channel data."""
+
+    id: str
+    target_temperature: int
+    current_temperature: int
+    energy_level: int
+    operating_mode: int
+    setpoints: SetpointsSchema
+
+
+class ZoneSchema(BaseModel):
+    """Validation schema for zone data."""
+
+    id: str
+    name: str
+    number: int
+    channels: list[ChannelSchema]
+
+
+class GroupSchema(BaseModel):
+    """Validation schema for group data."""
+
+    id: str
+    group_name: str
+    zones: list[ZoneSchema]
+
+
+class InstallationSchema(BaseModel):
+    """Validation schema for installation data."""
+
+    id: str
+    unique: str
+    global_energy_level: int
+    connected: bool
+    operating_mode: int
+    groups: list[GroupSchema]
+
+
+def validate_installations(installations: list[dict]) -> None:
+    """Validate parsed installations before they replace the current state.
+
+    Args:
+        installations (list[dict]): The parsed installations.
+
+    Raises:
+        MqttClientCommunicationError: If the API returned malformed installation data.
+    """
+    try:
+        for installation in installations:
+            InstallationSchema(**installation)
+    except ValidationError as exception:
+        raise MqttClientCommunicationError("Invalid installation data: " + str(exception)) from exception
@@ -0,0 +1,13 @@
+"""The Rehau Nea Smart 2 MQTT state store."""
+
+from .channel_table import ChannelTable, ZoneAggregate
+from .faults import FaultIndex, FaultStore
+from .history import HistoryStore, ZoneHistory
+from .pending import PendingOverlay
+from .programs import DAYS, ProgramCache, diff_program, format_period, parse_period
+from .retention import compact_referentials, compact_user, intern_string
+from .state_store import StateStore
+
+def __init__():
+    """Initialize the Rehau Nea Smart 2 MQTT state store."""
+    pass
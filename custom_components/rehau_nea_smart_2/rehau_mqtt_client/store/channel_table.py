@@ -0,0 +1,332 @@
+"""Columnar table of the channel values of all installations."""
+from __future__ import annotations
+
+from array import array
+from collections.abc import Callable, Iterable, Sequence
+
+from ..utils import raw_to_celsius, raw_to_celsius_half, raw_to_celsius_many
+
+# Column name -> (raw value getter, round to 0.5 instead of 0.1)
+COLUMNS: dict[str, tuple[Callable[[dict], int], bool]] = {
+    "current_temperature": (lambda channel: channel["current_temperature"], False),
+    "target_temperature": (lambda channel: channel["target_temperature"], True),
+    "setpoint_min": (lambda channel: channel["setpoints"]["min"], False),
+    "setpoint_max": (lambda channel: channel["setpoints"]["max"], False),
+    "heating_normal": (lambda channel: channel["setpoints"]["heating"]["normal"], False),
+    "heating_reduced": (lambda channel: channel["setpoints"]["heating"]["reduced"], False),
+    "heating_standby": (lambda channel: channel["setpoints"]["heating"]["standby"], False),
+    "cooling_normal": (lambda channel: channel["setpoints"]["cooling"]["normal"], False),
+    "cooling_reduced": (lambda channel: channel["setpoints"]["cooling"]["reduced"], False),
+}
+
+
+# Integer state columns kept without conversion.
+STATE_COLUMNS: dict[str, Callable[[dict], int]] = {
+    "energy_level": lambda channel: channel["energy_level"],
+    "operating_mode": lambda channel: channel["operating_mode"],
+}
+
+# Columns with a running mean, minimum and maximum per zone.
+AGGREGATED_COLUMNS = ("current_temperature", "target_temperature")
+
+
+def convert(value: float, round_half: bool) -> float:
+    """Convert a raw column value to Celsius."""
+    return raw_to_celsius_half(value) if round_half else raw_to_celsius(value)
+
+
+class ZoneAggregate:
+    """Running mean, minimum and maximum raw value of one column over the channels of a zone.
+
+    A changed channel value adjusts the sum by its difference. The extremes
+    are only rescanned when the changed channel held one of them.
+    """
+
+    __slots__ = ("slots", "total", "minimum", "maximum")
+
+    def __init__(self, slots: tuple[int, ...], values: Sequence[int]):
+        """Initialize the aggregate.
+
+        Args:
+            slots (tuple[int, ...]): The channel slots of the zone.
+            values (Sequence[int]): The raw column values by slot.
+        """
+        self.slots = slots
+        self.reset(values)
+
+    def reset(self, values: Sequence[int]):
+        """Aggregate the values of all channels of the zone."""
+        zone_values = [values[slot] for slot in self.slots]
+        self.total = sum(zone_values)
+        self.minimum = min(zone_values)
+        self.maximum = max(zone_values)
+
+    def replace(self, old: int, new: int, values: Sequence[int]):
+        """Update the aggregate after one channel changed from ``old`` to ``new``.
+
+        Args:
+            old (int): The previous raw value of the channel.
+            new (int): The new raw value, already stored in ``values``.
+            values (Sequence[int]): The raw column values by slot.
+        """
+        self.total += new - old
+        if (old == self.minimum and new > old) or (old == self.maximum and new < old):
+            self.reset(values)
+        else:
+            self.minimum = min(self.minimum, new)
+            self.maximum = max(self.maximum, new)
+
+    @property
+    def mean(self) -> float:
+        """Return the raw mean of the zone."""
+        return self.total / len(self.slots)
+
+
+class ChannelTable:
+    """Keep the channel values in typed arrays indexed by channel slot.
+
+    Every channel gets a slot when the installations are loaded. ``refresh``
+    copies the raw values (tenths of a degree Fahrenheit) from the parsed
+    channel dictionaries into one ``array`` per column and converts each
+    changed column to Celsius in a single pass, so readers only index into the
+    arrays. The per zone aggregates of ``AGGREGATED_COLUMNS`` are updated with
+    the changed values, so readers never aggregate the channels themselves.
+    ``STATE_COLUMNS`` are kept as they are. Every slot with a changed value
+    gets the next ``change_count`` as its version, so readers can skip work
+    while the version of their slot is unchanged.
+
+    Zone numbers are only unique within an installation, so zones are keyed by
+    the installation unique and the zone number.
+    """
+
+    def __init__(self):
+        """Initialize an empty table."""
+        self.slots: dict[str, int] = {}
+        self.zone_slots: dict[tuple[str, int], tuple[int, ...]] = {}
+        self.raw: dict[str, array] = {column: array("i") for column in COLUMNS}
+        self.celsius: dict[str, array] = {column: array("d") for column in COLUMNS}
+        self.state: dict[str, array] = {column: array("i") for column in STATE_COLUMNS}
+        self.versions = array("Q")
+        self.change_count = 0
+        self.zone_current_temperature: dict[tuple[str, int], float] = {}
+        self.zone_aggregates: dict[str, dict[tuple[str, int], ZoneAggregate]] = {
+            column: {} for column in AGGREGATED_COLUMNS
+        }
+        self._channels: list[dict] = []
+        self._slot_zones: list[tuple[str, int]] = []
+
+    def __len__(self) -> int:
+        """Return the number of channel slots."""
+        return len(self._channels)
+
+    def load(self, installations: list[dict]):
+        """Assign a slot to every channel of the installations.
+
+        When every channel keeps its slot, the previous values and versions are
+        kept, so the next refresh only reports the channels that changed.
+
+        Args:
+            installations (list[dict]): The parsed installations.
+        """
+        slots: dict[str, int] = {}
+        channels: list[dict] = []
+        slot_zones: list[tuple[str, int]] = []
+        zone_slots: dict[tuple[str, int], list[int]] = {}
+        for installation in installations:
+            for group in installation["groups"]:
+                for zone in group["zones"]:
+                    key = (installation["unique"], zone["number"])
+                    zone_channel_slots = zone_slots.setdefault(key, [])
+                    for channel in zone["channels"]:
+                        zone_channel_slots.append(len(channels))
+                        slots[channel["id"]] = len(channels)
+                        channels.append(channel)
+                        slot_zones.append(key)
+        self._channels = channels
+        if slots == self.slots and slot_zones == self._slot_zones:
+            return
+
+        self.slots = slots
+        self._slot_zones = slot_zones
+        self.zone_slots = {key: tuple(zone_channel_slots) for key, zone_channel_slots in zone_slots.items() if zone_channel_slots}
+        self.zone_current_temperature = {}
+        # Slots were reassigned, so every column is converted on the next refresh.
+        self.raw = {column: array("i") for column in COLUMNS}
+        self.state = {column: array("i") for column in STATE_COLUMNS}
+        self.versions = array("Q", [0]) * len(self._channels)
+
+    def refresh(self, slots: Iterable[int] | None = None):
+        """Copy the raw channel values and recompute the changed Celsius values.
+
+        Without ``slots`` every column is gathered in one pass and only the
+        columns whose raw values changed are converted. With ``slots`` only
+        those channels are re-read.
+
+        Args:
+            slots (Iterable[int] | None): The slots of the changed channels.
+        """
+        if slots is not None:
+            self._refresh_slots(slots)
+            return
+
+        channels = self._channels
+        changed: set[int] = set()
+        for column, getter in STATE_COLUMNS.items():
+            values = array("i", [getter(channel) for channel in channels])
+            if values != self.state[column]:
+                changed.update(_changed_slots(self.state[column], values))
+                self.state[column] = values
+        for column, (getter, round_half) in COLUMNS.items():
+            raw = array("i", [getter(channel) for channel in channels])
+            if raw == self.raw[column]:
+                continue
+            changed.update(_changed_slots(self.raw[column], raw))
+            self.raw[column] = raw
+            self.celsius[column] = array("d", raw_to_celsius_many(raw, round_half))
+            if column in self.zone_aggregates:
+                self.zone_aggregates[column] = {
+                    key: ZoneAggregate(slots, raw) for key, slots in self.zone_slots.items()
+                }
+                if column == "current_temperature":
+                    self._update_zone_temperatures(self.zone_slots)
+        if changed:
+            self._bump(changed)
+
+    def _refresh_slots(self, slots: Iterable[int]):
+        """Re-read the given channel slots."""
+        zones = set()
+        changed = set()
+        for slot in slots:
+            channel = self._channels[slot]
+            for column, getter in STATE_COLUMNS.items():
+                value = getter(channel)
+                if value != self.state[column][slot]:
+                    self.state[column][slot] = value
+                    changed.add(slot)
+            for column, (getter, round_half) in COLUMNS.items():
+                value = getter(channel)
+                raw = self.raw[column]
+                previous = raw[slot]
+                if value == previous:
+                    continue
+                raw[slot] = value
+                self.celsius[column][slot] = convert(value, round_half)
+                changed.add(slot)
+                aggregates = self.zone_aggregates.get(column)
+                if aggregates is not None:
+                    aggregates[self._slot_zones[slot]].replace(previous, value, raw)
+                    if column == "current_temperature":
+                        zones.add(self._slot_zones[slot])
+        if zones:
+            self._update_zone_temperatures(zones)
+        if changed:
+            self._bump(changed)
+
+    def _bump(self, slots: Iterable[int]):
+        """Give the changed slots the next version."""
+        self.change_count += 1
+        for slot in slots:
+            self.versions[slot] = self.change_count
+
+    def _update_zone_temperatures(self, zones: Iterable[tuple[str, int]]):
+        """Convert the mean current temperature of the given zones."""
+        aggregates = self.zone_aggregates["current_temperature"]
+        for key in zones:
+            self.zone_current_temperature[key] = raw_to_celsius(aggregates[key].mean)
+
+    def zone_value(self, zone_number: int, installation_unique: str, column: str) -> float | None:
+        """Return the Celsius value of the first channel of a zone.
+
+        Args:
+            zone_number (int): The zone number.
+            installation_unique (str): The installation of the zone.
+            column (str): One of the names in COLUMNS.
+
+        Returns:
+            float | None: The value, or None if the zone is unknown.
+        """
+        slots = self.zone_slots.get((installation_unique, zone_number))
+        if slots is None:
+            return None
+        return self.celsius[column][slots[0]]
+
+    def zone_state(self, zone_number: int, installation_unique: str, column: str) -> int | None:
+        """Return a state value of the first channel of a zone.
+
+        Args:
+            zone_number (int): The zone number.
+            installation_unique (str): The installation of the zone.
+            column (str): One of the names in STATE_COLUMNS.
+
+        Returns:
+            int | None: The value, or None if the zone is unknown.
+        """
+        slots = self.zone_slots.get((installation_unique, zone_number))
+        if slots is None:
+            return None
+        return self.state[column][slots[0]]
+
+    def zone_aggregate(self, zone_number: int, installation_unique: str, column: str) -> dict[str, float] | None:
+        """Return the Celsius mean, minimum and maximum of a zone.
+
+        Args:
+            zone_number (int): The zone number.
+            installation_unique (str): The installation of the zone.
+            column (str): One of the names in AGGREGATED_COLUMNS.
+
+        Returns:
+            dict[str, float] | None: The "mean", "min" and "max" values, or None if the zone is unknown.
+        """
+        aggregate = self.zone_aggregates[column].get((installation_unique, zone_number))
+        if aggregate is None:
+            return None
+        round_half = COLUMNS[column][1]
+        return {
+            "mean": convert(aggregate.mean, round_half),
+            "min": convert(aggregate.minimum, round_half),
+            "max": convert(aggregate.maximum, round_half),
+        }
+
+    def channel_value(self, channel_id: str, column: str) -> float | None:
+        """Return the Celsius value of one channel.
+
+        Args:
+            channel_id (str): The channel identifier.
+            column (str): One of the names in COLUMNS.
+
+        Returns:
+            float | None: The value, or None if the channel is unknown.
+        """
+        slot = self.slots.get(channel_id)
+        if slot is None:
+            return None
+        return self.celsius[column][slot]
+
+    def channel_state(self, channel_id: str, column: str) -> int | None:
+        """Return a state value of one channel.
+
+        Args:
+            channel_id (str): The channel identifier.
+            column (str): One of the names in STATE_COLUMNS.
+
+        Returns:
+            int | None: The value, or None if the channel is unknown.
+        """
+        slot = self.slots.get(channel_id)
+        if slot is None:
+            return None
+        return self.state[column][slot]
+
+    def channel_version(self, channel_id: str) -> int | None:
+        """Return the version of the slot of a channel, None if the channel is unknown."""
+        slot = self.slots.get(channel_id)
+        if slot is None:
+            return None
+        return self.versions[slot]
+
+
+def _changed_slots(previous: array, values: array) -> Iterable[int]:
+    """Return the slots whose value differs, all of them after the slots were reassigned."""
+    if len(previous) != len(values):
+        return range(len(values))
+    return (slot for slot, (old, new) in enumerate(zip(previous, values)) if old != new)
@@ -0,0 +1,149 @@
+"""Local index of the controller error logs."""
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+
+# Errors kept per installation, the oldest resolved ones are dropped first.
+MAX_ERRORS = 500
+
+
+class FaultIndex:
+    """The error log of one installation, indexed by code and zone.
+
+    Each error is kept as a (code, zone, timestamp, active) tuple. ``newest``
+    is the timestamp of the latest change seen, the next search starts
+    from it so the history is only downloaded once.
+    """
+
+    __slots__ = ("errors", "by_code", "by_zone", "active", "newest")
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self.errors: dict[str, tuple[str, int | None, float, bool]] = {}
+        self.by_code: dict[str, set[str]] = {}
+        self.by_zone: dict[int | None, set[str]] = {}
+        self.active: set[str] = set()
+        self.newest = 0.0
+
+    def __len__(self) -> int:
+        """Return the number of indexed errors."""
+        return len(self.errors)
+
+    def add(self, errors: Iterable[Mapping]) -> list[str]:
+        """Index errors from ``parse_errors``.
+
+        Args:
+            errors (Iterable[Mapping]): The errors of a page.
+
+        Returns:
+            list[str]: The identifiers of the errors that are new or whose
+                active state changed.
+        """
+        changed = []
+        for error in errors:
+            error_id = error["id"]
+            entry = (error["code"], error["zone"], error["timestamp"], error["active"])
+            previous = self.errors.get(error_id)
+            if previous == entry:
+                continue
+            if previous is not None:
+                self._unlink(error_id, previous)
+            self.errors[error_id] = entry
+            self.by_code.setdefault(entry[0], set()).add(error_id)
+            self.by_zone.setdefault(entry[1], set()).add(error_id)
+            if entry[3]:
+                self.active.add(error_id)
+            self.newest = max(self.newest, entry[2])
+            if previous is None or previous[3] != entry[3]:
+                changed.append(error_id)
+        if len(self.errors) > MAX_ERRORS:
+            self._evict()
+        return changed
+
+    def resolve(self, error_ids: Iterable[str]) -> list[str]:
+        """Mark active errors as resolved, such as the ones the log no longer reports as active.
+
+        Args:
+            error_ids (Iterable[str]): The identifiers of the errors.
+
+        Returns:
+            list[str]: The identifiers of the errors that were active.
+        """
+        changed = []
+        for error_id in list(error_ids):
+            entry = self.errors.get(error_id)
+            if entry is None or not entry[3]:
+                continue
+            self.errors[error_id] = (*entry[:3], False)
+            self.active.discard(error_id)
+            changed.append(error_id)
+        return changed
+
+    def active_faults(self, zone: int | None = None) -> list[tuple[str, int | None, float]]:
+        """Return the code, zone and timestamp of the active errors, newest first.
+
+        Args:
+            zone (int | None): Only return the errors of this zone, all of them if None.
+        """
+        ids = self.active if zone is None else self.active & self.by_zone.get(zone, set())
+        faults = [self.errors[error_id][:3] for error_id in ids]
+        faults.sort(key=lambda fault: fault[2], reverse=True)
+        return faults
+
+    def count_by_code(self) -> dict[str, int]:
+        """Return the number of indexed errors per code."""
+        return {code: len(ids) for code, ids in self.by_code.items()}
+
+    def _unlink(self, error_id: str, entry: tuple[str, int | None, float, bool]):
+        for index, key in ((self.by_code, entry[0]), (self.by_zone, entry[1])):
+            ids = index[key]
+            ids.discard(error_id)
+            if not ids:
+                del index[key]
+        self.active.discard(error_id)
+
+    def _evict(self):
+        resolved = sorted(
+            (error_id for error_id in self.errors if error_id not in self.active),
+            key=lambda error_id: self.errors[error_id][2],
+        )
+        for error_id in resolved[:len(self.errors) - MAX_ERRORS]:
+            self._unlink(error_id, self.errors.pop(error_id))
+
+    def as_dict(self) -> dict:
+        """Return the index as a JSON serializable document."""
+        return {"newest": self.newest, "errors": {error_id: list(entry) for error_id, entry in self.errors.items()}}
+
+    @classmethod
+    def from_dict(cls, document: Mapping) -> FaultIndex:
+        """Rebuild an index from ``as_dict``."""
+        index = cls()
+        index.add(
+            {"id": error_id, "code": code, "zone": zone, "timestamp": timestamp, "active": active}
+            for error_id, (code, zone, timestamp, active) in document["errors"].items()
+        )
+        index.newest = max(index.newest, document["newest"])
+        return index
+
+
+class FaultStore:
+    """Keep a ``FaultIndex`` per installation unique."""
+
+    def __init__(self):
+        """Initialize an empty store."""
+        self.installations: dict[str, FaultIndex] = {}
+
+    def get(self, installation_unique: str) -> FaultIndex:
+        """Return the index of an installation, creating it if needed."""
+        index = self.installations.get(installation_unique)
+        if index is None:
+            index = self.installations[installation_unique] = FaultIndex()
+        return index
+
+    def as_dict(self) -> dict:
+        """Return the indexes as a JSON serializable document."""
+        return {unique: index.as_dict() for unique, index in self.installations.items()}
+
+    def load(self, document: Mapping[str, Mapping]):
+        """Replace the indexes with a document from ``as_dict``."""
+        self.installations = {unique: FaultIndex.from_dict(entry) for unique, entry in document.items()}
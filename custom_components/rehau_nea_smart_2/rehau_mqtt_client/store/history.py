@@ -0,0 +1,306 @@
+"""Fixed-size time series of the zone values with downsampling."""
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable
+import time
+
+from ..utils import raw_to_celsius, raw_to_celsius_half
+
+# Raw samples kept per zone.
+SAMPLE_CAPACITY = 256
+
+# Downsampled series per zone: name -> (bucket seconds, buckets kept).
+RESOLUTIONS: dict[str, tuple[int, int]] = {
+    "1m": (60, 180),
+    "15m": (900, 96),
+    "1h": (3600, 168),
+}
+
+# The window of the running averages, in seconds.
+AVERAGE_WINDOW = 3600
+
+# The resolution and number of buckets the trend is computed over.
+TREND_RESOLUTION = "15m"
+TREND_BUCKETS = 4
+
+
+class TimeSeries:
+    """A ring of (timestamp, current, target, energy level) samples.
+
+    The columns are preallocated arrays, so appending never allocates and
+    overwrites the oldest sample once the ring is full. Samples are indexed
+    by age, 0 being the newest.
+    """
+
+    __slots__ = ("capacity", "timestamps", "current", "target", "energy_level", "total")
+
+    def __init__(self, capacity: int):
+        """Initialize an empty ring.
+
+        Args:
+            capacity (int): The number of samples kept.
+        """
+        self.capacity = capacity
+        self.timestamps = array("d", bytes(8 * capacity))
+        self.current = array("d", bytes(8 * capacity))
+        self.target = array("d", bytes(8 * capacity))
+        self.energy_level = array("i", bytes(4 * capacity))
+        # Samples appended since the ring was created, the next absolute index.
+        self.total = 0
+
+    def __len__(self) -> int:
+        """Return the number of samples held."""
+        return min(self.total, self.capacity)
+
+    def append(self, timestamp: float, current: float, target: float, energy_level: int):
+        """Append a sample, overwriting the oldest one when the ring is full."""
+        position = self.total % self.capacity
+        self.timestamps[position] = timestamp
+        self.current[position] = current
+        self.target[position] = target
+        self.energy_level[position] = energy_level
+        self.total += 1
+
+    def position(self, age: int) -> int:
+        """Return the array position of the sample of the given age."""
+        if not 0 <= age < len(self):
+            raise IndexError(age)
+        return (self.total - 1 - age) % self.capacity
+
+    def as_list(self) -> list[tuple[float, float, float, int]]:
+        """Return the samples, oldest first."""
+        return [
+            (self.timestamps[p], self.current[p], self.target[p], self.energy_level[p])
+            for p in (self.position(age) for age in range(len(self) - 1, -1, -1))
+        ]
+
+
+class Downsampler:
+    """Average the samples into fixed buckets.
+
+    Each bucket holds the mean of the current and target temperatures of
+    its samples and the last energy level. Completed buckets move into a
+    ring, the open bucket is kept aside until a sample of a later bucket
+    arrives.
+    """
+
+    __slots__ = ("resolution", "buckets", "start", "_current", "_target", "_energy_level", "_count")
+
+    def __init__(self, resolution: int, capacity: int):
+        """Initialize an empty series.
+
+        Args:
+            resolution (int): The bucket length in seconds.
+            capacity (int): The number of completed buckets kept.
+        """
+        self.resolution = resolution
+        self.buckets = TimeSeries(capacity)
+        self.start: float | None = None
+        self._current = 0.0
+        self._target = 0.0
+        self._energy_level = 0
+        self._count = 0
+
+    def add(self, timestamp: float, current: float, target: float, energy_level: int):
+        """Add a sample to its bucket."""
+        start = timestamp - timestamp % self.resolution
+        if start != self.start:
+            if self._count:
+                self.buckets.append(self.start, *self._open_means(), self._energy_level)
+            self.start = start
+            self._current = self._target = 0.0
+            self._count = 0
+        self._current += current
+        self._target += target
+        self._energy_level = energy_level
+        self._count += 1
+
+    def mean(self, age: int) -> float | None:
+        """Return the mean current temperature of a bucket, 0 being the open one."""
+        if self._count:
+            if age == 0:
+                return self._current / self._count
+            age -= 1
+        if age >= len(self.buckets):
+            return None
+        return self.buckets.current[self.buckets.position(age)]
+
+    def bucket_start(self, age: int) -> float | None:
+        """Return the start of a bucket, 0 being the open one."""
+        if self._count:
+            if age == 0:
+                return self.start
+            age -= 1
+        if age >= len(self.buckets):
+            return None
+        return self.buckets.timestamps[self.buckets.position(age)]
+
+    def as_list(self) -> list[tuple[float, float, float, int]]:
+        """Return the buckets, oldest first, including the open one."""
+        buckets = self.buckets.as_list()
+        if self._count:
+            buckets.append((self.start, *self._open_means(), self._energy_level))
+        return buckets
+
+    def _open_means(self) -> tuple[float, float]:
+        return self._current / self._count, self._target / self._count
+
+
+class ZoneHistory:
+    """The samples of one zone, their downsampled series and running averages.
+
+    The averages over the last ``AVERAGE_WINDOW`` seconds are running sums:
+    a sample is added when it is recorded and subtracted when it leaves the
+    window or the ring, so reading them never scans the samples.
+    """
+
+    __slots__ = ("samples", "downsampled", "_window_start", "_sum_current", "_sum_deviation")
+
+    def __init__(self, capacity: int = SAMPLE_CAPACITY):
+        """Initialize an empty history.
+
+        Args:
+            capacity (int): The number of raw samples kept.
+        """
+        self.samples = TimeSeries(capacity)
+        self.downsampled = {
+            name: Downsampler(resolution, buckets) for name, (resolution, buckets) in RESOLUTIONS.items()
+        }
+        # Absolute index of the oldest sample in the averaging window.
+        self._window_start = 0
+        self._sum_current = 0.0
+        self._sum_deviation = 0.0
+
+    def record(self, timestamp: float, current: float, target: float, energy_level: int):
+        """Record a sample of the zone.
+
+        Args:
+            timestamp (float): The UNIX timestamp of the sample.
+            current (float): The current temperature in Celsius.
+            target (float): The target temperature in Celsius.
+            energy_level (int): The energy level.
+        """
+        samples = self.samples
+        if samples.total - self._window_start >= samples.capacity:
+            # The oldest sample of the window is about to be overwritten.
+            self._leave_window()
+        samples.append(timestamp, current, target, energy_level)
+        self._sum_current += current
+        self._sum_deviation += current - target
+        horizon = timestamp - AVERAGE_WINDOW
+        while samples.timestamps[self._window_start % samples.capacity] < horizon:
+            self._leave_window()
+        for downsampler in self.downsampled.values():
+            downsampler.add(timestamp, current, target, energy_level)
+
+    def _leave_window(self):
+        samples = self.samples
+        position = self._window_start % samples.capacity
+        self._sum_current -= samples.current[position]
+        self._sum_deviation -= samples.current[position] - samples.target[position]
+        self._window_start += 1
+
+    @property
+    def window_size(self) -> int:
+        """Return the number of samples in the averaging window."""
+        return self.samples.total - self._window_start
+
+    def current_temperature(self) -> float | None:
+        """Return the latest current temperature."""
+        if not self.samples.total:
+            return None
+        return self.samples.current[self.samples.position(0)]
+
+    def average_temperature(self) -> float | None:
+        """Return the mean current temperature of the averaging window."""
+        count = self.window_size
+        return round(self._sum_current / count, 2) if count else None
+
+    def setpoint_deviation(self) -> float | None:
+        """Return how far the latest current temperature is above the target."""
+        if not self.samples.total:
+            return None
+        position = self.samples.position(0)
+        return round(self.samples.current[position] - self.samples.target[position], 2)
+
+    def average_deviation(self) -> float | None:
+        """Return the mean setpoint deviation of the averaging window."""
+        count = self.window_size
+        return round(self._sum_deviation / count, 2) if count else None
+
+    def temperature_trend(self) -> float | None:
+        """Return the change of the current temperature in degrees per hour.
+
+        The trend compares the mean of the latest ``TREND_RESOLUTION`` bucket
+        with the one ``TREND_BUCKETS`` buckets earlier, or the oldest one kept.
+        """
+        downsampler = self.downsampled[TREND_RESOLUTION]
+        age = TREND_BUCKETS
+        while age > 0 and downsampler.mean(age) is None:
+            age -= 1
+        if age == 0:
+            return None
+        elapsed = downsampler.bucket_start(0) - downsampler.bucket_start(age)
+        return round((downsampler.mean(0) - downsampler.mean(age)) * 3600 / elapsed, 2)
+
+
+class HistoryStore:
+    """Keep a ``ZoneHistory`` per installation and zone number."""
+
+    def __init__(self, capacity: int = SAMPLE_CAPACITY):
+        """Initialize an empty store.
+
+        Args:
+            capacity (int): The number of raw samples kept per zone.
+        """
+        self.capacity = capacity
+        self.zones: dict[tuple[str, int], ZoneHistory] = {}
+
+    def get(self, installation_unique: str, zone_number: int) -> ZoneHistory | None:
+        """Return the history of a zone, if it has one."""
+        return self.zones.get((installation_unique, zone_number))
+
+    def record_zone(self, installation_unique: str, zone: dict, timestamp: float | None = None):
+        """Record the values of a parsed zone.
+
+        The temperatures are the means over the channels of the zone, rounded
+        like the zone entities report them, the energy level is the one of the
+        first channel.
+
+        Args:
+            installation_unique (str): The installation unique.
+            zone (dict): The parsed zone.
+            timestamp (float | None): The UNIX timestamp of the sample, now if None.
+        """
+        channels = zone["channels"]
+        if not channels:
+            return
+        key = (installation_unique, zone["number"])
+        history = self.zones.get(key)
+        if history is None:
+            history = self.zones[key] = ZoneHistory(self.capacity)
+        history.record(
+            time.time() if timestamp is None else timestamp,
+            raw_to_celsius(sum(channel["current_temperature"] for channel in channels) / len(channels)),
+            raw_to_celsius_half(sum(channel["target_temperature"] for channel in channels) / len(channels)),
+            channels[0]["energy_level"],
+        )
+
+    def record_installations(self, installations: Iterable[dict], timestamp: float | None = None):
+        """Record every zone of the parsed installations and forget the zones that disappeared.
+
+        Args:
+            installations (Iterable[dict]): The parsed installations.
+            timestamp (float | None): The UNIX timestamp of the samples, now if None.
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        seen = set()
+        for installation in installations:
+            for group in installation["groups"]:
+                for zone in group["zones"]:
+                    self.record_zone(installation["unique"], zone, timestamp)
+                    seen.add((installation["unique"], zone["number"]))
+        for key in self.zones.keys() - seen:
+            del self.zones[key]
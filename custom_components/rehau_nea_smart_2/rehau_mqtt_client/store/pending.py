@@ -0,0 +1,254 @@
+"""Optimistic overlay of the commands not yet confirmed by the controller."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .state_store import StateStore
+
+PENDING_TIMEOUT = 30.0
+
+ZONE = "zone"
+INSTALLATION = "installation"
+
+# The scope, the target (installation unique and zone number, or installation unique) and the key.
+PendingKey = tuple[str, tuple[str, int] | str, str]
+
+# The channel update fields and the channel keys they are stored in.
+CHANNEL_UPDATE_FIELDS = {
+    "mode_used": "energy_level",
+    "setpoint_used": "target_temperature",
+    "temp_zone": "current_temperature",
+}
+
+
+class PendingValue:
+    """A value written for a command, with the values it replaced."""
+
+    __slots__ = ("field", "value", "targets", "reported", "timer")
+
+    def __init__(self, field: str, value, targets: list[dict], reported: list):
+        """Initialize a pending value.
+
+        Args:
+            field (str): The key the value is written to.
+            value: The commanded value.
+            targets (list[dict]): The installation and channel dicts holding the key.
+            reported (list): The last value the server reported for each target.
+        """
+        self.field = field
+        self.value = value
+        self.targets = targets
+        self.reported = reported
+        self.timer: asyncio.TimerHandle | None = None
+
+
+class PendingOverlay:
+    """Lay the values of sent commands over the stored installations.
+
+    A command writes its value into the store right away. Until a channel
+    update or a poll reports that value, it is written again over whatever
+    the server reports, so an older state arriving in between does not
+    revert it. A value that is not confirmed within the timeout is rolled
+    back to the last reported one and ``listener`` is called with the
+    identifiers of the affected channels.
+    """
+
+    def __init__(self, store: StateStore, timeout: float = PENDING_TIMEOUT):
+        """Initialize an empty overlay.
+
+        Args:
+            store (StateStore): The store the values are written to.
+            timeout (float): Seconds to wait for a confirmation.
+        """
+        self.store = store
+        self.timeout = timeout
+        self.listener: Callable[[list[str]], None] | None = None
+        self.pending: dict[PendingKey, PendingValue] = {}
+        self.confirmed = 0
+        self.rolled_back = 0
+
+    def __len__(self) -> int:
+        """Return the number of pending values."""
+        return len(self.pending)
+
+    def set_zone(self, unique: str, zone_number: int, field: str, value) -> list[str]:
+        """Write a commanded value into every channel of a zone.
+
+        Args:
+            unique (str): The unique of the installation of the zone.
+            zone_number (int): The zone number.
+            field (str): The channel key, e.g. "target_temperature".
+            value: The commanded value.
+
+        Returns:
+            list[str]: The identifiers of the changed channels.
+        """
+        return self._set((ZONE, (unique, zone_number), field), value)
+
+    def set_installation(self, unique: str, field: str, value) -> list[str]:
+        """Write a commanded value into an installation and all of its channels.
+
+        Args:
+            unique (str): The installation unique.
+            field (str): The installation and channel key, e.g. "operating_mode".
+            value: The commanded value.
+
+        Returns:
+            list[str]: The identifiers of the changed channels.
+        """
+        return self._set((INSTALLATION, unique, field), value)
+
+    def confirm_channel(self, channel_id: str, values: dict) -> bool:
+        """Match a channel update against the pending values of its zone.
+
+        Matching values are confirmed. For the others the reported value is
+        kept for a rollback and the pending value is written back.
+
+        Args:
+            channel_id (str): The updated channel, already written to the store.
+            values (dict): The channel update fields, e.g. "setpoint_used".
+
+        Returns:
+            bool: Whether a pending value was written back over the update.
+        """
+        if not self.pending:
+            return False
+        entry = self.store.get_channel(channel_id)
+        if entry is None:
+            return False
+
+        channel = entry[2]
+        overlaid = False
+        for update_field, value in values.items():
+            field = CHANNEL_UPDATE_FIELDS.get(update_field, update_field)
+            key = (ZONE, (entry[0]["unique"], entry[1]["number"]), field)
+            pending = self.pending.get(key)
+            if pending is None:
+                continue
+            if value == pending.value:
+                self._finish(key)
+                self.confirmed += 1
+                continue
+            for index, target in enumerate(pending.targets):
+                if target is channel:
+                    pending.reported[index] = value
+            channel[field] = pending.value
+            overlaid = True
+        return overlaid
+
+    def confirm_installation(self, unique: str, values: dict) -> bool:
+        """Match pushed installation values against the pending values of the installation.
+
+        Args:
+            unique (str): The installation unique, its values already written to the store.
+            values (dict): The installation keys and their pushed values, e.g. "operating_mode".
+
+        Returns:
+            bool: Whether a pending value was written back over the pushed one.
+        """
+        overlaid = False
+        for field, value in values.items():
+            key = (INSTALLATION, unique, field)
+            pending = self.pending.get(key)
+            if pending is None:
+                continue
+            if value == pending.value:
+                self._finish(key)
+                self.confirmed += 1
+                continue
+            pending.reported = [value] * len(pending.targets)
+            for target in pending.targets:
+                target[field] = pending.value
+            overlaid = True
+        return overlaid
+
+    def reapply(self) -> list[str]:
+        """Write the pending values over freshly loaded installations.
+
+        A value the installations already report is confirmed.
+
+        Returns:
+            list[str]: The identifiers of the channels the pending values were written to.
+        """
+        channel_ids = []
+        for key, pending in list(self.pending.items()):
+            targets = self._targets(key)
+            if not targets:
+                # The zone or installation disappeared.
+                self._finish(key)
+                continue
+            reported = [target.get(pending.field) for target in targets]
+            if all(value == pending.value for value in reported):
+                self._finish(key)
+                self.confirmed += 1
+                continue
+            pending.targets = targets
+            pending.reported = reported
+            for target in targets:
+                target[pending.field] = pending.value
+            channel_ids.extend(self._channel_ids(key, targets))
+        return channel_ids
+
+    def summary(self) -> dict:
+        """Return the pending, confirmed and rolled back counts."""
+        return {"pending": len(self.pending), "confirmed": self.confirmed, "rolled_back": self.rolled_back}
+
+    def _set(self, key: PendingKey, value) -> list[str]:
+        previous = self.pending.pop(key, None)
+        if previous is not None and previous.timer is not None:
+            previous.timer.cancel()
+        targets = self._targets(key)
+        if not targets:
+            return []
+
+        field = key[2]
+        # A superseded command keeps the values reported before it.
+        reported = previous.reported if previous is not None else [target.get(field) for target in targets]
+        pending = self.pending[key] = PendingValue(field, value, targets, reported)
+        for target in targets:
+            target[field] = value
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            pending.timer = loop.call_later(self.timeout, self._expire, key, pending)
+        return self._channel_ids(key, targets)
+
+    def _targets(self, key: PendingKey) -> list[dict]:
+        scope, target, _field = key
+        if scope == ZONE:
+            zone = self.store.get_installation_zone(*target)
+            return list(zone["channels"]) if zone is not None else []
+        installation = self.store.get_installation(target)
+        if installation is None:
+            return []
+        return [
+            installation,
+            *(channel for group in installation["groups"] for zone in group["zones"] for channel in zone["channels"]),
+        ]
+
+    @staticmethod
+    def _channel_ids(key: PendingKey, targets: list[dict]) -> list[str]:
+        # The installation itself comes first for the installation scope.
+        channels = targets[1:] if key[0] == INSTALLATION else targets
+        return [channel["id"] for channel in channels]
+
+    def _finish(self, key: PendingKey):
+        pending = self.pending.pop(key)
+        if pending.timer is not None:
+            pending.timer.cancel()
+
+    def _expire(self, key: PendingKey, pending: PendingValue):
+        """Roll back a value that was not confirmed in time."""
+        if self.pending.get(key) is not pending:
+            return
+        del self.pending[key]
+        for target, value in zip(pending.targets, pending.reported):
+            target[pending.field] = value
+        self.rolled_back += 1
+        if self.listener is not None:
+            self.listener(self._channel_ids(key, pending.targets))
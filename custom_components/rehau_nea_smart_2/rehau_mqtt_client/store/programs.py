@@ -0,0 +1,237 @@
+"""Local cache of the weekly room programs and their differences."""
+from __future__ import annotations
+
+import time
+from collections.abc import Callable, Collection, Iterable, Mapping
+from datetime import datetime
+
+from ..exceptions import MqttClientError
+
+DAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+
+MINUTES_PER_DAY = 1440
+
+# Seconds a day written through the client is trusted, the app may edit it afterwards.
+PROGRAM_TRUST_PERIOD = 3600
+
+# A comfort period as minutes since midnight, the end is exclusive.
+Period = tuple[int, int]
+DayProgram = tuple[Period, ...]
+
+
+def normalize_periods(periods: Iterable[Iterable[int]]) -> DayProgram:
+    """Sort the comfort periods of a day and merge the overlapping ones.
+
+    Args:
+        periods (Iterable[Iterable[int]]): The start and end minutes of every period.
+
+    Returns:
+        DayProgram: The sorted, disjoint periods.
+
+    Raises:
+        MqttClientError: If a period is empty or outside of the day.
+    """
+    merged: list[list[int]] = []
+    for start, end in sorted(tuple(period) for period in periods):
+        if not 0 <= start < end <= MINUTES_PER_DAY:
+            raise MqttClientError(f"Invalid program period {start}-{end}")
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return tuple((start, end) for start, end in merged)
+
+
+def parse_period(text: str) -> Period:
+    """Parse a ``HH:MM-HH:MM`` period, ``24:00`` being the end of the day.
+
+    Raises:
+        MqttClientError: If the period is malformed.
+    """
+    try:
+        start, end = (
+            int(hours) * 60 + int(minutes)
+            for hours, minutes in (part.strip().split(":") for part in text.split("-"))
+        )
+    except ValueError as e:
+        raise MqttClientError(f"Invalid program period {text!r}") from e
+    return start, end
+
+
+def format_period(period: Period) -> str:
+    """Format a period as ``HH:MM-HH:MM``."""
+    return "-".join(f"{minute // 60:02d}:{minute % 60:02d}" for minute in period)
+
+
+def diff_program(
+    current: Mapping[int, DayProgram],
+    days: Mapping[int, Iterable[Iterable[int]]],
+    known: Collection[int] | None = None,
+) -> tuple[dict[int, DayProgram], list[int]]:
+    """Compute the days of a zone program that an edit changes.
+
+    Only the days of ``known`` are compared with the cached program, the
+    other edited days are always set or unset.
+
+    Args:
+        current (Mapping[int, DayProgram]): The cached program, by day index.
+        days (Mapping[int, Iterable[Iterable[int]]]): The edited days only, an
+            empty day removes its program.
+        known (Collection[int] | None): The days the cached program is current
+            for, every day if None.
+
+    Returns:
+        tuple[dict[int, DayProgram], list[int]]: The days to set with their
+            normalized periods and the days to unset.
+    """
+    changed: dict[int, DayProgram] = {}
+    cleared: list[int] = []
+    for day, periods in sorted(days.items()):
+        if not 0 <= day < len(DAYS):
+            raise MqttClientError(f"Invalid program day {day}")
+        normalized = normalize_periods(periods)
+        if known is not None and day not in known:
+            if normalized:
+                changed[day] = normalized
+            else:
+                cleared.append(day)
+        elif not normalized:
+            if day in current:
+                cleared.append(day)
+        elif current.get(day) != normalized:
+            changed[day] = normalized
+    return changed, cleared
+
+
+class ProgramCache:
+    """The weekly programs of the zones, by installation unique and zone number.
+
+    A program maps the day index, Monday being 0, to the comfort periods of
+    that day. Days without periods are not stored. ``listener`` is called
+    after every change so the cache can be persisted.
+
+    The server does not report the programs, so the cache only knows the
+    days written through the client. ``written`` keeps when each day was
+    written, a day is only trusted for ``PROGRAM_TRUST_PERIOD`` seconds
+    since the app may edit it afterwards.
+    """
+
+    def __init__(self):
+        """Initialize an empty cache."""
+        self.programs: dict[tuple[str, int], dict[int, DayProgram]] = {}
+        self.names: dict[tuple[str, int], str] = {}
+        self.written: dict[tuple[str, int], dict[int, float]] = {}
+        self.listener: Callable[[], None] | None = None
+
+    def get(self, installation_unique: str, zone_number: int) -> dict[int, DayProgram]:
+        """Return the program of a zone, empty if none is cached."""
+        return self.programs.get((installation_unique, zone_number), {})
+
+    def get_name(self, installation_unique: str, zone_number: int) -> str | None:
+        """Return the program name of a zone, if any."""
+        return self.names.get((installation_unique, zone_number))
+
+    def known_days(self, installation_unique: str, zone_number: int, now: float | None = None) -> set[int]:
+        """Return the days of a zone the cached program is current for.
+
+        Args:
+            installation_unique (str): The installation unique.
+            zone_number (int): The zone number.
+            now (float | None): The UNIX timestamp to check at, now if None.
+
+        Returns:
+            set[int]: The day indexes written within the trust period.
+        """
+        since = (time.time() if now is None else now) - PROGRAM_TRUST_PERIOD
+        written = self.written.get((installation_unique, zone_number), {})
+        return {day for day, timestamp in written.items() if timestamp >= since}
+
+    def apply(
+        self,
+        installation_unique: str,
+        zone_number: int,
+        changed: Mapping[int, DayProgram],
+        cleared: Iterable[int],
+        name: str | None = None,
+        now: float | None = None,
+    ):
+        """Store the result of ``diff_program`` after it was sent.
+
+        Args:
+            installation_unique (str): The installation unique.
+            zone_number (int): The zone number.
+            changed (Mapping[int, DayProgram]): The days set.
+            cleared (Iterable[int]): The days unset.
+            name (str | None): The new program name, None to keep it.
+            now (float | None): The UNIX timestamp of the write, now if None.
+        """
+        key = (installation_unique, zone_number)
+        timestamp = time.time() if now is None else now
+        written = self.written.setdefault(key, {})
+        program = self.programs.setdefault(key, {})
+        program.update(changed)
+        for day in changed:
+            written[day] = timestamp
+        for day in cleared:
+            program.pop(day, None)
+            written[day] = timestamp
+        if not program:
+            del self.programs[key]
+        if name is not None:
+            self.names[key] = name
+        if self.listener is not None:
+            self.listener()
+
+    def comfort_period(self, installation_unique: str, zone_number: int, when: datetime) -> Period | None:
+        """Return the comfort period the zone is in at a time, None outside of them."""
+        minute = when.hour * 60 + when.minute
+        for start, end in self.get(installation_unique, zone_number).get(when.weekday(), ()):
+            if start <= minute < end:
+                return start, end
+        return None
+
+    def next_change(self, installation_unique: str, zone_number: int, when: datetime) -> tuple[int, int] | None:
+        """Return the day index and minute of the next program switch after a time, within a week."""
+        program = self.get(installation_unique, zone_number)
+        if not program:
+            return None
+        minute = when.hour * 60 + when.minute
+        today = when.weekday()
+        for offset in range(len(DAYS) + 1):
+            day = (today + offset) % len(DAYS)
+            for period in program.get(day, ()):
+                for switch in period:
+                    if (offset or switch > minute) and switch < MINUTES_PER_DAY:
+                        return day, switch
+        return None
+
+    def as_dict(self) -> dict:
+        """Return the cache as a JSON serializable document."""
+        return {
+            f"{unique}:{zone}": {
+                "name": self.names.get((unique, zone)),
+                "days": {
+                    str(day): [list(period) for period in periods]
+                    for day, periods in self.programs.get((unique, zone), {}).items()
+                },
+                "written": {str(day): timestamp for day, timestamp in self.written.get((unique, zone), {}).items()},
+            }
+            for unique, zone in self.programs.keys() | self.names.keys() | self.written.keys()
+        }
+
+    def load(self, document: Mapping[str, Mapping]):
+        """Replace the cache with a document from ``as_dict``, without notifying the listener."""
+        self.programs = {}
+        self.names = {}
+        self.written = {}
+        for key, entry in document.items():
+            unique, _, zone = key.rpartition(":")
+            zone_key = (unique, int(zone))
+            program = {int(day): normalize_periods(periods) for day, periods in entry["days"].items() if periods}
+            if program:
+                self.programs[zone_key] = program
+            # Documents saved before the write times were kept trust no day.
+            if entry.get("written"):
+                self.written[zone_key] = {int(day): timestamp for day, timestamp in entry["written"].items()}
+            if entry.get("name") is not None:
+                self.names[zone_key] = entry["name"]
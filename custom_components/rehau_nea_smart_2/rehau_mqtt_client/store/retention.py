@@ -0,0 +1,54 @@
+"""Retention policy for the payloads kept after parsing."""
+from __future__ import annotations
+
+from sys import intern
+
+
+def intern_string(value):
+    """Intern a string so repeated polls share one object, leave other values as is."""
+    return intern(value) if isinstance(value, str) else value
+
+
+def compact_user(user: dict) -> dict:
+    """Return the part of a user document the client reads after parsing it.
+
+    The installations are parsed into the state store, so only the default
+    installation, the transaction id and the identifiers of every
+    installation are kept instead of the whole document.
+
+    Args:
+        user (dict): The user document.
+
+    Returns:
+        dict: The retained fields, with the identifiers interned.
+    """
+    compact = {"installs": [
+        {
+            key: intern_string(install[key])
+            for key in ("_id", "unique", "hash")
+            if key in install
+        }
+        for install in user.get("installs", ())
+    ]}
+    for key in ("defaultInstall", "transactionId"):
+        if key in user:
+            compact[key] = intern_string(user[key])
+    return compact
+
+
+def compact_referentials(referentials: list[dict]) -> list[dict]:
+    """Return the referential entries reduced to the fields used to replace keys.
+
+    Args:
+        referentials (list[dict]): The decompressed referential entries.
+
+    Returns:
+        list[dict]: The ``index`` and interned ``value`` of every entry.
+    """
+    return [
+        {
+            "index": item["index"],
+            "value": intern_string(item["value"]),
+        }
+        for item in referentials
+    ]
@@ -0,0 +1,125 @@
+"""Indexed store for the parsed installation state."""
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+from .channel_table import ChannelTable
+
+
+class StateStore:
+    """Hold the parsed installations and index them for direct lookups.
+
+    The installations are the dictionaries produced by ``parse_installations``.
+    Every change to them bumps ``revision`` so readers can cache derived data.
+    When enabled, the channel table is refreshed on every change as well.
+    The mixed circuits, polled separately, are kept per installation and only
+    bump the revision when they change.
+    """
+
+    def __init__(self, use_channel_table: bool = True):
+        """Initialize an empty store.
+
+        Args:
+            use_channel_table (bool): Keep a columnar copy of the channel values.
+        """
+        self.installations: list[dict] | None = None
+        self.revision = 0
+        self.channel_table = ChannelTable() if use_channel_table else None
+        self._installations_by_unique: dict[str, dict] = {}
+        self._zones_by_number: dict[int, tuple[dict, dict]] = {}
+        self._channels_by_id: dict[str, tuple[dict, dict, dict]] = {}
+        self.mixed_circuits: dict[str, dict[int, dict]] = {}
+
+    def load(self, installations: list[dict]):
+        """Replace the stored installations and rebuild the indexes.
+
+        Args:
+            installations (list[dict]): The parsed installations.
+        """
+        self.installations = installations
+        self._installations_by_unique = {}
+        self._zones_by_number = {}
+        self._channels_by_id = {}
+        for installation in installations:
+            self._installations_by_unique[installation["unique"]] = installation
+            for group in installation["groups"]:
+                for zone in group["zones"]:
+                    # Zone numbers are looked up without an installation, the
+                    # first installation declaring a number wins.
+                    self._zones_by_number.setdefault(zone["number"], (installation, zone))
+                    for channel in zone["channels"]:
+                        self._channels_by_id[channel["id"]] = (installation, zone, channel)
+        if self.channel_table is not None:
+            self.channel_table.load(installations)
+        self.touch()
+
+    def touch(self, channel_ids: Iterable[str] | None = None):
+        """Record a change of the stored installations.
+
+        Args:
+            channel_ids (Iterable[str] | None): The channels that changed, if
+                known. The channel table then only re-reads those channels.
+        """
+        self.revision += 1
+        if self.channel_table is None:
+            return
+        if channel_ids is None:
+            self.channel_table.refresh()
+        else:
+            slots = self.channel_table.slots
+            self.channel_table.refresh([slots[channel_id] for channel_id in channel_ids if channel_id in slots])
+
+    def get_zone_channel_ids(self, zone_number: int) -> list[str]:
+        """Return the identifiers of the channels of a zone."""
+        entry = self._zones_by_number.get(zone_number)
+        if entry is None:
+            return []
+        return [channel["id"] for channel in entry[1]["channels"]]
+
+    def is_loaded(self) -> bool:
+        """Check if installations have been loaded."""
+        return self.installations is not None
+
+    def get_installation(self, unique: str) -> dict | None:
+        """Return the installation with the given unique identifier."""
+        return self._installations_by_unique.get(unique)
+
+    def get_zone(self, zone_number: int) -> tuple[dict, dict] | None:
+        """Return the installation and zone for a zone number."""
+        return self._zones_by_number.get(zone_number)
+
+    def get_installation_zone(self, unique: str, zone_number: int) -> dict | None:
+        """Return a zone of a specific installation."""
+        entry = self._zones_by_number.get(zone_number)
+        if entry is not None and entry[0]["unique"] == unique:
+            return entry[1]
+        installation = self._installations_by_unique.get(unique)
+        if installation is None:
+            return None
+        for group in installation["groups"]:
+            for zone in group["zones"]:
+                if zone["number"] == zone_number:
+                    return zone
+        return None
+
+    def get_channel(self, channel_id: str) -> tuple[dict, dict, dict] | None:
+        """Return the installation, zone and channel for a channel identifier."""
+        return self._channels_by_id.get(channel_id)
+
+    def set_mixed_circuits(self, unique: str, circuits: list[dict]) -> bool:
+        """Replace the mixed circuits of an installation if they changed.
+
+        Args:
+            unique (str): The installation unique.
+            circuits (list[dict]): The parsed mixed circuits.
+
+        Returns:
+            bool: Whether the circuits changed. Only then the revision is bumped.
+        """
+        by_number = {circuit["number"]: circuit for circuit in circuits}
+        if self.mixed_circuits.get(unique) == by_number:
+            return False
+        self.mixed_circuits[unique] = by_number
+        # The channels are unchanged, so the channel table is not re-read.
+        self.touch(())
+        return True
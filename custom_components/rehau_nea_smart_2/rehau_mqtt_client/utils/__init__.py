@@ -9,6 +9,10 @@ from .auth_url_generator import generate_auth_url
 from .referentials import get_by_value, replace_keys
 from .file_handler import save_as_json, read_from_json
 from .decompress import decompress_utf16, decode_base64, encode_base64
+from .imports import preload_transports
+from .selective_json import loads_selected
+from .adaptive_interval import AdaptiveInterval
+from .temperature import raw_to_celsius, raw_to_celsius_half, raw_to_celsius_many, celsius_to_raw
 
 
 def __init__():
@@ -0,0 +1,41 @@
+"""Polling interval that adapts to how often the polled data changes."""
+from __future__ import annotations
+
+
+class AdaptiveInterval:
+    """Halve the interval after a change, double it after an unchanged poll.
+
+    The interval stays between ``minimum`` and ``maximum`` seconds. A failed
+    poll is retried after the maximum interval. The first poll is due
+    immediately.
+    """
+
+    __slots__ = ("minimum", "maximum", "interval", "next_run")
+
+    def __init__(self, minimum: float, maximum: float):
+        """Initialize the interval at its minimum.
+
+        Args:
+            minimum (float): The shortest interval, in seconds.
+            maximum (float): The longest interval, in seconds.
+        """
+        self.minimum = minimum
+        self.maximum = maximum
+        self.interval = minimum
+        self.next_run = 0.0
+
+    def due(self, now: float) -> bool:
+        """Return whether a poll is due at a monotonic time."""
+        return now >= self.next_run
+
+    def done(self, now: float, changed: bool):
+        """Schedule the next poll after one that changed the data or not."""
+        if changed:
+            self.interval = max(self.minimum, self.interval / 2)
+        else:
+            self.interval = min(self.maximum, self.interval * 2)
+        self.next_run = now + self.interval
+
+    def failed(self, now: float):
+        """Schedule the next poll after a failed one."""
+        self.next_run = now + self.maximum
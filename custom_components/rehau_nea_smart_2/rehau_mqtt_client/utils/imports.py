@@ -0,0 +1,26 @@
+"""Helpers for loading the heavy dependencies off the event loop."""
+import importlib
+
+TRANSPORT_MODULES = (
+    "paho.mqtt.client",
+    "httpx",
+    "aiocron",
+    "pydantic",
+)
+
+# Client modules building pydantic models at import, relative to this package.
+SCHEMA_MODULES = ("..models.schema",)
+
+
+def preload_transports():
+    """Import the MQTT, HTTP, cron and validation libraries used by the client.
+
+    The client only imports these modules where they are used. Calling this
+    function from an executor beforehand keeps the import cost off the event loop.
+    The validation schema is imported as well, since building its models costs
+    more than importing pydantic.
+    """
+    for module in TRANSPORT_MODULES:
+        importlib.import_module(module)
+    for module in SCHEMA_MODULES:
+        importlib.import_module(module, __package__)
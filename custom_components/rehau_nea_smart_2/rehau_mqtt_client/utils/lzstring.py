@@ -66,32 +66,80 @@ def _compress(uncompressed, bitsPerChar, getCharFromInt):
         return ""
 
     context_dictionary = {}
-    context_c = ""
+    context_dictionaryToCreate = set()
     context_w = ""
+    context_enlargeIn = 2
+    context_dictSize = 3
+    context_numBits = 2
     context_data = []
     context_data_val = 0
     context_data_position = 0
 
+    def write_bits(value, numBits):
+        # Bits are written least significant first, as in the JavaScript implementation.
+        nonlocal context_data_val, context_data_position
+        for _ in range(numBits):
+            context_data_val = (context_data_val << 1) | (value & 1)
+            if context_data_position == bitsPerChar - 1:
+                context_data_position = 0
+                context_data.append(getCharFromInt(context_data_val))
+                context_data_val = 0
+            else:
+                context_data_position += 1
+            value >>= 1
+
+    def produce_w():
+        nonlocal context_enlargeIn, context_numBits
+        if context_w in context_dictionaryToCreate:
+            code = ord(context_w[0])
+            if code < 256:
+                write_bits(0, context_numBits)
+                write_bits(code, 8)
+            else:
+                write_bits(1, context_numBits)
+                write_bits(code, 16)
+            context_enlargeIn -= 1
+            if context_enlargeIn == 0:
+                context_enlargeIn = 2 ** context_numBits
+                context_numBits += 1
+            context_dictionaryToCreate.remove(context_w)
+        else:
+            write_bits(context_dictionary[context_w], context_numBits)
+        context_enlargeIn -= 1
+        if context_enlargeIn == 0:
+            context_enlargeIn = 2 ** context_numBits
+            context_numBits += 1
+
     for context_c in uncompressed:
         if context_c not in context_dictionary:
-            context_dictionary[context_c] = len(context_dictionary) + 1
-            context_data.append(getCharFromInt(context_dictionary[context_c]))
+            context_dictionary[context_c] = context_dictSize
+            context_dictSize += 1
+            context_dictionaryToCreate.add(context_c)
+
+        context_wc = context_w + context_c
+        if context_wc in context_dictionary:
+            context_w = context_wc
         else:
-            context_w += context_c
+            produce_w()
+            context_dictionary[context_wc] = context_dictSize
+            context_dictSize += 1
+            context_w = context_c
 
-        context_data_val = (context_data_val << bitsPerChar) | context_dictionary[context_c]
-        context_data_position += bitsPerChar
+    if context_w != "":
+        produce_w()
 
-        while context_data_position >= 8:
-            context_data.append(getCharFromInt(context_data_val & 0xFF))
-            context_data_val >>= 8
-            context_data_position -= 8
+    # Mark the end of the stream
+    write_bits(2, context_numBits)
 
     # Flush the last character
-    if context_data_position > 0:
-        context_data.append(getCharFromInt(context_data_val & ((1 << context_data_position) - 1)))
+    while True:
+        context_data_val <<= 1
+        if context_data_position == bitsPerChar - 1:
+            context_data.append(getCharFromInt(context_data_val))
+            break
+        context_data_position += 1
 
-    return ''.join(context_data)
+    return "".join(context_data)
 
 def _decompress(length, resetValue, getNextValue):
     def get_next_bits(num_bits, data, resetValue, getNextValue):
@@ -345,4 +393,4 @@ class LZString:
         result=[]
         for i in buf:
             result.append(chr(i & 0xffff))
-        return _decompress(''.join(result))
+        return LZString.decompress(''.join(result))
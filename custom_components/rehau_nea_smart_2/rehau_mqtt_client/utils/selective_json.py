@@ -0,0 +1,22 @@
+"""Field-selective JSON decoding."""
+import json
+
+
+def loads_selected(data: bytes | str, fields: frozenset[str]):
+    """Decode a JSON document keeping only the object keys listed in ``fields``.
+
+    Objects are pruned as soon as the decoder closes them, so subtrees that are
+    not listed are released while the rest of the document is still being
+    decoded and the full tree never exists in memory.
+
+    Args:
+        data (bytes | str): The JSON document.
+        fields (frozenset[str]): The object keys to keep, at any depth.
+
+    Returns:
+        Any: The decoded and pruned document.
+    """
+    return json.loads(
+        data,
+        object_pairs_hook=lambda pairs: {key: value for key, value in pairs if key in fields},
+    )
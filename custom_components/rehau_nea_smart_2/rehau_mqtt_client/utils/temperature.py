@@ -0,0 +1,116 @@
+"""Temperature conversion between the controller and Home Assistant.
+
+The controller reports and expects temperatures as integer tenths of a degree
+Fahrenheit. The conversions used by the entities are precomputed once for the
+range the controller can report, so converting a value is a tuple lookup.
+Values outside the range fall back to the formulas.
+"""
+from collections.abc import Iterable
+
+# -40 °C to 80 °C, in tenths of a degree Fahrenheit and tenths of a degree Celsius.
+RAW_MIN = -400
+RAW_MAX = 1760
+CELSIUS_TENTHS_MIN = -400
+CELSIUS_TENTHS_MAX = 800
+
+
+def _to_celsius(raw: float) -> float:
+    return round((raw / 10 - 32) / 1.8, 1)
+
+
+def _to_celsius_half(raw: float) -> float:
+    return round(2 * ((raw / 10 - 32) / 1.8)) / 2
+
+
+def _to_raw(celsius_tenths: int) -> int:
+    return round(celsius_tenths * 1.8 + 320)
+
+
+_CELSIUS = tuple(_to_celsius(raw) for raw in range(RAW_MIN, RAW_MAX + 1))
+_CELSIUS_HALF = tuple(_to_celsius_half(raw) for raw in range(RAW_MIN, RAW_MAX + 1))
+_RAW = tuple(_to_raw(tenths) for tenths in range(CELSIUS_TENTHS_MIN, CELSIUS_TENTHS_MAX + 1))
+
+
+def raw_to_celsius(raw: float) -> float:
+    """Convert tenths of a degree Fahrenheit to Celsius rounded to 0.1.
+
+    Args:
+        raw (float): The temperature reported by the controller.
+
+    Returns:
+        float: The temperature in Celsius.
+    """
+    if raw.__class__ is int and RAW_MIN <= raw <= RAW_MAX:
+        return _CELSIUS[raw - RAW_MIN]
+    return _to_celsius(raw)
+
+
+def raw_to_celsius_half(raw: float) -> float:
+    """Convert tenths of a degree Fahrenheit to Celsius rounded to 0.5.
+
+    Args:
+        raw (float): The temperature reported by the controller.
+
+    Returns:
+        float: The temperature in Celsius.
+    """
+    if raw.__class__ is int and RAW_MIN <= raw <= RAW_MAX:
+        return _CELSIUS_HALF[raw - RAW_MIN]
+    return _to_celsius_half(raw)
+
+
+def celsius_to_raw(celsius: float) -> int:
+    """Convert Celsius to the tenths of a degree Fahrenheit sent to the controller.
+
+    The Celsius value is rounded to 0.1 first. Converting the result back with
+    raw_to_celsius returns that rounded value.
+
+    Args:
+        celsius (float): The temperature in Celsius.
+
+    Returns:
+        int: The temperature in tenths of a degree Fahrenheit.
+    """
+    tenths = round(celsius * 10)
+    if CELSIUS_TENTHS_MIN <= tenths <= CELSIUS_TENTHS_MAX:
+        return _RAW[tenths - CELSIUS_TENTHS_MIN]
+    return _to_raw(tenths)
+
+
+def raw_to_celsius_many(values: Iterable[int], round_half: bool = False) -> list[float]:
+    """Convert a batch of raw temperatures to Celsius.
+
+    Args:
+        values (Iterable[int]): The temperatures reported by the controller.
+        round_half (bool): Round to 0.5 instead of 0.1.
+
+    Returns:
+        list[float]: The temperatures in Celsius.
+    """
+    table = _CELSIUS_HALF if round_half else _CELSIUS
+    fallback = _to_celsius_half if round_half else _to_celsius
+    return [
+        table[value - RAW_MIN] if RAW_MIN <= value <= RAW_MAX else fallback(value)
+        for value in values
+    ]
+
+
+def verify_round_trip():
+    """Check every Celsius value of the tables converts to raw and back unchanged.
+
+    Covers the 0.1 grid with raw_to_celsius and the 0.5 grid with
+    raw_to_celsius_half, over the whole range of the inverse table.
+
+    Raises:
+        ValueError: If a value does not survive the round trip.
+    """
+    for tenths in range(CELSIUS_TENTHS_MIN, CELSIUS_TENTHS_MAX + 1):
+        celsius = tenths / 10
+        raw = celsius_to_raw(celsius)
+        if not RAW_MIN <= raw <= RAW_MAX:
+            raise ValueError(f"{celsius} °C converts to {raw}, outside the forward table")
+        if raw_to_celsius(raw) != celsius:
+            raise ValueError(f"{celsius} °C converts to {raw} and back to {raw_to_celsius(raw)} °C")
+        if tenths % 5 == 0 and raw_to_celsius_half(raw) != celsius:
+            raise ValueError(f"{celsius} °C converts to {raw} and back to {raw_to_celsius_half(raw)} °C")
+
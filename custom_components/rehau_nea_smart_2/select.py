@@ -2,17 +2,20 @@
 
 from __future__ import annotations
 import logging
+from typing import TYPE_CHECKING
 
 from homeassistant.components.select import SelectEntity, SelectEntityDescription
 from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.helpers.entity import DeviceInfo
 
-from .rehau_mqtt_client import Installation
 from .rehau_mqtt_client.Controller import Controller
 
 from .const import DOMAIN, PRESET_OPERATING_MODES_MAPPING, PRESET_ENERGY_LEVELS_MAPPING, \
     PRESET_OPERATING_MODES_MAPPING_REVERSE, PRESET_ENERGY_LEVELS_MAPPING_REVERSE
 
+if TYPE_CHECKING:
+    from .rehau_mqtt_client import Installation
+
 _LOGGER = logging.getLogger(__name__)
 
 ENTITY_DESCRIPTIONS = (
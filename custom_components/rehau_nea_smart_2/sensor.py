@@ -2,20 +2,29 @@
 
 from __future__ import annotations
 import logging
+from typing import TYPE_CHECKING
 
-from homeassistant.components.sensor import SensorEntity, SensorEntityDescription
+from homeassistant.components.sensor import SensorDeviceClass, SensorEntity, SensorEntityDescription, SensorStateClass
+from homeassistant.core import callback
 from homeassistant.helpers.restore_state import RestoreEntity
-from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.entity import DeviceInfo, EntityCategory
+from homeassistant.util import dt as dt_util
 
 from homeassistant.const import (
+    PERCENTAGE,
     TEMPERATURE,
     UnitOfTemperature,
+    UnitOfTime,
 )
 
-from .rehau_mqtt_client import Installation, Zone
 from .rehau_mqtt_client.Controller import Controller
+from .rehau_mqtt_client.instrumentation import STAGES
+from .rehau_mqtt_client.store import DAYS, format_period
 
-from .const import DOMAIN
+from .const import DOMAIN, PRESET_ENERGY_LEVELS_MAPPING_REVERSE
+
+if TYPE_CHECKING:
+    from .rehau_mqtt_client import Installation, Zone
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -27,6 +36,157 @@ ENTITY_DESCRIPTIONS = (
     ),
 )
 
+# Derived from the zone history, the keys are the ZoneHistory methods computing them.
+ZONE_HISTORY_DESCRIPTIONS = (
+    SensorEntityDescription(
+        key="average_temperature",
+        name="Average Temperature",
+        icon="mdi:thermometer-lines",
+        device_class=SensorDeviceClass.TEMPERATURE,
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+    ),
+    SensorEntityDescription(
+        key="setpoint_deviation",
+        name="Setpoint Deviation",
+        icon="mdi:thermometer-alert",
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+    ),
+    SensorEntityDescription(
+        key="average_deviation",
+        name="Average Setpoint Deviation",
+        icon="mdi:thermometer-alert",
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+    ),
+    SensorEntityDescription(
+        key="temperature_trend",
+        name="Temperature Trend",
+        icon="mdi:chart-line",
+        native_unit_of_measurement=f"{UnitOfTemperature.CELSIUS}/h",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+    ),
+)
+
+CHANNEL_TEMPERATURE_DESCRIPTION = SensorEntityDescription(
+    key="temperature",
+    name="Temperature",
+    icon="mdi:thermometer",
+    device_class=SensorDeviceClass.TEMPERATURE,
+    native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+    state_class=SensorStateClass.MEASUREMENT,
+    suggested_display_precision=1,
+)
+
+# Only added for zones with several channels, the keys are the zone aggregate keys.
+ZONE_AGGREGATE_DESCRIPTIONS = (
+    SensorEntityDescription(
+        key="min",
+        name="Minimum Temperature",
+        icon="mdi:thermometer-low",
+        device_class=SensorDeviceClass.TEMPERATURE,
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+    ),
+    SensorEntityDescription(
+        key="max",
+        name="Maximum Temperature",
+        icon="mdi:thermometer-high",
+        device_class=SensorDeviceClass.TEMPERATURE,
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+    ),
+)
+
+# Read from the first channel of a zone, the keys are the channel table columns.
+SETPOINT_DESCRIPTIONS = tuple(
+    SensorEntityDescription(
+        key=column,
+        name=name,
+        icon=icon,
+        device_class=SensorDeviceClass.TEMPERATURE,
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=enabled,
+        suggested_display_precision=1,
+    )
+    for column, name, icon, enabled in (
+        ("heating_normal", "Heating Normal Setpoint", "mdi:sun-thermometer", True),
+        ("heating_reduced", "Heating Reduced Setpoint", "mdi:sun-thermometer-outline", True),
+        ("heating_standby", "Heating Standby Setpoint", "mdi:snowflake-thermometer", False),
+        ("cooling_normal", "Cooling Normal Setpoint", "mdi:snowflake-thermometer", False),
+        ("cooling_reduced", "Cooling Reduced Setpoint", "mdi:snowflake-thermometer", False),
+        ("setpoint_min", "Minimum Setpoint", "mdi:thermometer-chevron-down", False),
+        ("setpoint_max", "Maximum Setpoint", "mdi:thermometer-chevron-up", False),
+    )
+)
+
+ENERGY_LEVEL_DESCRIPTION = SensorEntityDescription(
+    key="energy_level",
+    name="Energy Level",
+    icon="mdi:home-thermometer-outline",
+    device_class=SensorDeviceClass.ENUM,
+    options=sorted(set(PRESET_ENERGY_LEVELS_MAPPING_REVERSE.values())),
+)
+
+PROGRAM_DESCRIPTION = SensorEntityDescription(
+    key="program",
+    name="Program",
+    icon="mdi:calendar-clock",
+    device_class=SensorDeviceClass.ENUM,
+    options=["comfort", "reduced"],
+)
+
+# Read from the polled mixed circuits, the keys are the parsed circuit keys.
+MIXED_CIRCUIT_DESCRIPTIONS = (
+    SensorEntityDescription(
+        key="flow_temperature",
+        name="Flow Temperature",
+        icon="mdi:thermometer-chevron-up",
+        device_class=SensorDeviceClass.TEMPERATURE,
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+    ),
+    SensorEntityDescription(
+        key="return_temperature",
+        name="Return Temperature",
+        icon="mdi:thermometer-chevron-down",
+        device_class=SensorDeviceClass.TEMPERATURE,
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+    ),
+    SensorEntityDescription(
+        key="valve_opening",
+        name="Valve Opening",
+        icon="mdi:valve",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+)
+
+STAGE_TIMING_DESCRIPTIONS = tuple(
+    SensorEntityDescription(
+        key=f"{stage}_timing",
+        name=f"Timing {stage.replace('_', ' ')}",
+        icon="mdi:timer-outline",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+    )
+    for stage in STAGES
+)
+
 
 async def async_setup_entry(hass, entry, async_add_devices):
     """Set up the sensor platform."""
@@ -46,8 +206,84 @@ async def async_setup_entry(hass, entry, async_add_devices):
                         )
                     )
 
+    for entity_description in ZONE_HISTORY_DESCRIPTIONS:
+        for installation in installations:
+            for group in installation.groups:
+                for zone in group.zones:
+                    devices.append(
+                        RehauNeasmart2ZoneHistorySensor(
+                            controller, zone, installation.unique, entity_description
+                        )
+                    )
+
+    for installation in installations:
+        for group in installation.groups:
+            for zone in group.zones:
+                devices.append(
+                    RehauNeasmart2ProgramSensor(controller, zone, installation.unique, PROGRAM_DESCRIPTION)
+                )
+
+    for installation in installations:
+        for group in installation.groups:
+            for zone in group.zones:
+                devices.extend(_channel_slot_sensors(controller, zone, installation.unique))
+
+    for stage, entity_description in zip(STAGES, STAGE_TIMING_DESCRIPTIONS):
+        devices.append(RehauNeasmart2StageTimingSensor(controller, stage, entity_description))
+
     async_add_devices(devices)
 
+    # The mixed circuits are only known once the first poll answered, so
+    # their sensors are added when a circuit shows up.
+    known_circuits: set[tuple[str, int]] = set()
+
+    def add_mixed_circuit_sensors():
+        circuit_devices = []
+        for installation in controller.get_installations() or ():
+            for number in controller.get_mixed_circuits(installation.unique):
+                if (installation.unique, number) in known_circuits:
+                    continue
+                known_circuits.add((installation.unique, number))
+                for entity_description in MIXED_CIRCUIT_DESCRIPTIONS:
+                    circuit_devices.append(
+                        RehauNeasmart2MixedCircuitSensor(controller, installation.unique, number, entity_description)
+                    )
+        if circuit_devices:
+            async_add_devices(circuit_devices)
+
+    add_mixed_circuit_sensors()
+    controller.register_callback(add_mixed_circuit_sensors)
+    entry.async_on_unload(lambda: controller.remove_callback(add_mixed_circuit_sensors))
+
+
+def _channel_slot_sensors(controller: Controller, zone: Zone, installation_unique: str) -> list[SensorEntity]:
+    """Create the sensors of a zone bound to channel table slots.
+
+    The setpoints and the energy level are read from the first channel.
+    Zones with several channels also get the minimum and maximum and a
+    temperature sensor per channel.
+    """
+    channel_id = zone.channels[0].id
+    devices: list[SensorEntity] = [
+        RehauNeasmart2SetpointSensor(controller, zone, installation_unique, channel_id, entity_description)
+        for entity_description in SETPOINT_DESCRIPTIONS
+    ]
+    devices.append(
+        RehauNeasmart2EnergyLevelSensor(controller, zone, installation_unique, channel_id, ENERGY_LEVEL_DESCRIPTION)
+    )
+    if len(zone.channels) < 2:
+        return devices
+
+    for entity_description in ZONE_AGGREGATE_DESCRIPTIONS:
+        devices.append(RehauNeasmart2ZoneAggregateSensor(controller, zone, installation_unique, entity_description))
+    for index, channel in enumerate(zone.channels, start=1):
+        devices.append(
+            RehauNeasmart2ChannelTemperatureSensor(
+                controller, zone, installation_unique, channel.id, index, CHANNEL_TEMPERATURE_DESCRIPTION
+            )
+        )
+    return devices
+
 
 class RehauNeasmartGenericSensor(SensorEntity, RestoreEntity):
     """Generic sensor class for Rehau Neasmart."""
@@ -64,7 +300,7 @@ class RehauNeasmartGenericSensor(SensorEntity, RestoreEntity):
         self._zone_number = zone.number
         self._name = zone.name
         self._installation_unique = installation_unique
-        self._state = round((zone.channels[0].current_temperature / 10 - 32) / 1.8, 1)
+        self._state = controller.get_temperature(zone.number, installation_unique=installation_unique)
 
     async def async_added_to_hass(self) -> None:
         """Run when this Entity has been added to HA."""
@@ -117,4 +353,330 @@ class RehauNeasmart2TemperatureSensor(RehauNeasmartGenericSensor):
     @property
     def state(self):
         """Return the state of the sensor."""
-        return self._controller.get_temperature(self._zone_number)
+        return self._controller.get_temperature(self._zone_number, installation_unique=self._installation_unique)
+
+
+class RehauNeasmart2ZoneHistorySensor(RehauNeasmartGenericSensor):
+    """Sensor derived from the recorded history of a zone.
+
+    The values are running aggregates kept by the zone history, so reading
+    them on every state write costs the same for any history length.
+    """
+
+    def __init__(
+            self,
+            controller: Controller,
+            zone: Zone,
+            installation_unique: str,
+            entity_description: SensorEntityDescription,
+    ):
+        """Initialize the zone history sensor."""
+        super().__init__(controller, zone, installation_unique)
+        self._attr_unique_id = f"{self._id}_{entity_description.key}"
+        self._attr_name = f"{self._name} {entity_description.name}"
+        self.entity_description = entity_description
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the aggregate of the zone history."""
+        history = self._controller.get_zone_history(self._zone_number, self._installation_unique)
+        if history is None:
+            return None
+        return getattr(history, self.entity_description.key)()
+
+
+class RehauNeasmart2ZoneAggregateSensor(RehauNeasmartGenericSensor):
+    """Sensor reporting the minimum or maximum temperature over the channels of a zone.
+
+    The mean is the zone temperature sensor. The aggregates are maintained
+    by the channel table as the channels change.
+    """
+
+    def __init__(
+            self,
+            controller: Controller,
+            zone: Zone,
+            installation_unique: str,
+            entity_description: SensorEntityDescription,
+    ):
+        """Initialize the zone aggregate sensor."""
+        super().__init__(controller, zone, installation_unique)
+        self._attr_unique_id = f"{self._id}_{entity_description.key}_temperature"
+        self._attr_name = f"{self._name} {entity_description.name}"
+        self.entity_description = entity_description
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the aggregate of the zone."""
+        aggregate = self._controller.get_zone_aggregate(self._zone_number, self._installation_unique, "current_temperature")
+        if aggregate is None:
+            return None
+        return aggregate[self.entity_description.key]
+
+
+class RehauNeasmart2ChannelSlotSensor(RehauNeasmartGenericSensor):
+    """Sensor bound to the channel table slot of one channel.
+
+    The state is only written when the version of the slot or the
+    connection of the installation changed, not on every update of the
+    store.
+    """
+
+    def __init__(self, controller: Controller, zone: Zone, installation_unique: str, channel_id: str):
+        """Initialize the channel slot sensor."""
+        super().__init__(controller, zone, installation_unique)
+        self._channel_id = channel_id
+        self._seen = None
+
+    async def async_added_to_hass(self) -> None:
+        """Run when this Entity has been added to HA."""
+        self._controller.register_callback(self._async_slot_changed)
+
+    async def async_will_remove_from_hass(self):
+        """Run when this Entity will be removed from HA."""
+        self._controller.remove_callback(self._async_slot_changed)
+
+    @callback
+    def _async_slot_changed(self):
+        seen = (
+            self._controller.get_channel_version(self._channel_id),
+            self._controller.is_connected(self._installation_unique),
+        )
+        if seen == self._seen:
+            return
+        self._seen = seen
+        self.async_write_ha_state()
+
+
+class RehauNeasmart2SetpointSensor(RehauNeasmart2ChannelSlotSensor):
+    """Sensor reporting one configured setpoint of a zone."""
+
+    def __init__(
+            self,
+            controller: Controller,
+            zone: Zone,
+            installation_unique: str,
+            channel_id: str,
+            entity_description: SensorEntityDescription,
+    ):
+        """Initialize the setpoint sensor."""
+        super().__init__(controller, zone, installation_unique, channel_id)
+        self._attr_unique_id = f"{self._id}_{entity_description.key}"
+        self._attr_name = f"{self._name} {entity_description.name}"
+        self.entity_description = entity_description
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the setpoint of the zone."""
+        return self._controller.get_channel_celsius(self._channel_id, self.entity_description.key)
+
+
+class RehauNeasmart2EnergyLevelSensor(RehauNeasmart2ChannelSlotSensor):
+    """Sensor reporting the energy level of a zone by its preset name."""
+
+    def __init__(
+            self,
+            controller: Controller,
+            zone: Zone,
+            installation_unique: str,
+            channel_id: str,
+            entity_description: SensorEntityDescription,
+    ):
+        """Initialize the energy level sensor."""
+        super().__init__(controller, zone, installation_unique, channel_id)
+        self._attr_unique_id = f"{self._id}_{entity_description.key}"
+        self._attr_name = f"{self._name} {entity_description.name}"
+        self.entity_description = entity_description
+
+    @property
+    def native_value(self) -> str | None:
+        """Return the preset name of the energy level."""
+        energy_level = self._controller.get_channel_state(self._channel_id, "energy_level")
+        return PRESET_ENERGY_LEVELS_MAPPING_REVERSE.get(energy_level)
+
+
+class RehauNeasmart2ChannelTemperatureSensor(RehauNeasmart2ChannelSlotSensor):
+    """Sensor reporting the temperature of one channel of a zone with several channels."""
+
+    def __init__(
+            self,
+            controller: Controller,
+            zone: Zone,
+            installation_unique: str,
+            channel_id: str,
+            index: int,
+            entity_description: SensorEntityDescription,
+    ):
+        """Initialize the channel temperature sensor."""
+        super().__init__(controller, zone, installation_unique, channel_id)
+        self._attr_unique_id = f"{channel_id}_{entity_description.key}"
+        self._attr_name = f"{self._name} Channel {index} {entity_description.name}"
+        self.entity_description = entity_description
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the temperature of the channel."""
+        return self._controller.get_channel_celsius(self._channel_id, "current_temperature")
+
+
+class RehauNeasmart2ProgramSensor(RehauNeasmartGenericSensor):
+    """Sensor reporting the period of the cached weekly program of a zone.
+
+    The state is ``comfort`` inside a comfort period and ``reduced`` outside
+    of them, unknown without a program. The periods of every day, the
+    program name and the next switch are attributes. The state depends on
+    the time of day, so the sensor polls.
+    """
+
+    should_poll = True
+
+    def __init__(
+            self,
+            controller: Controller,
+            zone: Zone,
+            installation_unique: str,
+            entity_description: SensorEntityDescription,
+    ):
+        """Initialize the program sensor."""
+        super().__init__(controller, zone, installation_unique)
+        self._attr_unique_id = f"{self._id}_{entity_description.key}"
+        self._attr_name = f"{self._name} {entity_description.name}"
+        self.entity_description = entity_description
+
+    @property
+    def native_value(self) -> str | None:
+        """Return the program period of the zone now."""
+        if not self._controller.get_zone_program(self._zone_number, self._installation_unique):
+            return None
+        period = self._controller.get_zone_comfort_period(self._zone_number, self._installation_unique, dt_util.now())
+        return "comfort" if period is not None else "reduced"
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Return the periods of every day and the next switch."""
+        program = self._controller.get_zone_program(self._zone_number, self._installation_unique)
+        next_change = self._controller.get_zone_program_next_change(
+            self._zone_number, self._installation_unique, dt_util.now()
+        )
+        return {
+            "program_name": self._controller.get_zone_program_name(self._zone_number, self._installation_unique),
+            **{day: [format_period(period) for period in program.get(index, ())] for index, day in enumerate(DAYS)},
+            "next_change": f"{DAYS[next_change[0]]} {next_change[1] // 60:02d}:{next_change[1] % 60:02d}"
+            if next_change is not None else None,
+        }
+
+
+class RehauNeasmart2MixedCircuitSensor(SensorEntity):
+    """Sensor reporting one value of a mixed circuit.
+
+    The values come from the batched mixed circuit poll, whose interval
+    grows while the circuits do not change.
+    """
+
+    _attr_has_entity_name = False
+    should_poll = False
+
+    def __init__(
+            self,
+            controller: Controller,
+            installation_unique: str,
+            number: int,
+            entity_description: SensorEntityDescription,
+    ):
+        """Initialize the mixed circuit sensor."""
+        self._controller = controller
+        self._installation_unique = installation_unique
+        self._number = number
+        circuit = controller.get_mixed_circuits(installation_unique).get(number, {})
+        self._attr_unique_id = f"{installation_unique}_mixed_circuit_{number}_{entity_description.key}"
+        self._attr_name = f"{circuit.get('name') or f'Mixed Circuit {number}'} {entity_description.name}"
+        self.entity_description = entity_description
+
+    async def async_added_to_hass(self) -> None:
+        """Run when this Entity has been added to HA."""
+        self._controller.register_callback(self.async_write_ha_state)
+
+    async def async_will_remove_from_hass(self):
+        """Run when this Entity will be removed from HA."""
+        self._controller.remove_callback(self.async_write_ha_state)
+
+    @property
+    def device_info(self):
+        """Return device information for the sensor."""
+        return DeviceInfo(
+            identifiers={(DOMAIN, self._controller.id)},
+            name=self._controller.name,
+            manufacturer=self._controller.manufacturer,
+            model=self._controller.model,
+        )
+
+    @property
+    def available(self) -> bool:
+        """Return True while the circuit is reported by the installation."""
+        return (
+            self._controller.is_connected(self._installation_unique)
+            and self._number in self._controller.get_mixed_circuits(self._installation_unique)
+        )
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the value of the mixed circuit."""
+        circuit = self._controller.get_mixed_circuits(self._installation_unique).get(self._number)
+        if circuit is None:
+            return None
+        return circuit[self.entity_description.key]
+
+
+class RehauNeasmart2StageTimingSensor(SensorEntity):
+    """Diagnostic sensor reporting the rolling timing of one client stage.
+
+    The state is the p95 duration in milliseconds, the p50, max, last
+    duration and the number of timed runs are attributes. The sensor polls
+    the timings so it does not add work to the update callbacks it measures.
+    """
+
+    _attr_has_entity_name = False
+    should_poll = True
+
+    def __init__(
+            self,
+            controller: Controller,
+            stage: str,
+            entity_description: SensorEntityDescription,
+    ):
+        """Initialize the stage timing sensor."""
+        self._controller = controller
+        self._stage = stage
+        self._attr_unique_id = f"{controller.id}_{entity_description.key}"
+        self._attr_name = entity_description.name
+        self.entity_description = entity_description
+        self._summary = controller.get_stage_timing(stage)
+
+    async def async_update(self) -> None:
+        """Read the current timing of the stage."""
+        self._summary = self._controller.get_stage_timing(self._stage)
+
+    @property
+    def device_info(self):
+        """Return device information for the sensor."""
+        return DeviceInfo(
+            identifiers={(DOMAIN, self._controller.id)},
+            name=self._controller.name,
+            manufacturer=self._controller.manufacturer,
+            model=self._controller.model,
+        )
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the rolling p95 duration of the stage."""
+        return self._summary["p95"]
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Return the remaining statistics of the stage."""
+        return {
+            "p50": self._summary["p50"],
+            "max": self._summary["max"],
+            "last": self._summary["last"],
+            "count": self._summary["count"],
+        }
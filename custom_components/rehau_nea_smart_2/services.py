@@ -0,0 +1,176 @@
+"""Services for rehau_nea_smart_2."""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+
+import voluptuous as vol
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse, callback
+from homeassistant.exceptions import HomeAssistantError
+import homeassistant.helpers.config_validation as cv
+
+from .const import DOMAIN, LOGGER, PRESET_ENERGY_LEVELS_MAPPING
+from .rehau_mqtt_client.Controller import Controller
+from .rehau_mqtt_client.exceptions import MqttClientError
+from .rehau_mqtt_client.instrumentation import write_profile
+
+SERVICE_PROFILE = "profile"
+SERVICE_CAPTURE = "capture"
+SERVICE_SET_ZONES = "set_zones"
+
+ATTR_SECONDS = "seconds"
+ATTR_ZONES = "zones"
+ATTR_ZONE = "zone"
+ATTR_TEMPERATURE = "temperature"
+ATTR_PRESET = "preset"
+ATTR_CONTROLLER = "controller"
+ATTR_INSTALLATION = "installation"
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_SECONDS, default=60): vol.All(cv.positive_int, vol.Range(min=1, max=3600)),
+    }
+)
+
+CAPTURE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_SECONDS, default=600): vol.All(cv.positive_int, vol.Range(min=1, max=86400)),
+    }
+)
+
+SET_ZONES_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ZONES): vol.All(
+            cv.ensure_list,
+            [
+                vol.All(
+                    {
+                        vol.Required(ATTR_ZONE): vol.Coerce(int),
+                        vol.Optional(ATTR_TEMPERATURE): vol.Coerce(float),
+                        vol.Optional(ATTR_PRESET): vol.In(list(PRESET_ENERGY_LEVELS_MAPPING)),
+                        vol.Optional(ATTR_CONTROLLER, default=0): vol.Coerce(int),
+                        vol.Optional(ATTR_INSTALLATION): cv.string,
+                    },
+                    cv.has_at_least_one_key(ATTR_TEMPERATURE, ATTR_PRESET),
+                )
+            ],
+        ),
+    }
+)
+
+
+def _knows_zone(controller: Controller, change: dict) -> bool:
+    store = controller.mqtt_client.store
+    if change["installation"] is None:
+        return store.get_zone(change["zone"]) is not None
+    return store.get_installation_zone(change["installation"], change["zone"]) is not None
+
+
+def _controllers(hass: HomeAssistant) -> dict[str, Controller]:
+    return {
+        entry_id: controller
+        for entry_id, controller in hass.data.get(DOMAIN, {}).items()
+        if isinstance(controller, Controller) and controller.mqtt_client is not None
+    }
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration services once for all entries."""
+    if hass.services.has_service(DOMAIN, SERVICE_PROFILE):
+        return
+
+    async def async_profile(call: ServiceCall) -> None:
+        """Profile the message, polling and state update paths for a while."""
+        controllers = _controllers(hass)
+        if not controllers:
+            raise HomeAssistantError("No Rehau Nea Smart 2.0 entry is loaded")
+        if any(controller.mqtt_client.profiler.active for controller in controllers.values()):
+            raise HomeAssistantError("A profile is already being captured")
+
+        seconds = call.data[ATTR_SECONDS]
+        LOGGER.warning("Profiling the message and polling paths for %s seconds", seconds)
+        for controller in controllers.values():
+            controller.start_profiling()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            profiles = {entry_id: controller.stop_profiling() for entry_id, controller in controllers.items()}
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        for entry_id, profile in profiles.items():
+            if profile is None:
+                continue
+            base = hass.config.path(f"{DOMAIN}_profile_{entry_id}_{timestamp}")
+            await hass.async_add_executor_job(write_profile, profile, f"{base}.prof", f"{base}.txt")
+            LOGGER.warning("Wrote profile to %s.prof and its summary to %s.txt", base, base)
+
+    async def async_capture(call: ServiceCall) -> None:
+        """Capture the inbound traffic for a while."""
+        controllers = _controllers(hass)
+        if not controllers:
+            raise HomeAssistantError("No Rehau Nea Smart 2.0 entry is loaded")
+        if any(controller.mqtt_client.recorder is not None for controller in controllers.values()):
+            raise HomeAssistantError("A capture is already running")
+
+        seconds = call.data[ATTR_SECONDS]
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        paths = {}
+        for entry_id, controller in controllers.items():
+            paths[entry_id] = hass.config.path(f"{DOMAIN}_capture_{entry_id}_{timestamp}.jsonl.gz")
+            controller.start_capture(paths[entry_id])
+        LOGGER.warning("Capturing the MQTT and HTTP traffic for %s seconds", seconds)
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            recorders = {entry_id: controller.stop_capture() for entry_id, controller in controllers.items()}
+
+        for entry_id, recorder in recorders.items():
+            if recorder is None:
+                continue
+            await hass.async_add_executor_job(recorder.close)
+            LOGGER.warning("Wrote %s captured messages to %s", recorder.records, paths[entry_id])
+
+    async def async_set_zones(call: ServiceCall) -> ServiceResponse:
+        """Set the temperature and preset of many zones with as few messages as possible."""
+        controllers = _controllers(hass)
+        if not controllers:
+            raise HomeAssistantError("No Rehau Nea Smart 2.0 entry is loaded")
+
+        remaining = [
+            {
+                "zone": change[ATTR_ZONE],
+                "temperature": change.get(ATTR_TEMPERATURE),
+                "mode": PRESET_ENERGY_LEVELS_MAPPING[change[ATTR_PRESET]] if ATTR_PRESET in change else None,
+                "controller": change[ATTR_CONTROLLER],
+                "installation": change.get(ATTR_INSTALLATION),
+            }
+            for change in call.data[ATTR_ZONES]
+        ]
+        response = {"messages": 0, "sent": [], "failed": [], "unchanged": [], "unknown": []}
+        for controller in controllers.values():
+            changes = [change for change in remaining if _knows_zone(controller, change)]
+            if not changes:
+                continue
+            remaining = [change for change in remaining if not _knows_zone(controller, change)]
+            try:
+                result = controller.set_zones(changes)
+            except MqttClientError as e:
+                raise HomeAssistantError(f"Could not set the zones: {e}") from e
+            response["messages"] += result["messages"]
+            response["sent"].extend(result["sent"])
+            response["failed"].extend(result["failed"])
+            response["unchanged"].extend(result["unchanged"])
+        response["unknown"] = [change["zone"] for change in remaining]
+        LOGGER.debug("Set %s zones with %s messages", len(response["sent"]), response["messages"])
+        return response
+
+    hass.services.async_register(DOMAIN, SERVICE_PROFILE, async_profile, schema=PROFILE_SCHEMA)
+    hass.services.async_register(DOMAIN, SERVICE_CAPTURE, async_capture, schema=CAPTURE_SCHEMA)
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_ZONES,
+        async_set_zones,
+        schema=SET_ZONES_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
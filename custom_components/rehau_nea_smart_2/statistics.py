@@ -0,0 +1,148 @@
+"""Import of the controller statistics into the Home Assistant long-term statistics."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from homeassistant.const import PERCENTAGE, UnitOfTemperature
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import slugify
+
+from .const import DOMAIN, LOGGER
+from .rehau_mqtt_client.Controller import Controller
+from .rehau_mqtt_client.exceptions import MqttClientError
+
+STATISTICS_INTERVAL = timedelta(hours=1)
+
+# How far back the first import of an installation reaches.
+INITIAL_HISTORY = timedelta(days=30)
+
+STORAGE_VERSION = 1
+
+HOUR = 3600
+
+# The bucket values imported as statistics, with their unit and name suffix.
+STATISTICS = {
+    "temperature": (UnitOfTemperature.CELSIUS, "temperature"),
+    "setpoint": (UnitOfTemperature.CELSIUS, "setpoint"),
+    "demand": (PERCENTAGE, "demand"),
+}
+
+
+def aggregate_hours(buckets: list[dict], after: float, before: float) -> dict[tuple[int, float], dict[str, list[float]]]:
+    """Group the buckets of an installation by zone and hour.
+
+    Args:
+        buckets (list[dict]): The buckets from ``Controller.read_statistics``.
+        after (float): Skip the hours starting at or before this UNIX timestamp.
+        before (float): Skip the hours ending after this UNIX timestamp.
+
+    Returns:
+        dict[tuple[int, float], dict[str, list[float]]]: The values of every
+            statistic, by zone number and hour start.
+    """
+    hours: dict[tuple[int, float], dict[str, list[float]]] = {}
+    for bucket in buckets:
+        hour = bucket["start"] - bucket["start"] % HOUR
+        if hour <= after or hour + HOUR > before:
+            continue
+        values = hours.setdefault((bucket["zone"], hour), {key: [] for key in STATISTICS})
+        for key in STATISTICS:
+            if bucket[key] is not None:
+                values[key].append(bucket[key])
+    return hours
+
+
+class RehauStatisticsImporter:
+    """Import the hourly statistics of every installation of an entry.
+
+    The start of the last imported hour of every installation is persisted
+    as its high-water mark. Each run requests the statistics after it only,
+    imports the complete hours and advances the mark, so history is never
+    requested or written twice.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, controller: Controller):
+        """Initialize the importer.
+
+        Args:
+            hass (HomeAssistant): The Home Assistant instance.
+            entry_id (str): The config entry the statistics belong to.
+            controller (Controller): The controller of the entry.
+        """
+        self.hass = hass
+        self.controller = controller
+        self.store: Store[dict[str, dict[str, float]]] = Store(hass, STORAGE_VERSION, f"{DOMAIN}.statistics.{entry_id}")
+        self.high_water: dict[str, float] = {}
+
+    async def async_load(self):
+        """Load the persisted high-water marks."""
+        data = await self.store.async_load()
+        self.high_water = dict(data["installations"]) if data else {}
+
+    async def async_import(self, now: datetime | None = None) -> int:
+        """Import the new complete hours of every installation.
+
+        Args:
+            now (datetime | None): The time of the run, passed by the time tracker.
+
+        Returns:
+            int: The number of imported hours, summed over the zones.
+        """
+        if "recorder" not in self.hass.config.components:
+            LOGGER.debug("The recorder is not loaded, skipping the statistics import")
+            return 0
+
+        end = (now or datetime.now(timezone.utc)).timestamp()
+        imported = 0
+        for installation in self.controller.get_installations() or ():
+            after = self.high_water.get(installation.unique, end - INITIAL_HISTORY.total_seconds() - HOUR)
+            try:
+                buckets = await self.controller.read_statistics(installation.unique, after + HOUR, end)
+            except MqttClientError as e:
+                LOGGER.warning("Could not read the statistics of %s: %s", installation.unique, e)
+                continue
+
+            hours = aggregate_hours(buckets, after, end)
+            if not hours:
+                continue
+            zone_names = {zone.number: zone.name for group in installation.groups for zone in group.zones}
+            self._add_statistics(installation.unique, zone_names, hours)
+            imported += len(hours)
+            self.high_water[installation.unique] = max(hour for _, hour in hours)
+
+        if imported:
+            await self.store.async_save({"installations": self.high_water})
+            LOGGER.debug("Imported %d hours of statistics", imported)
+        return imported
+
+    def _add_statistics(self, unique: str, zone_names: dict[int, str], hours: dict[tuple[int, float], dict[str, list[float]]]):
+        # The recorder is an after dependency, it is only imported once it is loaded.
+        from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+        from homeassistant.components.recorder.statistics import async_add_external_statistics
+
+        series: dict[tuple[int, str], list[StatisticData]] = {}
+        for (zone, hour), values in sorted(hours.items(), key=lambda item: item[0][1]):
+            for key, samples in values.items():
+                if not samples:
+                    continue
+                series.setdefault((zone, key), []).append(
+                    StatisticData(
+                        start=datetime.fromtimestamp(hour, timezone.utc),
+                        mean=sum(samples) / len(samples),
+                        min=min(samples),
+                        max=max(samples),
+                    )
+                )
+
+        for (zone, key), statistics in series.items():
+            unit, suffix = STATISTICS[key]
+            metadata = StatisticMetaData(
+                has_mean=True,
+                has_sum=False,
+                name=f"{zone_names.get(zone, f'Zone {zone}')} {suffix}",
+                source=DOMAIN,
+                statistic_id=f"{DOMAIN}:{slugify(f'{unique}_zone_{zone}_{suffix}')}",
+                unit_of_measurement=unit,
+            )
+            async_add_external_statistics(self.hass, metadata, statistics)
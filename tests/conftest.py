@@ -0,0 +1,31 @@
+"""Shared fixtures for the tests of the MQTT client package.
+
+The client package is imported as a top-level package like the benchmarks do,
+so the tests run without a Home Assistant installation. The synthetic payloads
+of the benchmarks are reused to build installations.
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "benchmarks"))
+
+from _common import use_client_package  # noqa: E402
+
+use_client_package()
+
+from rehau_mqtt_client.Controller import Controller  # noqa: E402
+from rehau_mqtt_client.MqttClient import MqttClient  # noqa: E402
+
+
+@pytest.fixture
+def make_controller():
+    """Return a factory for a controller whose store holds the given parsed installations."""
+    def factory(installations, use_channel_table=True):
+        controller = Controller(None, "user@example.com", "password")
+        controller.mqtt_client = MqttClient(None, "user@example.com", "password", use_channel_table=use_channel_table)
+        controller.mqtt_client.store.load(installations)
+        return controller
+
+    return factory
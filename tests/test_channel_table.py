@@ -0,0 +1,156 @@
+"""Tests for the channel table and its zone aggregates."""
+import random
+
+import pytest
+from synthetic import make_installation
+
+from rehau_mqtt_client.handlers import parse_installations
+from rehau_mqtt_client.store.channel_table import ChannelTable
+from rehau_mqtt_client.utils import raw_to_celsius
+
+
+def make_installations(sites=2, groups=1, zones=2, channels=3, seed=0):
+    """Parse installations that all use the zone numbers 0 to groups * zones - 1."""
+    rng = random.Random(seed)
+    return parse_installations([make_installation(rng, site, groups, zones, channels) for site in range(sites)], None)
+
+
+def zone_channels(installation, zone_number):
+    """Return the channels of a zone of an installation."""
+    return next(
+        zone["channels"] for group in installation["groups"] for zone in group["zones"] if zone["number"] == zone_number
+    )
+
+
+def expected_aggregate(channels, column="current_temperature"):
+    """Aggregate the channels the slow way."""
+    values = [channel[column] for channel in channels]
+    return {
+        "mean": raw_to_celsius(sum(values) / len(values)),
+        "min": raw_to_celsius(min(values)),
+        "max": raw_to_celsius(max(values)),
+    }
+
+
+@pytest.mark.parametrize("use_channel_table", [True, False])
+def test_zones_sharing_a_number_are_kept_apart(make_controller, use_channel_table):
+    """Zones with the same number in two installations report their own values."""
+    installations = make_installations()
+    controller = make_controller(installations, use_channel_table)
+
+    for installation in installations:
+        unique = installation["unique"]
+        for zone_number in (0, 1):
+            channels = zone_channels(installation, zone_number)
+            assert controller.get_zone_aggregate(zone_number, unique, "current_temperature") == expected_aggregate(channels)
+            assert controller.get_zone_celsius(zone_number, unique, "setpoint_min") == raw_to_celsius(channels[0]["setpoints"]["min"])
+            assert controller.get_temperature(zone_number, installation_unique=unique) == expected_aggregate(channels)["mean"]
+
+
+@pytest.mark.parametrize("use_channel_table", [True, False])
+def test_zone_states_are_read_per_installation(make_controller, use_channel_table):
+    """The energy level and operating mode of a zone come from its own installation."""
+    installations = make_installations()
+    for index, installation in enumerate(installations):
+        for channel in zone_channels(installation, 0):
+            channel["energy_level"] = index
+            channel["operating_mode"] = index + 1
+    controller = make_controller(installations, use_channel_table)
+
+    for index, installation in enumerate(installations):
+        assert controller.get_zone_state(0, installation["unique"], "energy_level") == index
+        assert controller.get_zone_state(0, installation["unique"], "operating_mode") == index + 1
+    assert controller.get_zone_state(0, "NEA99999999", "energy_level") is None
+
+
+def test_aggregates_follow_channel_updates():
+    """The running aggregates match a full recomputation after random channel updates."""
+    installations = make_installations(sites=2, zones=3, channels=4, seed=1)
+    table = ChannelTable()
+    table.load(installations)
+    table.refresh()
+    channels = [
+        (installation, channel)
+        for installation in installations
+        for group in installation["groups"]
+        for zone in group["zones"]
+        for channel in zone["channels"]
+    ]
+    rng = random.Random(2)
+    for _ in range(500):
+        _, channel = rng.choice(channels)
+        channel["current_temperature"] = rng.randint(600, 760)
+        table.refresh([table.slots[channel["id"]]])
+
+    for installation in installations:
+        for zone_number in range(3):
+            expected = expected_aggregate(zone_channels(installation, zone_number))
+            assert table.zone_aggregate(zone_number, installation["unique"], "current_temperature") == expected
+            assert table.zone_current_temperature[(installation["unique"], zone_number)] == expected["mean"]
+
+
+def test_only_changed_slots_get_a_new_version():
+    """A refresh only bumps the version of the slots whose values changed."""
+    installations = make_installations(sites=1)
+    table = ChannelTable()
+    table.load(installations)
+    table.refresh()
+    first, second = zone_channels(installations[0], 0)[:2]
+    versions = (table.channel_version(first["id"]), table.channel_version(second["id"]))
+
+    first["target_temperature"] += 9
+    table.refresh()
+
+    assert table.channel_version(first["id"]) > versions[0]
+    assert table.channel_version(second["id"]) == versions[1]
+
+
+def test_reloading_the_same_installations_keeps_the_versions():
+    """Reloading unchanged installations, as every poll does, does not move any version."""
+    table = ChannelTable()
+    table.load(make_installations())
+    table.refresh()
+    versions = list(table.versions)
+
+    installations = make_installations()
+    table.load(installations)
+    table.refresh()
+    assert list(table.versions) == versions
+
+    channel = zone_channels(installations[1], 1)[0]
+    channel["current_temperature"] += 9
+    table.load(installations)
+    table.refresh()
+    changed = [slot for slot, version in enumerate(table.versions) if version != versions[slot]]
+    assert changed == [table.slots[channel["id"]]]
+    assert table.zone_aggregate(1, installations[1]["unique"], "current_temperature") == expected_aggregate(
+        zone_channels(installations[1], 1)
+    )
+
+
+def test_a_new_layout_resets_the_slots():
+    """Loading installations with other channels converts every slot again."""
+    table = ChannelTable()
+    table.load(make_installations(sites=1))
+    table.refresh()
+
+    installations = make_installations(sites=2)
+    table.load(installations)
+    table.refresh()
+
+    assert len(table) == len(table.versions) == 12
+    assert all(version == table.change_count for version in table.versions)
+    for installation in installations:
+        assert table.zone_aggregate(0, installation["unique"], "current_temperature") == expected_aggregate(
+            zone_channels(installation, 0)
+        )
+
+
+def test_unknown_zone():
+    """Unknown zones and installations read as None."""
+    table = ChannelTable()
+    table.load(make_installations(sites=1))
+    table.refresh()
+
+    assert table.zone_value(0, "NEA99999999", "current_temperature") is None
+    assert table.zone_aggregate(9, "NEA00000000", "current_temperature") is None
@@ -0,0 +1,81 @@
+"""Tests for the dispatch of the inbound messages."""
+import asyncio
+import json
+
+from rehau_mqtt_client.exceptions import MqttClientError
+from rehau_mqtt_client.handlers import MessageDispatcher, TopicRouter
+from rehau_mqtt_client.MqttClient import MqttClient
+from rehau_mqtt_client.utils import ClientTopics
+
+TOPIC = "client/user@example.com"
+
+
+def make_dispatcher(router=None):
+    """Return a dispatcher recording the handled messages, and its client."""
+    dispatcher = MessageDispatcher(router=router)
+    handled = []
+
+    async def handle(message, client):
+        handled.append(message)
+
+    async def fail(message, client):
+        raise MqttClientError("rejected")
+
+    dispatcher.register("update", handle, required=(("data", "value"),))
+    dispatcher.register("rejected", fail)
+    return dispatcher, handled, MqttClient(None, "user@example.com", "password")
+
+
+def dispatch(dispatcher, client, payload, topic=TOPIC):
+    """Dispatch one payload."""
+    asyncio.run(dispatcher.dispatch(topic, payload, client))
+
+
+def test_results_are_counted_by_type():
+    """Handled, unhandled, invalid and failed messages are counted per type."""
+    dispatcher, handled, client = make_dispatcher()
+    message = {"type": "update", "data": {"value": 1}}
+    dispatch(dispatcher, client, json.dumps(message))
+    dispatch(dispatcher, client, json.dumps(message).encode())
+    dispatch(dispatcher, client, json.dumps({"type": "update", "data": {}}))
+    dispatch(dispatcher, client, '{"type": "update", "data": ')
+    dispatch(dispatcher, client, json.dumps({"type": "other"}))
+    dispatch(dispatcher, client, json.dumps({"type": "rejected"}))
+    dispatch(dispatcher, client, "[]")
+
+    assert handled == [message, message]
+    assert dispatcher.summary() == {
+        "update": {"handled": 2, "invalid": 1},
+        "unknown": {"invalid": 1, "unhandled": 1},
+        "other": {"unhandled": 1},
+        "rejected": {"failed": 1},
+    }
+
+
+def test_nested_type_before_the_top_level_one():
+    """A nested type member does not hide the routed top-level type."""
+    dispatcher, handled, client = make_dispatcher()
+    payload = '{"data": {"type": "other", "value": 2}, "type": "update"}'
+    dispatch(dispatcher, client, payload)
+
+    assert handled == [json.loads(payload)]
+
+
+def test_topic_routes_win_over_generic_ones():
+    """A route registered for a topic template is used for the topics expanded from it."""
+    router = TopicRouter()
+    router.update("user@example.com", ["NEA00000000"], "NEA00000000")
+    dispatcher, handled, client = make_dispatcher(router)
+    realtime = []
+
+    async def handle_realtime(message, client):
+        realtime.append(message)
+
+    dispatcher.register("update", handle_realtime, topic=ClientTopics.LISTEN_TO_CONTROLLER.value)
+    message = json.dumps({"type": "update", "data": {"value": 3}})
+    dispatch(dispatcher, client, message, "client/NEA00000000/realtime")
+    dispatch(dispatcher, client, message)
+
+    assert len(realtime) == 1
+    assert len(handled) == 1
+
@@ -0,0 +1,136 @@
+"""Tests for the error log index and its incremental fetch."""
+import asyncio
+import sys
+
+from rehau_mqtt_client.MqttClient import ERROR_PAGE_SIZE, MqttClient
+from rehau_mqtt_client.store.faults import MAX_ERRORS, FaultIndex
+
+UNIQUE = "NEA00000000"
+
+
+def make_error(number, active=False, zone=None, code="E1"):
+    """Build a parsed error logged at second ``number``."""
+    return {"id": f"error-{number}", "code": code, "zone": zone, "timestamp": float(number), "active": active}
+
+
+class FakeLog:
+    """Server side error log answering the paged searches, newest first."""
+
+    def __init__(self, errors):
+        """Initialize the log with the given errors."""
+        self.errors = {error["id"]: error for error in errors}
+        self.requests = []
+
+    async def request(self, topic, data, installation, response):
+        """Return one page of the errors changed since ``data["since"]``."""
+        self.requests.append(data)
+        errors = sorted(
+            (dict(error) for error in self.errors.values() if error["timestamp"] * 1000 >= data["since"]),
+            key=lambda error: error["timestamp"],
+            reverse=True,
+        )
+        return errors[data["page"] * data["limit"]:(data["page"] + 1) * data["limit"]]
+
+
+def make_client(log):
+    """Return a client reading the error log from ``log``."""
+    client = MqttClient(None, "user@example.com", "password")
+    client.request = log.request
+    return client
+
+
+def test_index_by_code_and_zone():
+    """Errors are indexed by code and zone and only active ones are faults."""
+    index = FaultIndex()
+    changed = index.add([make_error(1, True, 2, "E1"), make_error(2, True, None, "E2"), make_error(3, False, 2, "E1")])
+
+    assert changed == ["error-1", "error-2", "error-3"]
+    assert index.count_by_code() == {"E1": 2, "E2": 1}
+    assert index.active_faults() == [("E2", None, 2.0), ("E1", 2, 1.0)]
+    assert index.active_faults(zone=2) == [("E1", 2, 1.0)]
+    assert index.add([make_error(1, True, 2, "E1")]) == []
+    assert index.add([make_error(1, False, 2, "E1")]) == ["error-1"]
+    assert index.active_faults(zone=2) == []
+
+
+def test_eviction_keeps_active_errors():
+    """Beyond the limit the oldest resolved errors are dropped, active ones are kept."""
+    index = FaultIndex()
+    index.add([make_error(0, active=True)])
+    index.add(make_error(number) for number in range(1, MAX_ERRORS + 10))
+
+    assert len(index) == MAX_ERRORS
+    assert "error-0" in index.errors
+    assert "error-1" not in index.errors
+    assert f"error-{MAX_ERRORS + 9}" in index.errors
+
+
+def test_round_trip_through_a_document():
+    """An index rebuilt from its document has the same errors and newest timestamp."""
+    index = FaultIndex()
+    index.add([make_error(1, True, 3), make_error(5)])
+
+    rebuilt = FaultIndex.from_dict(index.as_dict())
+
+    assert rebuilt.errors == index.errors
+    assert rebuilt.newest == 5.0
+    assert rebuilt.active == {"error-1"}
+
+
+def test_fetch_pages_only_the_new_errors():
+    """The first fetch pages through the log, the next one starts from the newest error."""
+    log = FakeLog([make_error(number) for number in range(ERROR_PAGE_SIZE * 2 + 5)])
+    client = make_client(log)
+
+    changed = asyncio.run(client.fetch_errors(UNIQUE))
+    assert len(changed) == ERROR_PAGE_SIZE * 2 + 5
+    assert [data["page"] for data in log.requests] == [0, 1, 2]
+
+    log.requests.clear()
+    log.errors["error-999"] = make_error(999)
+    assert asyncio.run(client.fetch_errors(UNIQUE)) == ["error-999"]
+    assert len(log.requests) == 1
+    assert log.requests[0]["since"] == ERROR_PAGE_SIZE * 2 * 1000 + 4000
+
+
+def test_resolutions_are_picked_up(monkeypatch):
+    """An active error resolved without a newer timestamp is read again and cleared."""
+    log = FakeLog([make_error(1, active=True), make_error(10), make_error(20)])
+    client = make_client(log)
+    asyncio.run(client.fetch_errors(UNIQUE))
+    # Active errors are read again on the first fetch that knows about them.
+    log.requests.clear()
+    assert asyncio.run(client.fetch_errors(UNIQUE)) == []
+    assert log.requests[0]["since"] == 1000
+
+    log.errors["error-1"]["active"] = False
+    log.requests.clear()
+    asyncio.run(client.fetch_errors(UNIQUE))
+    assert client.faults.get(UNIQUE).active == {"error-1"}
+    assert log.requests[0]["since"] == 20000
+
+    monkeypatch.setattr(sys.modules[MqttClient.__module__], "ERROR_RECHECK_INTERVAL", 0)
+    log.requests.clear()
+    assert asyncio.run(client.fetch_errors(UNIQUE)) == ["error-1"]
+    assert log.requests[0]["since"] == 1000
+    assert client.faults.get(UNIQUE).active_faults() == []
+
+
+def test_errors_missing_from_the_log_are_resolved(monkeypatch):
+    """An active error the complete read no longer lists is marked resolved."""
+    monkeypatch.setattr(sys.modules[MqttClient.__module__], "ERROR_RECHECK_INTERVAL", 0)
+    log = FakeLog([make_error(1, active=True), make_error(2, active=True)])
+    client = make_client(log)
+    asyncio.run(client.fetch_errors(UNIQUE))
+
+    del log.errors["error-1"]
+    assert asyncio.run(client.fetch_errors(UNIQUE)) == ["error-1"]
+    assert client.faults.get(UNIQUE).active == {"error-2"}
+
+
+def test_fault_summary_per_installation(make_controller):
+    """The controller summarizes the errors of every installation."""
+    controller = make_controller([])
+    controller.mqtt_client.faults.get(UNIQUE).add([make_error(1, True, code="E1"), make_error(2, code="E1")])
+
+    assert controller.get_fault_summary() == [{"unique": UNIQUE, "errors_by_code": {"E1": 2}, "active": 1}]
@@ -0,0 +1,80 @@
+"""Tests for the zone history rings, their downsampling and running averages."""
+import random
+
+import pytest
+from synthetic import make_installation
+
+from rehau_mqtt_client.handlers import parse_installations
+from rehau_mqtt_client.store.history import AVERAGE_WINDOW, Downsampler, HistoryStore, TimeSeries, ZoneHistory
+
+
+def test_ring_overwrites_the_oldest_samples():
+    """A full ring keeps the newest samples, oldest first."""
+    series = TimeSeries(3)
+    for second in range(5):
+        series.append(second, 20.0 + second, 21.0, second % 2)
+
+    assert len(series) == 3
+    assert series.as_list() == [(2.0, 22.0, 21.0, 0), (3.0, 23.0, 21.0, 1), (4.0, 24.0, 21.0, 0)]
+    with pytest.raises(IndexError):
+        series.position(3)
+
+
+def test_downsampler_averages_buckets():
+    """Samples are averaged per bucket, the open bucket included."""
+    downsampler = Downsampler(60, 2)
+    for timestamp, current in ((0, 20.0), (30, 22.0), (60, 23.0), (150, 19.0), (170, 21.0)):
+        downsampler.add(timestamp, current, 21.0, 1)
+
+    assert downsampler.as_list() == [(0.0, 21.0, 21.0, 1), (60.0, 23.0, 21.0, 1), (120, 20.0, 21.0, 1)]
+    assert downsampler.mean(0) == 20.0
+    assert downsampler.mean(2) == 21.0
+    assert downsampler.mean(3) is None
+    assert downsampler.bucket_start(1) == 60.0
+
+    downsampler.add(200, 18.0, 21.0, 2)
+    # Only two completed buckets are kept.
+    assert [bucket[0] for bucket in downsampler.as_list()] == [60.0, 120.0, 180]
+
+
+def test_running_averages_match_a_full_scan():
+    """The running averages equal the averages over the samples in the window."""
+    rng = random.Random(0)
+    history = ZoneHistory(capacity=64)
+    samples = []
+    timestamp = 0.0
+    for _ in range(500):
+        timestamp += rng.uniform(10, 200)
+        sample = (timestamp, round(rng.uniform(17, 24), 1), rng.choice((20.0, 21.0)), 0)
+        history.record(*sample)
+        samples.append(sample)
+
+    window = [sample for sample in samples[-64:] if sample[0] >= timestamp - AVERAGE_WINDOW]
+    assert history.window_size == len(window)
+    assert history.average_temperature() == round(sum(sample[1] for sample in window) / len(window), 2)
+    assert history.average_deviation() == round(sum(sample[1] - sample[2] for sample in window) / len(window), 2)
+    assert history.current_temperature() == samples[-1][1]
+
+
+def test_trend_in_degrees_per_hour():
+    """The trend compares the latest 15 minute bucket with the one an hour earlier."""
+    history = ZoneHistory()
+    assert history.temperature_trend() is None
+    for minute in range(0, 75, 5):
+        history.record(minute * 60, 20.0 + minute / 60, 21.0, 0)
+
+    assert history.temperature_trend() == pytest.approx(1.0)
+
+
+def test_zones_are_recorded_as_their_entities_report_them(make_controller):
+    """The recorded current temperature of a multi-channel zone is the mean the zone entities show."""
+    installations = parse_installations([make_installation(random.Random(3), 0, 1, 2, 3)], None)
+    controller = make_controller(installations)
+    store = HistoryStore()
+    store.record_installations(installations, timestamp=0.0)
+
+    unique = installations[0]["unique"]
+    for zone_number in (0, 1):
+        _, current, target, _ = store.get(unique, zone_number).samples.as_list()[-1]
+        assert current == controller.get_temperature(zone_number, installation_unique=unique)
+        assert target == controller.get_zone_aggregate(zone_number, unique, "target_temperature")["mean"]
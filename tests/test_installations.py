@@ -0,0 +1,23 @@
+"""Tests for the validation of the installations of an API response."""
+import asyncio
+import random
+
+import pytest
+from synthetic import make_installation
+
+from rehau_mqtt_client.exceptions import MqttClientCommunicationError
+
+
+def test_malformed_response_keeps_the_current_state(make_controller):
+    """A response failing the schema does not replace the stored installations."""
+    rng = random.Random(0)
+    client = make_controller([]).mqtt_client
+    asyncio.run(client.update_installations([make_installation(rng, 0, 1, 2, 1)]))
+    installations = client.store.installations
+
+    malformed = make_installation(rng, 0, 1, 2, 1)
+    malformed["groups"][0]["zones"][0]["channels"][0]["temp_zone"] = None
+    with pytest.raises(MqttClientCommunicationError):
+        asyncio.run(client.update_installations([malformed]))
+
+    assert client.store.installations is installations
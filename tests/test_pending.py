@@ -0,0 +1,99 @@
+"""Tests for the overlay of the commands not yet confirmed."""
+import asyncio
+import copy
+import random
+
+from synthetic import make_installation
+
+from rehau_mqtt_client.handlers import parse_installations
+from rehau_mqtt_client.store import StateStore
+from rehau_mqtt_client.store.pending import PendingOverlay
+
+FIRST = "NEA00000000"
+SECOND = "NEA00000001"
+
+
+def make_store():
+    """Return a store with two installations using the same zone numbers, and their raw documents."""
+    rng = random.Random(0)
+    raw = [make_installation(rng, site, 1, 2, 2) for site in range(2)]
+    store = StateStore()
+    store.load(parse_installations(copy.deepcopy(raw), None))
+    return store, raw
+
+
+def zone_setpoints(store, unique, zone_number):
+    """Return the target temperatures of the channels of a zone."""
+    return [channel["target_temperature"] for channel in store.get_installation_zone(unique, zone_number)["channels"]]
+
+
+def test_zone_commands_only_touch_their_installation():
+    """A zone command of one installation leaves the zone with the same number of the other alone."""
+    store, _ = make_store()
+    overlay = PendingOverlay(store)
+    first = zone_setpoints(store, FIRST, 0)
+
+    changed = overlay.set_zone(SECOND, 0, "target_temperature", 716)
+
+    assert zone_setpoints(store, SECOND, 0) == [716, 716]
+    assert zone_setpoints(store, FIRST, 0) == first
+    assert changed == [channel["id"] for channel in store.get_installation_zone(SECOND, 0)["channels"]]
+
+    other = store.get_installation_zone(FIRST, 0)["channels"][0]
+    assert not overlay.confirm_channel(other["id"], {"setpoint_used": 716})
+    assert len(overlay) == 1
+
+
+def test_update_with_an_older_value_is_overlaid_until_confirmed():
+    """An older reported value is kept for the rollback and the commanded value stays until confirmed."""
+    store, _ = make_store()
+    overlay = PendingOverlay(store)
+    overlay.set_zone(FIRST, 1, "target_temperature", 716)
+    channels = store.get_installation_zone(FIRST, 1)["channels"]
+
+    channels[0]["target_temperature"] = 698
+    assert overlay.confirm_channel(channels[0]["id"], {"setpoint_used": 698})
+    assert channels[0]["target_temperature"] == 716
+
+    assert not overlay.confirm_channel(channels[1]["id"], {"setpoint_used": 716})
+    assert len(overlay) == 0
+    assert overlay.summary() == {"pending": 0, "confirmed": 1, "rolled_back": 0}
+
+
+def test_unconfirmed_command_is_rolled_back():
+    """Without a confirmation the reported values are restored and the listener is called."""
+    store, _ = make_store()
+    overlay = PendingOverlay(store, timeout=0.01)
+    rolled_back = []
+    overlay.listener = rolled_back.append
+    reported = zone_setpoints(store, SECOND, 1)
+
+    async def command():
+        overlay.set_zone(SECOND, 1, "target_temperature", 716)
+        await asyncio.sleep(0.05)
+
+    asyncio.run(command())
+
+    assert zone_setpoints(store, SECOND, 1) == reported
+    assert rolled_back == [[channel["id"] for channel in store.get_installation_zone(SECOND, 1)["channels"]]]
+    assert overlay.summary() == {"pending": 0, "confirmed": 0, "rolled_back": 1}
+
+
+def test_poll_is_overlaid_and_confirms():
+    """A poll reporting the old value keeps the command, one reporting the new value confirms it."""
+    store, raw = make_store()
+    overlay = PendingOverlay(store)
+    overlay.set_installation(FIRST, "operating_mode", 2)
+
+    store.load(parse_installations(copy.deepcopy(raw), None))
+    overlay.reapply()
+    assert store.get_installation(FIRST)["operating_mode"] == 2
+    assert len(overlay) == 1
+
+    polled = parse_installations(copy.deepcopy(raw), None)
+    for channel in (channel for group in polled[0]["groups"] for zone in group["zones"] for channel in zone["channels"]):
+        channel["operating_mode"] = 2
+    polled[0]["operating_mode"] = 2
+    store.load(polled)
+    assert overlay.reapply() == []
+    assert len(overlay) == 0
@@ -0,0 +1,111 @@
+"""Tests for the room programs and their differences."""
+import random
+
+import pytest
+from synthetic import make_installation
+
+from rehau_mqtt_client.exceptions import MqttClientError
+from rehau_mqtt_client.handlers import parse_installations
+from rehau_mqtt_client.store.programs import (
+    MINUTES_PER_DAY,
+    PROGRAM_TRUST_PERIOD,
+    ProgramCache,
+    diff_program,
+    format_period,
+    normalize_periods,
+    parse_period,
+)
+
+
+@pytest.mark.parametrize(
+    ("text", "period"),
+    [("06:00-08:30", (360, 510)), (" 17:15 - 24:00 ", (1035, MINUTES_PER_DAY)), ("00:00-00:01", (0, 1))],
+)
+def test_parse_and_format_period(text, period):
+    """Periods parse to minutes since midnight and format back."""
+    assert parse_period(text) == period
+    assert parse_period(format_period(period)) == period
+
+
+@pytest.mark.parametrize("text", ["06:00", "06:00-08:00-09:00", "6-8", "aa:00-08:00", ""])
+def test_malformed_period(text):
+    """Malformed periods raise the client error."""
+    with pytest.raises(MqttClientError):
+        parse_period(text)
+
+
+def test_periods_are_sorted_and_merged():
+    """Overlapping and touching periods are merged."""
+    assert normalize_periods([(600, 700), (360, 480), (450, 500), (700, 720)]) == ((360, 500), (600, 720))
+
+
+@pytest.mark.parametrize("period", [(480, 480), (500, 400), (-1, 10), (1000, MINUTES_PER_DAY + 1)])
+def test_invalid_periods(period):
+    """Empty periods and periods outside of the day are rejected."""
+    with pytest.raises(MqttClientError):
+        normalize_periods([period])
+
+
+def test_diff_only_returns_the_changed_days():
+    """Unchanged days are skipped, emptied days are cleared."""
+    current = {0: ((360, 480),), 1: ((360, 480),), 2: ((600, 660),)}
+    changed, cleared = diff_program(current, {0: [(360, 480)], 1: [(360, 420), (400, 480), (1000, 1100)], 2: [], 3: []})
+
+    assert changed == {1: ((360, 480), (1000, 1100))}
+    assert cleared == [2]
+
+
+def test_diff_rejects_unknown_days():
+    """Day indexes outside of the week are rejected."""
+    with pytest.raises(MqttClientError):
+        diff_program({}, {7: [(0, 60)]})
+
+
+def test_diff_sends_the_days_that_are_not_known():
+    """Days the cache does not know are set or unset even if they look unchanged."""
+    current = {0: ((360, 480),), 1: ((360, 480),)}
+    changed, cleared = diff_program(current, {0: [(360, 480)], 1: [(360, 480)], 2: [], 3: []}, known={0, 2})
+
+    assert changed == {1: ((360, 480),)}
+    assert cleared == [3]
+
+
+def test_written_days_are_trusted_for_a_while():
+    """Only the days written within the trust period are known."""
+    cache = ProgramCache()
+    cache.apply("NEA00000000", 0, {0: ((360, 480),)}, [1], now=1000.0)
+    cache.apply("NEA00000000", 0, {2: ((360, 480),)}, [], now=2000.0)
+
+    assert cache.known_days("NEA00000000", 0, now=1000.0 + PROGRAM_TRUST_PERIOD) == {0, 1, 2}
+    assert cache.known_days("NEA00000000", 0, now=1500.0 + PROGRAM_TRUST_PERIOD) == {2}
+    assert cache.known_days("NEA00000000", 1, now=1000.0) == set()
+
+
+def test_cache_round_trip():
+    """The programs, names and write times survive a save and load, cleared zones included."""
+    cache = ProgramCache()
+    cache.apply("NEA00000000", 0, {0: ((360, 480),)}, [], name="Week", now=1000.0)
+    cache.apply("NEA00000000", 1, {}, [0, 1], now=1000.0)
+
+    loaded = ProgramCache()
+    loaded.load(cache.as_dict())
+
+    assert loaded.programs == cache.programs
+    assert loaded.names == cache.names
+    assert loaded.written == cache.written
+
+
+def test_clearing_a_program_set_in_the_app_unsets_every_day(make_controller):
+    """A zone the cache knows nothing about gets every day unset."""
+    installations = parse_installations([make_installation(random.Random(0), 0, 1, 1, 1)], None)
+    controller = make_controller(installations)
+    requests = []
+    controller.mqtt_client.send_server_request = lambda topic, data, installation=None: requests.append(data)
+
+    assert controller.set_zone_program(0, "NEA00000000", {day: [] for day in range(7)}) == 1
+    assert requests[0]["days"] == list(range(7))
+
+    requests.clear()
+    assert controller.set_zone_program(0, "NEA00000000", {day: [] for day in range(7)}) == 0
+    assert controller.set_zone_program(0, "NEA00000000", {0: [(360, 480)]}, "Week") == 2
+    assert [request.get("days", request.get("name")) for request in requests] == [{"0": [[360, 480]]}, "Week"]
@@ -0,0 +1,69 @@
+"""Tests for the pushed realtime updates and the reconciling poll."""
+import asyncio
+import json
+import random
+
+from synthetic import make_installation
+
+from rehau_mqtt_client.handlers import parse_installations
+
+
+class ConnectedClient:
+    """Stand-in for a connected paho client."""
+
+    @staticmethod
+    def is_connected():
+        """Report a connection."""
+        return True
+
+
+def channel_update(unique, channel_id, **values):
+    """Build a channel_update payload."""
+    data = {"mode_used": 0, "setpoint_used": 698, **values}
+    return json.dumps({"type": "channel_update", "data": {"channel": channel_id, "unique": unique, "data": data}})
+
+
+def make_client(make_controller):
+    """Return a client holding one installation, its first channel and a poll counter."""
+    installations = parse_installations([make_installation(random.Random(0), 0, 1, 2, 1)], None)
+    client = make_controller(installations).mqtt_client
+    client.client = ConnectedClient()
+    polls = []
+
+    async def refresh_http():
+        polls.append(client.last_refresh)
+        client.last_refresh = 1e12
+
+    client.refresh_http = refresh_http
+    return client, installations[0]["groups"][0]["zones"][0]["channels"][0], polls
+
+
+def test_channel_update_applies_pushed_temperature(make_controller):
+    """A numeric temp_zone is written to the channel, anything else is ignored."""
+    client, channel, _ = make_client(make_controller)
+    unique = client.store.installations[0]["unique"]
+    previous = channel["current_temperature"]
+
+    asyncio.run(client.dispatcher.dispatch("topic", channel_update(unique, channel["id"], temp_zone="warm"), client))
+    assert channel["current_temperature"] == previous
+    assert not client.temperature_pushed
+
+    asyncio.run(client.dispatcher.dispatch("topic", channel_update(unique, channel["id"], temp_zone=716), client))
+    assert channel["current_temperature"] == 716
+    assert client.temperature_pushed
+    assert client.store.channel_table.channel_value(channel["id"], "current_temperature") == 22.0
+
+
+def test_reconcile_polls_until_a_temperature_is_pushed(make_controller):
+    """While connected, the poll keeps running every call until a temperature was pushed."""
+    client, channel, polls = make_client(make_controller)
+    unique = client.store.installations[0]["unique"]
+
+    for _ in range(3):
+        asyncio.run(client.reconcile())
+    assert len(polls) == 3
+
+    asyncio.run(client.dispatcher.dispatch("topic", channel_update(unique, channel["id"], temp_zone=700), client))
+    asyncio.run(client.reconcile())
+    asyncio.run(client.reconcile())
+    assert len(polls) == 3
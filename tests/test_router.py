@@ -0,0 +1,19 @@
+"""Tests for the compiled topic router."""
+from rehau_mqtt_client.handlers import TopicRouter
+from rehau_mqtt_client.utils import ClientTopics
+
+
+def test_router_compiles_the_topics_of_the_installations():
+    """Inbound topics resolve to their template and installation, outbound ones default to an installation."""
+    router = TopicRouter()
+    assert router.update("user@example.com", ["NEA1", "NEA2"], "NEA1")
+    assert not router.update("user@example.com", ["NEA1", "NEA2"], "NEA2")
+
+    route = router.resolve("client/NEA2/realtime")
+    assert (route.template, route.installation) == (ClientTopics.LISTEN_TO_CONTROLLER.value, "NEA2")
+    assert router.resolve("client/user@example.com").installation is None
+    assert router.resolve("client/NEA3/realtime") is None
+    assert sorted(router.subscriptions) == ["client/NEA1/realtime", "client/NEA2/realtime", "client/user@example.com"]
+    assert router.outbound(ClientTopics.INSTALLATION.value) == "client/NEA2"
+    assert router.outbound(ClientTopics.INSTALLATION.value, "NEA1") == "client/NEA1"
+    assert router.outbound("custom/{email}/{id}", "NEA1") == "custom/user@example.com/NEA1"
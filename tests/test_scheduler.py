@@ -0,0 +1,24 @@
+"""Tests for the scheduler of the periodic client tasks."""
+import asyncio
+
+from rehau_mqtt_client.MqttClient import MqttClient
+
+
+def test_scheduler_keeps_running_after_a_restart():
+    """A scheduler started again after a stop, as a reconnect does, reports itself running."""
+    async def restart():
+        client = MqttClient(None, "user@example.com", "password")
+        client.token_data = {"access_token": "token", "expires_in": 3600}
+        client.start_scheduler()
+        await asyncio.sleep(0)
+        client.stop_scheduler()
+        client.start_scheduler()
+        await asyncio.sleep(0)
+        scheduler = client.get_status()["scheduler"]
+        client.stop_scheduler()
+        return scheduler
+
+    scheduler = asyncio.run(restart())
+
+    assert scheduler["running"]
+    assert len(scheduler["jobs"]) == 3
@@ -0,0 +1,125 @@
+"""Tests for the bulk zone changes."""
+import json
+import random
+
+from synthetic import make_installation, make_referentials
+
+from rehau_mqtt_client.handlers import parse_installations
+from rehau_mqtt_client.store import compact_referentials
+from rehau_mqtt_client.utils import celsius_to_raw
+
+FIRST = "NEA00000000"
+SECOND = "NEA00000001"
+
+# The keys the messages are sent with.
+KEYS = {entry["value"]: str(entry["index"]) for entry in make_referentials()}
+
+
+class FakeHass:
+    """Stand-in for Home Assistant running the scheduled updates nowhere."""
+
+    @staticmethod
+    def async_create_task(coroutine):
+        """Drop the task."""
+        coroutine.close()
+
+
+class FakePaho:
+    """Stand-in for the paho client recording the published messages."""
+
+    def __init__(self, failing_topics=()):
+        """Initialize the client, failing to publish on the given topics."""
+        self.failing_topics = set(failing_topics)
+        self.published = []
+
+    def publish(self, topic, payload):
+        """Record a message, returning the paho result code and message ID."""
+        self.published.append((topic, json.loads(payload)))
+        return (4 if topic in self.failing_topics else 0), len(self.published)
+
+
+def make_controller_with_paho(make_controller, failing_installation=None):
+    """Return a controller of two installations using the same zone numbers and its fake paho client."""
+    rng = random.Random(0)
+    controller = make_controller(parse_installations([make_installation(rng, site, 1, 3, 1) for site in range(2)], None))
+    controller.hass = FakeHass()
+    client = controller.mqtt_client
+    client.referentials = compact_referentials(make_referentials())
+    client.topics.update("user@example.com", (FIRST, SECOND), FIRST)
+    failing = () if failing_installation is None else (client.topics.outbound("client/{id}", failing_installation),)
+    client.client = FakePaho(failing)
+    return controller, client.client
+
+
+def target(controller, unique, zone_number):
+    """Return the target temperature of the channel of a zone."""
+    return controller.mqtt_client.store.get_installation_zone(unique, zone_number)["channels"][0]["target_temperature"]
+
+
+def test_changes_are_grouped_per_installation(make_controller):
+    """Setpoints are one message per zone, modes one message per installation and mode."""
+    controller, paho = make_controller_with_paho(make_controller)
+    temperature = 25.5
+    result = controller.set_zones([
+        {"zone": 0, "temperature": temperature, "mode": 2, "installation": SECOND},
+        {"zone": 1, "mode": 2, "installation": SECOND},
+        {"zone": 2, "mode": 2},
+        {"zone": 9, "mode": 2},
+    ])
+
+    assert result["sent"] == [0, 1, 2]
+    assert result["unknown"] == [9]
+    assert result["failed"] == []
+    assert result["messages"] == len(paho.published) == 3
+    topics = [topic for topic, _ in paho.published]
+    assert topics.count(controller.mqtt_client.topics.outbound("client/{id}", SECOND)) == 2
+    data = [message[KEYS["data"]] for _, message in paho.published]
+    assert sorted(values[KEYS["zone_impacted"]] for values in data if KEYS["zone_impacted"] in values) == [[0, 1], [2]]
+    assert target(controller, SECOND, 0) == celsius_to_raw(temperature)
+    assert target(controller, FIRST, 0) != celsius_to_raw(temperature)
+
+
+def test_unchanged_zones_are_skipped(make_controller):
+    """A zone already at the requested values sends nothing."""
+    controller, paho = make_controller_with_paho(make_controller)
+    current = controller.get_zone_celsius(1, FIRST, "target_temperature")
+
+    result = controller.set_zones([{"zone": 1, "temperature": current, "installation": FIRST}])
+
+    assert result["unchanged"] == [1]
+    assert paho.published == []
+
+
+def test_failed_publish_is_reported(make_controller):
+    """Zones whose message was not published are failed and keep their values."""
+    controller, paho = make_controller_with_paho(make_controller, failing_installation=SECOND)
+    previous = target(controller, SECOND, 1)
+
+    result = controller.set_zones([
+        {"zone": 1, "temperature": 25.5, "installation": SECOND},
+        {"zone": 1, "temperature": 25.5, "installation": FIRST},
+    ])
+
+    assert result["failed"] == [1]
+    assert result["sent"] == [1]
+    assert result["messages"] == 1
+    assert target(controller, SECOND, 1) == previous
+    assert len(controller.mqtt_client.pending) == 1
+
+
+def test_single_zone_commands_only_apply_published_values(make_controller):
+    """A setpoint or energy level that was not published leaves the zone and its traces untouched."""
+    controller, paho = make_controller_with_paho(make_controller, failing_installation=SECOND)
+    previous = target(controller, SECOND, 1)
+
+    controller.set_temperature({"zone": 1, "temperature": 25.5, "installation": SECOND})
+    controller.set_energy_level({"zone": 1, "mode": 2, "installation": SECOND})
+
+    assert len(paho.published) == 2
+    assert target(controller, SECOND, 1) == previous
+    assert len(controller.mqtt_client.pending) == len(controller.mqtt_client.tracer.pending) == 0
+
+    controller.set_temperature({"zone": 1, "temperature": 25.5, "installation": FIRST})
+
+    assert target(controller, FIRST, 1) == celsius_to_raw(25.5)
+    assert len(controller.mqtt_client.pending) == len(controller.mqtt_client.tracer.pending) == 1
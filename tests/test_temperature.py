@@ -0,0 +1,30 @@
+"""Tests for the temperature conversion tables."""
+import pytest
+
+from rehau_mqtt_client.utils import celsius_to_raw, raw_to_celsius, raw_to_celsius_half
+from rehau_mqtt_client.utils.temperature import RAW_MAX, RAW_MIN, _to_celsius, _to_celsius_half, verify_round_trip
+
+
+def test_round_trip_over_the_whole_table():
+    """Every Celsius value of the inverse table converts to raw and back unchanged."""
+    verify_round_trip()
+
+
+def test_tables_match_the_formulas():
+    """The precomputed values are the values of the formulas."""
+    for raw in range(RAW_MIN, RAW_MAX + 1):
+        assert raw_to_celsius(raw) == _to_celsius(raw)
+        assert raw_to_celsius_half(raw) == _to_celsius_half(raw)
+
+
+@pytest.mark.parametrize("raw", [RAW_MIN - 1, RAW_MAX + 1, 698.5])
+def test_values_outside_the_tables_use_the_formulas(raw):
+    """Values the tables do not cover are converted with the formulas."""
+    assert raw_to_celsius(raw) == _to_celsius(raw)
+    assert raw_to_celsius_half(raw) == _to_celsius_half(raw)
+
+
+def test_celsius_is_rounded_to_a_tenth_first():
+    """A setpoint between two tenths converts like its rounded value."""
+    assert celsius_to_raw(21.04) == celsius_to_raw(21.0) == 698
+    assert celsius_to_raw(-50.0) == -580
@@ -0,0 +1,32 @@
+"""Tests for the tracing of zone commands."""
+from rehau_mqtt_client.instrumentation.tracing import STATUS_CONFIRMED, STATUS_SUPERSEDED, CommandTracer
+
+FIRST = "NEA00000000"
+SECOND = "NEA00000001"
+
+
+def test_commands_are_confirmed_by_their_own_installation():
+    """An update of a zone sharing the number in another installation confirms nothing."""
+    results = []
+    tracer = CommandTracer(listener=results.append)
+    tracer.start("set_temperature", FIRST, 0, "setpoint_used", 700)
+    tracer.start("set_temperature", SECOND, 0, "setpoint_used", 700)
+
+    assert tracer.confirm(SECOND, 0, {"setpoint_used": 700, "mode_used": 0})[0].installation == SECOND
+    assert tracer.confirm(SECOND, 0, {"setpoint_used": 700}) == []
+    assert len(tracer.pending) == 1
+
+    tracer.reflected(tracer.confirm(FIRST, 0, {"setpoint_used": 700}))
+    assert [(result["installation"], result["status"]) for result in results] == [(FIRST, STATUS_CONFIRMED)]
+
+
+def test_a_new_command_supersedes_the_pending_one_of_its_installation_only():
+    """Only the pending command of the same installation, zone and field is superseded."""
+    results = []
+    tracer = CommandTracer(listener=results.append)
+    tracer.start("set_temperature", FIRST, 0, "setpoint_used", 700)
+    tracer.start("set_temperature", SECOND, 0, "setpoint_used", 710)
+    tracer.start("set_temperature", FIRST, 0, "setpoint_used", 720)
+
+    assert [(result["installation"], result["status"]) for result in results] == [(FIRST, STATUS_SUPERSEDED)]
+    assert tracer.summary()["pending"] == 2